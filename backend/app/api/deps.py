@@ -1,39 +1,143 @@
 # backend/app/api/deps.py
 
-from fastapi import Depends, HTTPException, status
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import hmac
+import time
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 import os
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.core.metrics import AUTH_TOKEN_DECODE_DURATION
+
 load_dotenv()
 
 # 환경 변수 로드 (auth.py와 동일하게 맞춰야 함)
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "super-secret-key")
 ALGORITHM = "HS256"
 
+# 검증된 토큰 캐시 크기 (0이면 캐시 사용 안 함)
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+
 # FastAPI가 스와거 문서에서 토큰 입력창을 보여주게 함
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/google/login")
 
+
+class _VerifiedTokenCache:
+    """
+    검증이 끝난 JWT의 (sub, exp)를 보관하는 LRU 캐시
+    - key: 토큰 원문의 sha256 digest (토큰 자체는 메모리에 남기지 않음)
+    - exp가 지난 항목은 조회 시 제거 -> 만료 토큰은 다시 jwt.decode를 거쳐 401
+    - 같은 토큰으로 반복 호출 시 HMAC 검증 + JSON 파싱을 건너뜀
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Tuple[str, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        sub, exp = entry
+        if exp is not None and exp <= time.time():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return sub
+
+    def put(self, key: bytes, sub: str, exp: Optional[float]) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (sub, exp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+token_cache = _VerifiedTokenCache(TOKEN_CACHE_SIZE)
+
+
+def get_token_cache_stats() -> Dict[str, float]:
+    return token_cache.stats()
+
+
 async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
     """
     JWT 토큰을 검증하고 user_id (sub)를 반환합니다.
+    이미 검증한 토큰이면 캐시에서 바로 반환합니다. (exp 전까지)
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+    cache_key = token_cache.key(token)
+    cached_user_id = token_cache.get(cache_key)
+    if cached_user_id is not None:
+        return cached_user_id
     
     try:
         # 토큰 디코딩
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        started = time.perf_counter()
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        finally:
+            AUTH_TOKEN_DECODE_DURATION.observe(time.perf_counter() - started)
         user_id: str = payload.get("sub")
         
         if user_id is None:
             raise credentials_exception
+
+        exp = payload.get("exp")
+        token_cache.put(cache_key, user_id, float(exp) if exp is not None else None)
             
         return user_id
         
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(default=None)) -> None:
+    """
+    관리자 API(/admin/*) 인증: X-Admin-Key 헤더 == settings.ADMIN_API_KEY
+    키가 설정되지 않았으면 관리자 API 자체를 막음
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
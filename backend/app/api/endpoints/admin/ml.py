@@ -0,0 +1,32 @@
+# backend/app/api/endpoints/admin/ml.py
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.api.deps import require_admin
+from app.crud import admin_jobs
+from app.schemas.admin import JobLogRead, JobStatusResponse, MLTrainRequest
+from app.services.ml_training import ml_training_runner
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+# 재학습 작업 시작 (백그라운드 실행, 진행 상황은 GET /admin/jobs/{job_id})
+@router.post("/ml/train", response_model=JobStatusResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_ml_training(payload: MLTrainRequest, response: Response):
+    if not ml_training_runner.running:
+        raise HTTPException(status_code=503, detail="ML training runner is not running")
+    job_id, started = await ml_training_runner.submit(payload.user_id, payload.force_retrain)
+    if not started:
+        # 같은 파라미터의 작업이 이미 실행 중 -> 그 작업 id를 돌려줌
+        response.status_code = status.HTTP_200_OK
+        return JobStatusResponse(job_id=job_id, status="running")
+    return JobStatusResponse(job_id=job_id)
+
+
+# 작업 상태 조회
+@router.get("/jobs/{job_id}", response_model=JobLogRead)
+async def read_job(job_id: str):
+    job = await admin_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
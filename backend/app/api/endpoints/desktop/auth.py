@@ -10,7 +10,7 @@ from urllib.parse import urlencode
 
 # mongo 모듈 자체를 import (db 변수 직접 import 시 None 문제 발생 방지)
 from app.db import mongo
-from app.models.user import UserInDB
+from app.crud import users as users_crud
 from app.core.security import create_access_token, create_refresh_token
 
 load_dotenv()
@@ -78,19 +78,15 @@ async def auth_google_callback(request: Request):
                 {"_id": user_id_obj},
                 {"$set": {"last_login_at": datetime.now(timezone.utc)}}
             )
+            # users crud를 거치지 않고 직접 수정했으므로 유저 캐시 무효화
+            await users_crud.invalidate_cached_user(user_id_obj)
             # JWT 생성을 위해 ObjectId -> str 변환 (변수 할당)
             user_id_str = str(user_id_obj)
         else:
             # [신규 유저] 생성
-            new_user = UserInDB(
-                email=email,
-                google_id=google_sub,
-                created_at=datetime.now(timezone.utc),
-                last_login_at=datetime.now(timezone.utc)
-                # settings, fcm_tokens, blocked_apps는 default_factory로 자동 생성
-            )
-            result = await mongo.db.users.insert_one(new_user.model_dump(by_alias=True))
-            user_id_str = str(result.inserted_id)
+            # crud로 생성 (_id는 MongoDB ObjectId / model_dump()를 insert하면 _id가 문자열로 저장됨)
+            new_user = await users_crud.create_user(email=email, google_id=google_sub)
+            user_id_str = str(new_user.id)
 
         # C. 공통 모듈 사용하여 토큰 발급
         if not user_id_str:
@@ -1,19 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
 from app.db import mongo
 from app.models.event import EventInDB
-from app.schemas.event import EventBatchCreate, EventCreateResponse
+from app.schemas.event import (
+    EventBatchCreate,
+    EventColumnarBatch,
+    EventCreateResponse,
+    EventIngestResponse,
+)
+from app.crud import analytics
+from app.crud import events as event_crud
+from app.crud import session_stats
 from app.api import deps
-import uuid
+from app.core.metrics import record_ingest
+from app.services.distraction_scoring import distraction_scorer
+from app.services.ingest_queue import enqueue_or_reject, ingest_queue
 
 router = APIRouter()
 
+
 # --------------------------------------------------------------------------
 # 이벤트 배치 업로드 (POST /api/v1/events/batch)
 # --------------------------------------------------------------------------
 @router.post("/batch", response_model=EventCreateResponse)
 async def create_events_batch(
     batch: EventBatchCreate,
+    response: Response,
     # [핵심 수정] 토큰을 검증하고 user_id를 추출하여 주입받음
     user_id: str = Depends(deps.get_current_user_id) 
 ):
@@ -29,8 +41,9 @@ async def create_events_batch(
 
     for event_data in batch.events:
         # Pydantic 모델(EventCreate) -> DB 모델(EventInDB) 변환
+        # event_key가 있으면 고정 _id -> 타임아웃 후 재전송돼도 중복 저장되지 않음
         event_doc = EventInDB(
-            id=str(uuid.uuid4()),
+            id=event_crud.event_document_id(user_id, event_data.event_key),
             user_id=user_id, # [수정] 진짜 user_id 사용
             session_id=event_data.session_id,
             timestamp=event_data.timestamp,
@@ -42,11 +55,79 @@ async def create_events_batch(
         # model_dump(by_alias=True)를 통해 id -> _id 매핑
         documents.append(event_doc.model_dump(by_alias=True))
 
-    # 3. MongoDB에 일괄 저장 (Bulk Insert)
+    # 3-a. 적재 큐 사용 시: 큐에 넣고 바로 응답 (저장은 writer가 모아서 처리)
+    if documents and ingest_queue.running:
+        await enqueue_or_reject(user_id, documents, response)
+        record_ingest("batch", len(documents), queued=len(documents))
+        return EventCreateResponse(status="queued", count=len(documents))
+
+    # 3-b. MongoDB에 일괄 저장 (Unordered Bulk Insert)
+    # 이미 저장된 event_key는 duplicate key로 건너뛰고 나머지는 그대로 저장
     if documents:
-        result = await mongo.db.events.insert_many(documents)
-        inserted_count = len(result.inserted_ids)
-        print(f"Synced {inserted_count} events from desktop.")
-        return EventCreateResponse(status="success", count=inserted_count)
+        inserted, duplicates, errors = await event_crud.insert_many_unordered(documents)
+        await session_stats.apply_event_docs(user_id, inserted)
+        await analytics.invalidate_for_events(user_id, inserted)
+        distraction_scorer.submit(user_id, inserted)
+        print(f"Synced {len(inserted)} events from desktop ({duplicates} duplicates).")
+        record_ingest("batch", len(documents), len(inserted), duplicates, len(errors))
+
+        if errors:
+            # 에이전트는 로컬 캐시를 지우지 않고 재전송 -> 저장된 것들은 다음번에 duplicate로 처리됨
+            print(f"Failed to store {len(errors)} events: {errors[0].get('errmsg')}")
+            raise HTTPException(status_code=500, detail=f"Failed to store {len(errors)} events")
+
+        return EventCreateResponse(status="success", count=len(inserted), duplicates=duplicates)
     
-    return EventCreateResponse(status="success", count=0)
\ No newline at end of file
+    return EventCreateResponse(status="success", count=0)
+
+# --------------------------------------------------------------------------
+# 이벤트 고속 배치 업로드 - 열(column) 배열 형식 (POST /api/v1/events/batch/columnar)
+# --------------------------------------------------------------------------
+@router.post("/batch/columnar", response_model=EventIngestResponse)
+async def create_events_columnar(
+    batch: EventColumnarBatch,
+    response: Response,
+    user_id: str = Depends(deps.get_current_user_id)
+):
+    """
+    이벤트별 모델 생성 없이 열 배열을 그대로 문서로 변환해 저장합니다.
+    chunk 단위 unordered insert_many 결과(처리량 포함)를 반환합니다.
+    """
+    if mongo.db is None:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+
+    if not batch.timestamp:
+        return EventIngestResponse(status="success", count=0)
+
+    documents = event_crud.build_event_documents(user_id, batch)
+
+    if ingest_queue.running:
+        await enqueue_or_reject(user_id, documents, response)
+        record_ingest("columnar", len(documents), queued=len(documents))
+        return EventIngestResponse(status="queued", count=len(documents))
+
+    report, inserted, failed = await event_crud.insert_event_documents(documents)
+    await session_stats.apply_event_docs(user_id, inserted)
+    await analytics.invalidate_for_events(user_id, inserted)
+    distraction_scorer.submit(user_id, inserted)
+    record_ingest("columnar", len(documents), report["count"], report["duplicates"], failed)
+    print(
+        f"Synced {report['count']} events from desktop "
+        f"(columnar, {report['duplicates']} duplicates, {report['events_per_sec']} events/sec)."
+    )
+
+    if failed:
+        raise HTTPException(status_code=500, detail=f"Failed to store {failed} events")
+
+    return EventIngestResponse(status="success", **report)
+
+
+# --------------------------------------------------------------------------
+# 적재 큐 상태 (GET /api/v1/events/ingest/stats)
+# --------------------------------------------------------------------------
+@router.get("/ingest/stats", dependencies=[Depends(deps.require_admin)])
+async def read_ingest_stats():
+    """
+    큐 깊이, flush 지연(ms), 저장/실패/드롭 이벤트 수 (프로세스 전체 값 -> /metrics와 같이 관리자 키 필요)
+    """
+    return ingest_queue.stats()
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from typing import Optional
+
+from app.api import deps
+from app.api.responses import FastJSONResponse, etag_matches
+from app.crud import profiles as profile_crud
+from app.schemas.profile import AIProfileCompiled
+
+router = APIRouter()
+
+
+# --------------------------------------------------------------------------
+# 기본 프로필 동기화 (GET /api/v1/profiles/default)
+# - 에이전트는 60초마다 마지막으로 받은 ETag를 If-None-Match로 보냄
+# - version(내용 해시)이 같으면 규칙 본문을 읽지 않고 304 (본문 없음)
+# - 바뀌었으면 컴파일된 dense 테이블 payload + 새 ETag
+# --------------------------------------------------------------------------
+@router.get("/default", response_model=AIProfileCompiled, responses={304: {"description": "Not Modified"}})
+async def read_default_profile(
+    if_none_match: Optional[str] = Header(default=None),
+    user_id: str = Depends(deps.get_current_user_id),
+):
+    version = await profile_crud.get_default_profile_version(user_id)
+    headers = {"Cache-Control": "no-cache"}
+    if version and etag_matches(if_none_match, version):
+        return Response(status_code=304, headers={**headers, "ETag": f'"{version}"'})
+
+    payload = await profile_crud.get_default_profile_payload(user_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FastJSONResponse(payload, headers={**headers, "ETag": f'"{payload["version"]}"'})
@@ -0,0 +1,32 @@
+# backend/app/api/endpoints/web/analytics.py
+
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_user_id
+from app.schemas.analytics import DailyFocusRead, WeeklyFocusRead
+from app.crud import analytics as analytics_crud
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/daily", response_model=List[DailyFocusRead])
+async def read_daily_focus(
+    start_date: date = Query(..., description="YYYY-MM-DD (포함)"),
+    end_date: date = Query(..., description="YYYY-MM-DD (포함)"),
+    tz: str = Query("UTC", description="IANA 타임존 (예: Asia/Seoul)"),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await analytics_crud.get_daily_focus(user_id, start_date, end_date, tz)
+
+
+@router.get("/weekly", response_model=List[WeeklyFocusRead])
+async def read_weekly_focus(
+    start_date: date = Query(..., description="YYYY-MM-DD (포함, 해당 주 월요일로 확장)"),
+    end_date: date = Query(..., description="YYYY-MM-DD (포함, 해당 주 일요일로 확장)"),
+    tz: str = Query("UTC", description="IANA 타임존 (예: Asia/Seoul)"),
+    user_id: str = Depends(get_current_user_id),
+):
+    return await analytics_crud.get_weekly_focus(user_id, start_date, end_date, tz)
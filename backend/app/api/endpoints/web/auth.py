@@ -12,7 +12,7 @@ from pydantic import BaseModel
 from authlib.integrations.starlette_client import OAuth, OAuthError
 
 from app.db import mongo
-from app.models.user import UserInDB
+from app.crud import users as users_crud
 from app.core.security import create_access_token, create_refresh_token
 
 
@@ -139,24 +139,13 @@ async def google_callback(request: Request, next: str | None = None):
                 {"_id": user["_id"]},
                 {"$set": {"last_login_at": datetime.now(timezone.utc)}},
             )
+            # users crud를 거치지 않고 직접 수정했으므로 유저 캐시 무효화
+            await users_crud.invalidate_cached_user(user["_id"])
         else:
-            # 신규 유저는 uuid로 _id를 만들지 말고 MongoDB(ObjectId) 생성에 맡김
-            new_user = UserInDB(
-                email=email,
-                google_id=google_id,
-                created_at=datetime.now(timezone.utc),
-                last_login_at=datetime.now(timezone.utc),
-                settings={},
-                blocked_apps=[],
-            )
-            user_dict = (
-                new_user.dict(by_alias=True)
-                if hasattr(new_user, "dict")
-                else new_user.model_dump(by_alias=True)
-            )
-
-            insert_result = await mongo.db.users.insert_one(user_dict)
-            user_id_str = str(insert_result.inserted_id)
+            # 신규 유저는 crud로 생성 (_id는 MongoDB ObjectId)
+            # UserInDB.model_dump()를 그대로 insert하면 _id가 문자열로 저장됨
+            new_user = await users_crud.create_user(email=email, google_id=google_id)
+            user_id_str = str(new_user.id)
 
         access_token = create_access_token(user_id_str)
         refresh_token = create_refresh_token(user_id_str)
@@ -1,12 +1,20 @@
 # backend/app/api/endpoints/web/events.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 from datetime import datetime
 
 from app.api.deps import get_current_user_id
+from app.api.responses import FastJSONResponse
 from app.schemas.event import EventCreate, EventCreateResponse, EventRead
 from app.crud import events as event_crud
+from app.crud.pagination import NEXT_CURSOR_HEADER
+from app.crud.projection import parse_fields
+from app.services.ingest_queue import enqueue_or_reject, ingest_queue
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
@@ -14,8 +22,14 @@ router = APIRouter(prefix="/events", tags=["Events"])
 @router.post("/", response_model=EventCreateResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
     payload: EventCreate,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
 ):
+    if ingest_queue.running:
+        document = event_crud.build_event_document_for_user(user_id, payload)
+        await enqueue_or_reject(user_id, [document], response)
+        return EventCreateResponse(status="queued", event_id=document["_id"])
+
     event_id = await event_crud.create_event_for_user(user_id, payload)
     return EventCreateResponse(event_id=event_id)
 
@@ -26,14 +40,97 @@ async def read_events(
     start_time: Optional[datetime] = Query(None, description="ISO8601 datetime"),
     end_time: Optional[datetime] = Query(None, description="ISO8601 datetime"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"이전 응답의 {NEXT_CURSOR_HEADER} 헤더 값"),
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: id,timestamp,app_name)"),
     user_id: str = Depends(get_current_user_id),
 ):
-    return await event_crud.get_events(
+    # EventRead 모델 생성 / 재검증 없이 문서 dict를 orjson으로 바로 인코딩
+    rows, next_cursor = await event_crud.get_event_rows_page(
         user_id=user_id,
         session_id=session_id,
         start_time=start_time,
         end_time=end_time,
         limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields),
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(rows, headers=headers)
+
+
+# --------------------------------------------------------------------------
+# 이벤트 히스토리 스트리밍 export (GET /events/export)
+# --------------------------------------------------------------------------
+_EXPORT_COLUMNS = ["id", "user_id", "session_id", "timestamp", "app_name", "window_title", "activity_vector"]
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)  # ObjectId 등
+
+
+async def _stream_ndjson(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        lines = [
+            json.dumps(event_crud.event_row(doc), default=_json_default, ensure_ascii=False)
+            for doc in batch
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def _stream_csv(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(_EXPORT_COLUMNS)
+    yield buffer.getvalue().encode("utf-8")
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate(0)
+        for doc in batch:
+            row = event_crud.event_row(doc)
+            writer.writerow([
+                row["id"],
+                row["user_id"],
+                row["session_id"] or "",
+                row["timestamp"].isoformat(),
+                row["app_name"] or "",
+                row["window_title"] or "",
+                json.dumps(row["activity_vector"], default=_json_default, ensure_ascii=False),
+            ])
+        yield buffer.getvalue().encode("utf-8")
+
+
+@router.get("/export")
+async def export_events(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    session_id: Optional[str] = Query(None),
+    start_time: Optional[datetime] = Query(None, description="ISO8601 datetime"),
+    end_time: Optional[datetime] = Query(None, description="ISO8601 datetime"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    기간 제한 없이 이벤트 전체를 NDJSON / CSV로 스트리밍합니다. (timestamp 오름차순)
+    Motor cursor를 batch 단위로 읽어 바로 바이트로 내보내므로 서버 메모리는 batch 1개 분량만 사용합니다.
+    """
+    batches = event_crud.iter_event_docs(
+        user_id=user_id,
+        session_id=session_id,
+        start_time=start_time,
+        end_time=end_time,
+    )
+
+    if format == "csv":
+        body, media_type = _stream_csv(batches), "text/csv; charset=utf-8"
+    else:
+        body, media_type = _stream_ndjson(batches), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="events.{format}"'},
     )
 
 
@@ -42,7 +139,7 @@ async def read_event(
     event_id: str,
     user_id: str = Depends(get_current_user_id),
 ):
-    event = await event_crud.get_event(event_id)
+    event = await event_crud.get_event(event_id, user_id=user_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
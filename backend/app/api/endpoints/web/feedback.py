@@ -4,8 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
 
 from app.api.deps import get_current_user_id
+from app.api.responses import FastJSONResponse
 from app.schemas.feedback import FeedbackCreate, FeedbackRead, FeedbackTypeEnum
 from app.crud import feedback as feedback_crud
+from app.crud.pagination import NEXT_CURSOR_HEADER
+from app.crud.projection import parse_fields
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
@@ -23,14 +26,20 @@ async def read_feedbacks(
     event_id: Optional[str] = Query(default=None),
     feedback_type: Optional[FeedbackTypeEnum] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None, description=f"이전 응답의 {NEXT_CURSOR_HEADER} 헤더 값"),
+    fields: Optional[str] = Query(default=None, description="응답에 포함할 필드 (쉼표 구분, 예: id,event_id,feedback_type)"),
     user_id: str = Depends(get_current_user_id),  # ✅ str
 ):
-    return await feedback_crud.get_feedbacks(
+    rows, next_cursor = await feedback_crud.get_feedback_rows_page(
         user_id,
         event_id=event_id,
         feedback_type=feedback_type,
         limit=limit,
+        cursor=cursor,
+        fields=parse_fields(fields),
     )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(rows, headers=headers)
 
 
 @router.get("/{feedback_id}", response_model=FeedbackRead)
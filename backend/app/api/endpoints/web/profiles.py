@@ -0,0 +1,55 @@
+# backend/app/api/endpoints/web/profiles.py
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+
+from app.api.deps import get_current_user_id
+from app.schemas.profile import AIProfileCreate, AIProfileUpdate, AIProfileSlicesUpdate, AIProfileRead
+from app.crud import profiles as profile_crud
+
+router = APIRouter(prefix="/profiles", tags=["Profiles"])
+
+# CREATE
+@router.post("/", response_model=AIProfileRead, status_code=status.HTTP_201_CREATED)
+async def create_profile(profile: AIProfileCreate, user_id: str = Depends(get_current_user_id)):
+    return await profile_crud.create_profile(user_id, profile)
+
+# READ ALL
+@router.get("/", response_model=List[AIProfileRead])
+async def read_profiles(user_id: str = Depends(get_current_user_id)):
+    return await profile_crud.get_profiles(user_id)
+
+# READ ONE
+@router.get("/{profile_id}", response_model=AIProfileRead)
+async def read_profile(profile_id: str, user_id: str = Depends(get_current_user_id)):
+    profile = await profile_crud.get_profile(user_id, profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+# UPDATE
+@router.put("/{profile_id}", response_model=AIProfileRead)
+async def update_profile(profile_id: str, profile: AIProfileUpdate, user_id: str = Depends(get_current_user_id)):
+    return await profile_crud.update_profile(user_id, profile_id, profile)
+
+# UPDATE (시간 구간 규칙 전체 교체 -> 다시 컴파일, version 변경)
+@router.put("/{profile_id}/time-slices", response_model=AIProfileRead)
+async def replace_time_slices(
+    profile_id: str,
+    payload: AIProfileSlicesUpdate,
+    user_id: str = Depends(get_current_user_id),
+):
+    return await profile_crud.replace_time_slices(user_id, profile_id, payload.time_slices)
+
+# UPDATE (기본 프로필 지정 -> 에이전트가 다음 동기화 때 이 프로필을 받음)
+@router.put("/{profile_id}/default", response_model=AIProfileRead)
+async def set_default_profile(profile_id: str, user_id: str = Depends(get_current_user_id)):
+    return await profile_crud.set_default_profile(user_id, profile_id)
+
+# DELETE
+@router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_profile(profile_id: str, user_id: str = Depends(get_current_user_id)):
+    deleted = await profile_crud.delete_profile(user_id, profile_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return None
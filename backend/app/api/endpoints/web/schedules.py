@@ -1,10 +1,13 @@
 # backend/app/api/endpoints/web/schedules.py
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, status
+from typing import List, Optional
 
-from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleRead
+from app.api.sync import synced_list_response
+from app.crud.projection import parse_fields
+from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleRead, ScheduleStatusRead
 from app.crud import schedules as schedule_crud
+from app.services.schedule_engine import schedule_engine, zone_for
 
 router = APIRouter(prefix="/schedules", tags=["Schedules"])
 
@@ -18,8 +21,37 @@ async def create_schedule(schedule: ScheduleCreate):
 
 # READ ALL
 @router.get("/", response_model=List[ScheduleRead])
-async def read_schedules():
-    return await schedule_crud.get_schedules(USER_ID)
+async def read_schedules(
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: id,start_time,end_time)"),
+    since: Optional[int] = Query(None, ge=0, description="이전 응답의 version -> 이후 변경분만 {version, full, upserts, deleted}로 응답"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    field_list = parse_fields(fields)
+    return await synced_list_response(
+        USER_ID,
+        schedule_crud.SYNC_KIND,
+        since,
+        field_list,
+        if_none_match,
+        full_rows=lambda: schedule_crud.get_schedule_rows(USER_ID, fields=field_list),
+        changed_rows=lambda v: schedule_crud.get_schedule_rows_since(USER_ID, v, fields=field_list),
+    )
+
+# ACTIVE NOW (+ 다음 시작/종료 시각)
+@router.get("/active", response_model=ScheduleStatusRead)
+async def read_active_schedules(
+    tz: str = Query("UTC", description="IANA timezone (스케줄 시각의 기준 시간대, 예: Asia/Seoul)"),
+):
+    status_ = await schedule_engine.status(USER_ID, zone_for(tz))
+    active = await schedule_crud.get_schedules_by_ids(USER_ID, status_["active_schedule_ids"])
+    return ScheduleStatusRead(
+        at=status_["at"],
+        tz=tz,
+        active=active,
+        next_transition_at=status_["next_transition_at"],
+        starting_schedule_ids=status_["starting_schedule_ids"],
+        ending_schedule_ids=status_["ending_schedule_ids"],
+    )
 
 # READ ONE
 @router.get("/{schedule_id}", response_model=ScheduleRead)
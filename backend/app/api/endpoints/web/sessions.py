@@ -1,11 +1,16 @@
 # backend/app/api/endpoints/web/sessions.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
 
 from app.api.deps import get_current_user_id
-from app.schemas.session import SessionCreate, SessionUpdate, SessionRead
+from app.api.responses import FastJSONResponse
+from app.schemas.session import SessionCreate, SessionUpdate, SessionRead, SessionStatsRead
 from app.crud import sessions as session_crud
+from app.crud import session_stats as session_stats_crud
+from app.crud.pagination import NEXT_CURSOR_HEADER
+from app.crud.projection import parse_fields
+from app.services import slice_features
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
 
@@ -21,10 +26,16 @@ async def start_session(
 @router.get("/", response_model=List[SessionRead])
 async def read_sessions(
     status: Optional[str] = None,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"이전 응답의 {NEXT_CURSOR_HEADER} 헤더 값"),
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: id,start_time,duration,status)"),
     user_id: str = Depends(get_current_user_id),
 ):
-    return await session_crud.get_sessions(user_id, status=status, limit=limit)
+    rows, next_cursor = await session_crud.get_session_rows_page(
+        user_id, status=status, limit=limit, cursor=cursor, fields=parse_fields(fields)
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(rows, headers=headers)
 
 
 @router.get("/current", response_model=SessionRead)
@@ -52,6 +63,44 @@ async def read_session(
     return session
 
 
+@router.get("/{session_id}/stats", response_model=SessionStatsRead)
+async def read_session_stats(
+    session_id: str,
+    user_id: str = Depends(get_current_user_id),
+):
+    stats = await session_stats_crud.get_session_stats(user_id, session_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Session stats not found")
+    return stats
+
+
+@router.get("/{session_id}/slices")
+async def read_session_slices(
+    session_id: str,
+    fill_gaps: bool = Query(True, description="이벤트가 없는 5분 구간도 0 행으로 포함"),
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    세션 이벤트를 5분 구간 피처 행으로 변환 (rows[i]의 열 순서 = features)
+    이벤트는 cursor로 스트리밍해 집계하므로 세션 길이와 관계없이 서버 메모리는 구간 행 수만큼만 사용
+    """
+    session = await session_crud.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    if session.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    end = await session_crud.get_session_window_end(user_id, session.start_time, session.end_time)
+    matrix = await slice_features.session_slice_matrix(user_id, session.start_time, end, fill_gaps)
+    return FastJSONResponse({
+        "session_id": session_id,
+        "slice_minutes": slice_features.SLICE_MINUTES,
+        "features": slice_features.SLICE_FEATURES,
+        "rows": matrix.tolist(),
+    })
+
+
 @router.put("/{session_id}", response_model=SessionRead)
 async def update_session(
     session_id: str,
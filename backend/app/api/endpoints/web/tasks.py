@@ -1,8 +1,10 @@
 # backend/app/api/endpoints/web/tasks.py
 
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from typing import List, Optional
 
+from app.api.sync import synced_list_response
+from app.crud.projection import parse_fields
 from app.schemas.task import TaskCreate, TaskUpdate, TaskRead
 from app.crud import tasks as task_crud
 
@@ -17,8 +19,21 @@ async def create_task(task: TaskCreate):
 
 # READ ALL
 @router.get("/", response_model=List[TaskRead])
-async def read_tasks():
-    return await task_crud.get_tasks(USER_ID)
+async def read_tasks(
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: id,name,status)"),
+    since: Optional[int] = Query(None, ge=0, description="이전 응답의 version -> 이후 변경분만 {version, full, upserts, deleted}로 응답"),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    field_list = parse_fields(fields)
+    return await synced_list_response(
+        USER_ID,
+        task_crud.SYNC_KIND,
+        since,
+        field_list,
+        if_none_match,
+        full_rows=lambda: task_crud.get_task_rows(USER_ID, fields=field_list),
+        changed_rows=lambda v: task_crud.get_task_rows_since(USER_ID, v, fields=field_list),
+    )
 
 # READ ONE
 @router.get("/{task_id}", response_model=TaskRead)
@@ -0,0 +1,37 @@
+# backend/app/api/responses.py
+
+from typing import Optional
+
+import orjson
+from fastapi.responses import Response
+
+
+class FastJSONResponse(Response):
+    """
+    목록 엔드포인트용 고속 JSON 응답
+    - crud의 *_row()가 만든 dict(응답 스키마와 같은 키/타입)를 orjson으로 바로 bytes 인코딩
+    - 엔드포인트가 이 응답을 직접 반환하면 response_model 재검증 / jsonable_encoder를 거치지 않음
+      (response_model은 OpenAPI 문서용으로만 남음)
+    - aware datetime은 Pydantic과 같게 UTC를 "Z"로 표기 (Mongo에서 읽은 naive 값은 그대로)
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    """
+    If-None-Match 헤더("v1", W/"v1", 목록, *)가 현재 태그(따옴표 없는 값)와 맞는지
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == tag:
+            return True
+    return False
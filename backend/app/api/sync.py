@@ -0,0 +1,64 @@
+# backend/app/api/sync.py
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.responses import Response
+
+from app.api.responses import FastJSONResponse, etag_matches
+from app.crud import sync_versions
+
+Rows = List[Dict[str, Any]]
+
+# 모든 동기화 응답(전체 목록 / 304 포함)에 싣는 현재 version -> 다음 요청의 ?since= 값
+SYNC_VERSION_HEADER = "X-Sync-Version"
+
+
+def sync_tag(version: int, fields: Optional[List[str]]) -> str:
+    """
+    ETag 값 (따옴표 제외). fields가 다르면 응답 내용도 다르므로 태그에 포함
+    """
+    return f"v{version}" if not fields else f"v{version};{','.join(sorted(fields))}"
+
+
+async def synced_list_response(
+    user_id: str,
+    kind: str,
+    since: Optional[int],
+    fields: Optional[List[str]],
+    if_none_match: Optional[str],
+    *,
+    full_rows: Callable[[], Awaitable[Rows]],
+    changed_rows: Callable[[int], Awaitable[Rows]],
+) -> Response:
+    """
+    에이전트 주기 동기화용 목록 응답 (GET /tasks, GET /schedules)
+
+    - 유저별 변경 version(sync_versions) 1건만 읽고 If-None-Match가 맞으면 304 (목록 조회 / 직렬화 없음)
+    - since 없음: 기존과 같은 전체 목록 + ETag (version은 SYNC_VERSION_HEADER 헤더로)
+    - since 있음: {"version", "full", "upserts", "deleted"}
+      since 이후 생성/수정된 항목(upserts)과 삭제된 id(deleted)만 응답
+      since=0(처음 동기화), tombstone이 정리돼 삭제 목록을 만들 수 없거나(since < floor) 알 수 없는 version이면
+      full=true로 전체 목록 (sync_version이 없는 예전 문서는 델타 조회에 걸리지 않으므로 since=0은 항상 전체)
+    """
+    version, floor = await sync_versions.get_version(user_id, kind)
+    tag = sync_tag(version, fields)
+    headers = {"ETag": f'"{tag}"', "Cache-Control": "no-cache", SYNC_VERSION_HEADER: str(version)}
+
+    if etag_matches(if_none_match, tag):
+        return Response(status_code=304, headers=headers)
+
+    if since is None:
+        return FastJSONResponse(await full_rows(), headers=headers)
+
+    if since < 1 or since < floor or since > version:
+        body = {"version": version, "full": True, "upserts": await full_rows(), "deleted": []}
+    elif since == version:
+        body = {"version": version, "full": False, "upserts": [], "deleted": []}
+    else:
+        body = {
+            "version": version,
+            "full": False,
+            "upserts": await changed_rows(since),
+            "deleted": await sync_versions.get_deleted_since(user_id, kind, since),
+        }
+    return FastJSONResponse(body, headers=headers)
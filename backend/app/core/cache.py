@@ -0,0 +1,134 @@
+# backend/app/core/cache.py
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    프로세스 내 LRU + TTL 캐시
+    - maxsize를 넘으면 가장 오래 안 쓴 항목부터 제거 (evictions)
+    - ttl이 지난 항목은 조회 시 제거 (expirations) -> 다른 프로세스에서 바뀐 값도 ttl 안에 반영
+    - maxsize <= 0 이면 아무것도 저장하지 않음 (캐시 끔)
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+
+# --------------------------------------------------------------------------
+# 캐시 백엔드 인터페이스 (여러 워커 프로세스가 같이 쓰는 외부 캐시(Redis 등)를 끼울 자리)
+# - 기본 구현은 프로세스 내 TTLCache를 감싼 LocalCacheBackend (워커 간 공유는 안 됨)
+# - 외부 백엔드는 값 직렬화 / TTL 만료를 자체 처리하고 같은 메서드를 구현하면 됨
+# --------------------------------------------------------------------------
+class CacheBackend(ABC, Generic[V]):
+    name = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[V]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: V) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        ...
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class LocalCacheBackend(CacheBackend[V]):
+    """
+    외부 캐시 서버 없이 쓰는 기본 구현: 프로세스 내 TTLCache (값을 그대로 보관, 직렬화 없음)
+    """
+
+    name = "local"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[V] = TTLCache(maxsize, ttl)
+
+    async def get(self, key: str) -> Optional[V]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: V) -> None:
+        self._cache.put(key, value)
+
+    async def delete(self, key: str) -> None:
+        self._cache.invalidate(key)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.maxsize > 0
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
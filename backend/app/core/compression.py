@@ -0,0 +1,196 @@
+# backend/app/core/compression.py
+
+import io
+import json
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # zstd는 선택 의존성 -> 없으면 gzip만 지원
+    zstandard = None
+
+
+# 압축 요청 본문을 받는 경로 (데스크탑 이벤트 업로드: /batch, /batch/columnar)
+DECOMPRESS_PATH_PREFIXES: Tuple[str, ...] = ("/api/v1/events/batch",)
+
+# 압축 해제 출력 단위 (이만큼씩 끊어서 풀며 누적 크기 확인)
+_READ_SIZE = 64 * 1024
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class _GzipDecoder:
+    """
+    gzip 본문을 chunk가 도착하는 대로 풀어냅니다.
+    max_length로 한 번에 풀 수 있는 양을 제한해 압축 폭탄도 한도에서 바로 멈춥니다.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.total = 0
+        self.parts: List[bytes] = []
+        self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def _take(self, data: bytes) -> None:
+        while data:
+            out = self._obj.decompress(data, self.limit - self.total + 1)
+            self.total += len(out)
+            if self.total > self.limit:
+                raise BodyTooLarge()
+            self.parts.append(out)
+            data = self._obj.unconsumed_tail
+
+    def feed(self, chunk: bytes) -> None:
+        self._take(chunk)
+
+    def finish(self) -> bytes:
+        tail = self._obj.flush()
+        self.total += len(tail)
+        if self.total > self.limit:
+            raise BodyTooLarge()
+        if not self._obj.eof:
+            raise zlib.error("incomplete gzip stream")
+        self.parts.append(tail)
+        return b"".join(self.parts)
+
+
+class _ZstdDecoder:
+    """
+    zstd 본문: 압축된 본문(크기 제한 적용)을 모은 뒤 stream_reader로 _READ_SIZE씩 풀며 한도 확인
+    (zstandard decompressobj는 출력 크기를 제한할 수 없어서 reader 방식 사용)
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._compressed = io.BytesIO()
+
+    def feed(self, chunk: bytes) -> None:
+        self._compressed.write(chunk)
+
+    def finish(self) -> bytes:
+        self._compressed.seek(0)
+        parts: List[bytes] = []
+        total = 0
+        with zstandard.ZstdDecompressor().stream_reader(self._compressed) as reader:
+            while True:
+                out = reader.read(_READ_SIZE)
+                if not out:
+                    break
+                total += len(out)
+                if total > self.limit:
+                    raise BodyTooLarge()
+                parts.append(out)
+        return b"".join(parts)
+
+
+def _decoder_for(encoding: str, limit: int):
+    if encoding in ("gzip", "x-gzip"):
+        return _GzipDecoder(limit)
+    if encoding == "zstd" and zstandard is not None:
+        return _ZstdDecoder(limit)
+    return None
+
+
+def supported_encodings() -> List[str]:
+    return ["gzip", "zstd"] if zstandard is not None else ["gzip"]
+
+
+class RequestDecompressionMiddleware:
+    """
+    Content-Encoding: gzip / zstd 요청 본문을 풀어서 앱에 넘기는 ASGI 미들웨어
+
+    - DECOMPRESS_PATH_PREFIXES 경로에만 적용 (그 외 경로의 압축 본문은 415)
+    - 압축 본문 크기 > REQUEST_MAX_COMPRESSED_BYTES 또는 해제 후 크기 > REQUEST_MAX_DECOMPRESSED_BYTES -> 413
+    - 깨진 압축 데이터 -> 400
+    - 앱에는 Content-Encoding을 뺀, 평문 본문 요청으로 전달
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        encoding = headers.get(b"content-encoding", b"").decode("latin-1").strip().lower()
+        if not encoding or encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        if not scope["path"].startswith(DECOMPRESS_PATH_PREFIXES):
+            await _send_error(send, 415, f"Content-Encoding '{encoding}' is not accepted on this path")
+            return
+
+        decoder = _decoder_for(encoding, settings.REQUEST_MAX_DECOMPRESSED_BYTES)
+        if decoder is None:
+            await _send_error(
+                send,
+                415,
+                f"Unsupported Content-Encoding '{encoding}'",
+                {b"accept-encoding": ", ".join(supported_encodings()).encode()},
+            )
+            return
+
+        try:
+            body = await _read_and_decode(receive, decoder)
+        except BodyTooLarge:
+            await _send_error(send, 413, "Request body too large")
+            return
+        except Exception:
+            await _send_error(send, 400, f"Invalid {encoding} request body")
+            return
+
+        if body is None:  # 본문을 다 받기 전에 클라이언트 연결 종료
+            return
+
+        # scope는 복사하지 않고 그대로 수정 (라우팅 결과 scope["route"]를 바깥 미들웨어도 볼 수 있도록)
+        scope["headers"] = [
+            (k, v) for k, v in scope["headers"]
+            if k not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode())]
+
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+
+async def _read_and_decode(receive, decoder) -> Optional[bytes]:
+    compressed = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunk = message.get("body", b"")
+        compressed += len(chunk)
+        if compressed > settings.REQUEST_MAX_COMPRESSED_BYTES:
+            raise BodyTooLarge()
+        decoder.feed(chunk)
+        more_body = message.get("more_body", False)
+    return decoder.finish()
+
+
+async def _send_error(send, status_code: int, detail: str, extra_headers: Optional[Dict[bytes, bytes]] = None):
+    # FastAPI HTTPException과 같은 {"detail": ...} 형식
+    payload = json.dumps({"detail": detail}).encode()
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(payload)).encode()),
+    ]
+    headers.extend((extra_headers or {}).items())
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": payload})
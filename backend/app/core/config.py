@@ -12,6 +12,84 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
 
+    #  기동 시 인덱스 생성 / 쿼리 플랜(explain) 자가 점검
+    MONGO_ENSURE_INDEXES: bool = True
+    MONGO_EXPLAIN_CHECK: bool = False
+
+    #  events 저장 방식
+    #  - "document": 이벤트 1건 = 문서 1개 (기본, 'events' 컬렉션)
+    #  - "timeseries": MongoDB time-series 컬렉션('events_ts')에 user_id 기준 버킷 저장
+    EVENTS_STORAGE: str = "document"
+    #  time-series 버킷 단위: "seconds" | "minutes" | "hours"
+    EVENTS_TIMESERIES_GRANULARITY: str = "minutes"
+
+    #  이벤트 고속 업로드(columnar) 시 insert_many 1회당 문서 수
+    EVENT_INGEST_CHUNK_SIZE: int = 1000
+
+    #  이벤트 적재 큐 (켜면 이벤트 업로드는 큐에 넣고 202로 바로 응답, writer가 모아서 저장)
+    INGEST_QUEUE_ENABLED: bool = False
+    INGEST_QUEUE_MAXSIZE: int = 1000            # 큐에 대기 가능한 요청(묶음) 수
+    INGEST_QUEUE_WORKERS: int = 2
+    INGEST_QUEUE_FLUSH_SIZE: int = 5000         # insert_many 1회에 모을 최대 이벤트 수
+    INGEST_QUEUE_FLUSH_INTERVAL_MS: int = 200   # 첫 묶음 이후 최대 대기 시간
+    INGEST_QUEUE_ENQUEUE_TIMEOUT_MS: int = 1000 # 큐가 가득 찼을 때 대기 시간 (초과 시 503)
+    INGEST_QUEUE_MAX_RETRIES: int = 5           # 저장 실패한 문서 재시도 횟수 (초과 시 ingest_dead_letters에 보관)
+    INGEST_QUEUE_RETRY_BACKOFF_MS: int = 200    # 재시도 대기 시간 (시도마다 2배, 최대 5초)
+
+    #  세션 통계 집계 시 이 간격(초)보다 긴 이벤트 공백은 idle gap으로 처리
+    SESSION_IDLE_GAP_SECONDS: int = 120
+
+    #  분석 캐시: 하루가 끝난 뒤 이 시간(분)이 지나야 "닫힌 날"로 보고 캐시 (늦은 동기화 대비)
+    ANALYTICS_DAY_CLOSE_GRACE_MINUTES: int = 60
+
+    #  이벤트 스트리밍 export 시 Mongo cursor batch 크기 (= 응답 chunk 당 행 수)
+    EVENT_EXPORT_BATCH_SIZE: int = 1000
+
+    #  압축 요청 본문(Content-Encoding: gzip / zstd) 크기 제한 (바이트)
+    REQUEST_MAX_COMPRESSED_BYTES: int = 10 * 1024 * 1024
+    REQUEST_MAX_DECOMPRESSED_BYTES: int = 50 * 1024 * 1024
+    #  응답 gzip 압축: 이 크기(바이트) 이상인 응답만 압축 (Accept-Encoding: gzip인 경우)
+    RESPONSE_GZIP_MIN_SIZE: int = 1024
+
+    #  스케줄 엔진: 유저별 활성 스케줄 인덱스 캐시 TTL(초) / 최대 유저 수
+    #  (다른 워커 프로세스에서 수정한 스케줄은 TTL 안에 반영)
+    SCHEDULE_ENGINE_REFRESH_SECONDS: int = 60
+    SCHEDULE_ENGINE_CACHE_SIZE: int = 10000
+    #  스케줄 엔진: 전체 유저 조회(active_now / starting_within) 시 한 번에 컴파일하는 유저 수
+    SCHEDULE_ENGINE_BULK_BATCH_SIZE: int = 500
+
+    #  세션 reaper: 마지막 이벤트(없으면 시작 시각) 이후 이 시간(분)이 지난 active 세션을 "abandoned"로 종료
+    #  (에이전트 이벤트의 session_id(local-/auto-)와 서버 세션 _id 매핑이 없어 유저 + 시간 구간으로 마지막 이벤트를 찾음)
+    SESSION_REAPER_ENABLED: bool = True
+    SESSION_REAPER_INTERVAL_SECONDS: int = 300
+    SESSION_ABANDON_AFTER_MINUTES: int = 30
+    SESSION_REAPER_BATCH_SIZE: int = 500
+
+    #  유저 문서 캐시 (/users/me, 인증 흐름): 프로세스 내 LRU 최대 항목 수(0이면 사용 안 함) / TTL(초)
+    #  워커 프로세스마다 따로 캐시 -> 다른 워커에서 바꾼 유저 문서(blocked_apps 등)는 최대 TTL 동안 이전 값
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    #  Prometheus 메트릭: 요청 지연 히스토그램 미들웨어 + MongoDB 명령 타이머 + GET /metrics (X-Admin-Key 필요)
+    METRICS_ENABLED: bool = True
+
+    #  distraction 점수: 이벤트 저장 후 유저별 모델(ml_models)로 배치 채점 -> events.distraction_score
+    DISTRACTION_SCORING_ENABLED: bool = True
+    DISTRACTION_MODEL_CACHE_SIZE: int = 256          # 메모리에 올려 둘 모델 수 (LRU)
+    DISTRACTION_MODEL_CACHE_TTL_SECONDS: int = 300   # 재학습된 모델을 다시 읽어 오는 주기
+    DISTRACTION_SCORING_MAX_PENDING: int = 100       # 대기 중인 채점 작업 상한 (초과 시 채점 생략)
+
+    #  ML 재학습 작업 (POST /admin/ml/train -> admin_job_logs)
+    ML_TRAINING_ENABLED: bool = True
+    ML_TRAINING_WORKERS: int = 2            # sklearn 학습을 돌리는 프로세스 수
+    ML_TRAINING_CONCURRENCY: int = 2        # 동시에 데이터 적재 + 학습하는 유저 수
+    ML_TRAINING_MIN_SAMPLES: int = 20       # 라벨(피드백)이 이보다 적으면 학습 생략
+    ML_TRAINING_MAX_SAMPLES: int = 20000    # 유저 / 공용 모델 1개당 최근 라벨 최대 수
+    ML_TRAINING_HEARTBEAT_SECONDS: float = 30.0  # 실행 중 작업 heartbeat 주기 (3회 이상 끊기면 중단된 작업으로 정리)
+
+    #  관리자 API (/admin/*): X-Admin-Key 헤더 값. 비어 있으면 관리자 API 사용 안 함
+    ADMIN_API_KEY: str = ""
+
     class Config:
         env_file = ".env"
         # .env에 정의되지 않은 변수가 있어도 무시하도록 설정 (오류 방지)
@@ -0,0 +1,398 @@
+# backend/app/core/metrics.py
+
+import functools
+import inspect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from pymongo import monitoring
+
+# --------------------------------------------------------------------------
+# Prometheus 텍스트 형식(0.0.4) 메트릭 (외부 의존성 없이 최소 구현)
+# - Counter / Gauge / Histogram + 라벨
+# - pymongo CommandListener 콜백은 드라이버 스레드에서 호출되므로 값 갱신은 lock으로 보호
+# - GET /metrics 에서 registry.render()로 노출
+# --------------------------------------------------------------------------
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 지연 시간(초) 버킷: 1ms ~ 10s
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 배치 크기(이벤트 수) 버킷
+BATCH_SIZE_BUCKETS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [버킷별 개수(누적 아님) ..., +Inf 개수], 합계
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        # 스크레이프 시점에 읽는 stats() dict (ingest_queue, 캐시, reaper 등)
+        self._stats_sources: List[Tuple[str, str, Callable[[], Dict[str, Any]]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, prefix: str, help: str, source: Callable[[], Dict[str, Any]]) -> None:
+        """
+        stats() dict의 숫자 값(bool 포함)을 {prefix}_{key} gauge로 노출
+        """
+        self._stats_sources.append((prefix, help, source))
+
+    def _render_stats(self) -> List[str]:
+        lines = []
+        for prefix, help, source in self._stats_sources:
+            try:
+                stats = source()
+            except Exception as e:
+                print(f"Metrics stats source '{prefix}' failed: {e}")
+                continue
+            for key, value in stats.items():
+                if not isinstance(value, (int, float)):
+                    continue
+                name = f"{prefix}_{key}"
+                lines.append(f"# HELP {name} {help} ({key})")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(float(value))}")
+        return lines
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.extend(self._render_stats())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+# --------------------------------------------------------------------------
+# 메트릭 정의
+# --------------------------------------------------------------------------
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+)
+AUTH_TOKEN_DECODE_DURATION = registry.histogram(
+    "auth_token_decode_duration_seconds",
+    "JWT decode/verify latency (token cache misses only)",
+)
+CRUD_OPERATION_DURATION = registry.histogram(
+    "crud_operation_duration_seconds",
+    "CRUD function latency including all of its MongoDB round trips",
+    ("function",),
+)
+MONGO_COMMAND_DURATION = registry.histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency reported by the driver",
+    ("command", "collection"),
+)
+MONGO_COMMAND_FAILURES = registry.counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error",
+    ("command", "collection"),
+)
+INGEST_EVENTS = registry.counter(
+    "ingest_events_total",
+    "Desktop events received, by upload path and outcome",
+    ("path", "outcome"),
+)
+INGEST_BATCH_SIZE = registry.histogram(
+    "ingest_batch_size_events",
+    "Events per upload request / queue flush",
+    ("path",),
+    buckets=BATCH_SIZE_BUCKETS,
+)
+
+
+def record_ingest(
+    path: str, received: int, inserted: int = 0, duplicates: int = 0, failed: int = 0, queued: int = 0
+) -> None:
+    """
+    path: batch / columnar (요청 단위) / queue (적재 큐 flush 단위)
+    """
+    INGEST_BATCH_SIZE.observe(received, path=path)
+    for outcome, count in (
+        ("inserted", inserted), ("duplicate", duplicates), ("failed", failed), ("queued", queued)
+    ):
+        if count:
+            INGEST_EVENTS.inc(count, path=path, outcome=outcome)
+
+
+# --------------------------------------------------------------------------
+# CRUD 함수 타이머
+# --------------------------------------------------------------------------
+def timed(fn: Callable) -> Callable:
+    """
+    async CRUD 함수에 붙여 crud_operation_duration_seconds{function="모듈.함수"}로 기록
+    (async generator는 소비하는 쪽에 따라 시간이 달라지므로 그대로 반환)
+    """
+    if not inspect.iscoroutinefunction(fn):
+        return fn
+
+    label = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            CRUD_OPERATION_DURATION.observe(time.perf_counter() - started, function=label)
+
+    return wrapper
+
+
+# --------------------------------------------------------------------------
+# MongoDB 명령 타이머 (pymongo CommandListener)
+# - connect_to_mongo()에서 AsyncIOMotorClient(event_listeners=[...])로 등록
+# --------------------------------------------------------------------------
+_CURSOR_COMMANDS = {"getMore": "collection"}
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        field = _CURSOR_COMMANDS.get(event.command_name, event.command_name)
+        value = event.command.get(field)
+        return value if isinstance(value, str) else ""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                event.command_name,
+                self._collection(event),
+            )
+
+    def _finish(self, event, failed: bool) -> None:
+        with self._lock:
+            command, collection = self._pending.pop(
+                (event.connection_id, event.request_id), (event.command_name, "")
+            )
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1_000_000, command=command, collection=collection)
+        if failed:
+            MONGO_COMMAND_FAILURES.inc(command=command, collection=collection)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+# --------------------------------------------------------------------------
+# HTTP 미들웨어
+# --------------------------------------------------------------------------
+def _route_template(scope) -> str:
+    """
+    경로 파라미터를 뺀 라우트 템플릿 (/api/v1/sessions/{session_id}) -> 라벨 수가 라우트 수로 제한됨
+    라우터가 매칭 후 scope["route"]에 넣어 둔 값을 사용 (매칭 실패 / 404는 <unmatched>)
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "<unmatched>"
+
+    # include_router(prefix=...)를 지연 적용하는 FastAPI 버전은 route.path에 prefix가 빠져 있음
+    # -> 실제 경로에서 route.path에 해당하는 뒷부분을 찾아 그 앞(고정 prefix)을 붙임
+    path = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is not None and not regex.match(path):
+        for i in range(1, len(path)):
+            if path[i] == "/" and regex.match(path[i:]):
+                return path[:i] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    요청별 지연 시간(라우트 템플릿 / 메서드 / 상태 코드) + 처리 중 요청 수를 기록하는 ASGI 미들웨어
+    (가장 바깥에 등록해야 압축 해제 / 세션 처리 시간까지 포함됨)
+    """
+
+    def __init__(self, app, exclude_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUEST_DURATION.observe(
+                elapsed,
+                method=scope["method"],
+                route=_route_template(scope),
+                status=str(status_code),
+            )
@@ -0,0 +1,151 @@
+# backend/app/crud/admin_jobs.py
+
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+from app.core.metrics import timed
+from app.db.mongo import get_db
+
+ACTIVE_STATUSES = ("pending", "running")
+
+# 이 프로세스 식별자: 작업 문서의 owner로 기록 (워커가 여러 개면 실행 중 작업의 주인을 구분)
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def get_admin_job_logs_collection():
+    """
+    Motor DB 핸들에서 admin_job_logs 컬렉션을 가져옵니다.
+    문서 1개 = 관리 작업 1건 (models/admin_job_log.AdminJobLogInDB + progress)
+    실행 중인 작업은 owner 프로세스가 heartbeat_at을 주기적으로 갱신
+    """
+    return get_db()["admin_job_logs"]
+
+
+def _safe_object_id(job_id: str) -> ObjectId:
+    try:
+        return ObjectId(job_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid job_id")
+
+
+def serialize_job(doc) -> Dict[str, Any]:
+    return {
+        "id": str(doc["_id"]),
+        "job_type": doc["job_type"],
+        "triggered_by": doc["triggered_by"],
+        "start_time": doc["start_time"],
+        "end_time": doc.get("end_time"),
+        "status": doc["status"],
+        "parameters": doc.get("parameters") or {},
+        "progress": doc.get("progress") or {},
+        "result": doc.get("result"),
+        "error_message": doc.get("error_message"),
+    }
+
+
+@timed
+async def create_job(job_type: str, triggered_by: str, parameters: Dict[str, Any]) -> str:
+    result = await get_admin_job_logs_collection().insert_one({
+        "job_type": job_type,
+        "triggered_by": triggered_by,
+        "start_time": datetime.utcnow(),
+        "end_time": None,
+        "status": "pending",
+        "parameters": parameters,
+        "progress": {},
+        "result": None,
+        "error_message": None,
+        "owner": INSTANCE_ID,
+        "heartbeat_at": datetime.utcnow(),
+    })
+    return str(result.inserted_id)
+
+
+@timed
+async def heartbeat_jobs(job_ids: List[str]) -> None:
+    """
+    이 프로세스가 실행 중인 작업들의 heartbeat_at 갱신
+    """
+    await get_admin_job_logs_collection().update_many(
+        {"_id": {"$in": [ObjectId(job_id) for job_id in job_ids]}, "owner": INSTANCE_ID},
+        {"$set": {"heartbeat_at": datetime.utcnow()}},
+    )
+
+
+def _live_filter(stale_after: timedelta) -> Dict[str, Any]:
+    return {"heartbeat_at": {"$gte": datetime.utcnow() - stale_after}}
+
+
+@timed
+async def find_active_job(job_type: str, parameters: Dict[str, Any], stale_after: timedelta) -> Optional[str]:
+    """
+    다른 워커를 포함해 같은 파라미터로 실행 중인(heartbeat가 살아 있는) 작업 id
+    """
+    doc = await get_admin_job_logs_collection().find_one(
+        {
+            "job_type": job_type,
+            "status": {"$in": list(ACTIVE_STATUSES)},
+            "parameters": parameters,
+            **_live_filter(stale_after),
+        },
+        {"_id": 1},
+    )
+    return str(doc["_id"]) if doc else None
+
+
+@timed
+async def update_job(job_id: str, **fields: Any) -> None:
+    await get_admin_job_logs_collection().update_one({"_id": ObjectId(job_id)}, {"$set": fields})
+
+
+@timed
+async def finish_job(
+    job_id: str,
+    status: str,
+    *,
+    progress: Dict[str, Any],
+    result: Optional[Dict[str, Any]] = None,
+    error_message: Optional[str] = None,
+) -> None:
+    await update_job(
+        job_id,
+        status=status,
+        end_time=datetime.utcnow(),
+        progress=progress,
+        result=result,
+        error_message=error_message,
+    )
+
+
+@timed
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    doc = await get_admin_job_logs_collection().find_one({"_id": _safe_object_id(job_id)})
+    return serialize_job(doc) if doc else None
+
+
+@timed
+async def fail_interrupted_jobs(job_type: str, stale_after: timedelta) -> int:
+    """
+    끝나지 않은(pending / running) 작업 중 heartbeat가 stale_after 이상 끊긴 작업만 failed로 정리
+    (종료 / 중단된 프로세스의 작업. 다른 워커가 실행 중인 작업은 heartbeat가 살아 있어 그대로 둠)
+    heartbeat_at이 없는 예전 문서는 start_time으로 판단
+    """
+    now = datetime.utcnow()
+    cutoff = now - stale_after
+    result = await get_admin_job_logs_collection().update_many(
+        {
+            "job_type": job_type,
+            "status": {"$in": list(ACTIVE_STATUSES)},
+            "$or": [
+                {"heartbeat_at": {"$lt": cutoff}},
+                {"heartbeat_at": {"$exists": False}, "start_time": {"$lt": cutoff}},
+            ],
+        },
+        {"$set": {"status": "failed", "end_time": now, "error_message": "interrupted (owner stopped sending heartbeats)"}},
+    )
+    return result.modified_count
@@ -0,0 +1,319 @@
+# backend/app/crud/analytics.py
+
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.metrics import timed
+from app.crud import users as users_crud
+from app.crud.events import get_events_collection
+from app.db.mongo import get_db
+from app.schemas.analytics import AppUsage, DailyFocusRead, WeeklyFocusRead
+
+TOP_APPS_LIMIT = 5
+MAX_RANGE_DAYS = 366
+
+
+def get_analytics_daily_collection():
+    """
+    닫힌 날(더 이상 바뀌지 않는 날)의 일간 집계 캐시
+    _id = "{user_id}|{tz}|{YYYY-MM-DD}"
+    - start_utc / end_utc: 그 날의 UTC 범위 (늦게 동기화된 이벤트/세션이 들어오면 겹치는 행 삭제)
+    - blocked_apps: 계산 당시 차단 후보 앱 목록 (top_distracting_apps가 이 목록에 의존 -> 바뀌면 다시 계산)
+    """
+    return get_db()["analytics_daily"]
+
+
+def _zone(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid tz")
+
+
+def _day_bounds_utc(day: date, zone: ZoneInfo) -> tuple[datetime, datetime]:
+    """
+    현지 날짜 하루 [00:00, 다음날 00:00) -> UTC 범위
+    """
+    start = datetime.combine(day, time.min, tzinfo=zone)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=zone)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def _as_utc(ts: datetime) -> datetime:
+    # Mongo에서 읽은 naive datetime은 UTC
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _cache_id(user_id: str, tz: str, day: date) -> str:
+    return f"{user_id}|{tz}|{day.isoformat()}"
+
+
+def _empty_day() -> Dict[str, Any]:
+    return {
+        "sessions": 0,
+        "focused_seconds": 0.0,
+        "interruption_count": 0,
+        "goal_sessions": 0,
+        "goal_completed": 0,
+        "apps": {},
+    }
+
+
+def _apps_to_dict(apps: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {a["app_name"]: a["samples"] for a in apps or []}
+
+
+def _apps_to_list(apps: Dict[str, int]) -> List[Dict[str, Any]]:
+    # 앱 이름에 '.'이 들어가므로(chrome.exe) 캐시 문서에는 dict 대신 리스트로 저장
+    return [{"app_name": name, "samples": count} for name, count in apps.items()]
+
+
+# --------------------------------------------------------------------------
+# Aggregation pipelines
+# --------------------------------------------------------------------------
+async def _aggregate_sessions(
+    user_id: str, start_utc: datetime, end_utc: datetime, tz: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    sessions를 현지 날짜별로 집계 (index: user_id, start_time, _id)
+    """
+    goal = {"$ifNull": ["$goal_duration", 0]}
+    duration = {"$ifNull": ["$duration", 0]}
+
+    pipeline = [
+        {"$match": {"user_id": user_id, "start_time": {"$gte": start_utc, "$lt": end_utc}}},
+        {
+            "$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$start_time", "timezone": tz}},
+                "sessions": {"$sum": 1},
+                "focused_seconds": {"$sum": duration},
+                "interruption_count": {"$sum": {"$ifNull": ["$interruption_count", 0]}},
+                "goal_sessions": {"$sum": {"$cond": [{"$gt": [goal, 0]}, 1, 0]}},
+                # goal_duration은 분 단위, duration은 초 단위
+                "goal_completed": {
+                    "$sum": {
+                        "$cond": [
+                            {"$and": [{"$gt": [goal, 0]}, {"$gte": [duration, {"$multiply": [goal, 60]}]}]},
+                            1,
+                            0,
+                        ]
+                    }
+                },
+            }
+        },
+    ]
+
+    cursor = get_db()["sessions"].aggregate(pipeline)
+    return {row.pop("_id"): row async for row in cursor}
+
+
+async def _aggregate_distracting_apps(
+    user_id: str, start_utc: datetime, end_utc: datetime, tz: str, apps: List[str]
+) -> Dict[str, Dict[str, int]]:
+    """
+    events에서 차단 후보 앱(blocked_apps)의 샘플 수를 현지 날짜 x 앱별로 집계 (index: user_id, timestamp, _id)
+    """
+    if not apps:
+        return {}
+
+    pipeline = [
+        {
+            "$match": {
+                "user_id": user_id,
+                "timestamp": {"$gte": start_utc, "$lt": end_utc},
+                "app_name": {"$in": apps},
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp", "timezone": tz}},
+                    "app": "$app_name",
+                },
+                "samples": {"$sum": 1},
+            }
+        },
+        {"$group": {"_id": "$_id.day", "apps": {"$push": {"app_name": "$_id.app", "samples": "$samples"}}}},
+    ]
+
+    cursor = get_events_collection().aggregate(pipeline)
+    return {row["_id"]: _apps_to_dict(row["apps"]) async for row in cursor}
+
+
+async def _get_blocked_apps(user_id: str) -> List[str]:
+    user = await users_crud.get_user_by_id(user_id, fields=["blocked_apps"])
+    return sorted(user.blocked_apps) if user else []
+
+
+async def _compute_days(
+    user_id: str, days: List[date], tz: str, zone: ZoneInfo, blocked_apps: List[str]
+) -> Dict[date, Dict[str, Any]]:
+    """
+    주어진 날짜들을 (연속 구간 한 번에) 집계합니다. 데이터 없는 날은 0으로 채움.
+    """
+    start_utc, _ = _day_bounds_utc(min(days), zone)
+    _, end_utc = _day_bounds_utc(max(days), zone)
+
+    session_rows = await _aggregate_sessions(user_id, start_utc, end_utc, tz)
+    app_rows = await _aggregate_distracting_apps(user_id, start_utc, end_utc, tz, blocked_apps)
+
+    wanted = set(days)
+    result: Dict[date, Dict[str, Any]] = {}
+    for day in wanted:
+        key = day.isoformat()
+        row = _empty_day()
+        row.update(session_rows.get(key, {}))
+        row["apps"] = app_rows.get(key, {})
+        result[day] = row
+    return result
+
+
+def _summary(row: Dict[str, Any]) -> Dict[str, Any]:
+    apps = Counter(row.get("apps") or {})
+    goal_sessions = int(row.get("goal_sessions", 0))
+    goal_completed = int(row.get("goal_completed", 0))
+    return {
+        "sessions": int(row.get("sessions", 0)),
+        "focused_seconds": float(row.get("focused_seconds", 0.0)),
+        "interruption_count": int(row.get("interruption_count", 0)),
+        "goal_sessions": goal_sessions,
+        "goal_completed": goal_completed,
+        "completion_rate": round(goal_completed / goal_sessions, 4) if goal_sessions else None,
+        "top_distracting_apps": [
+            AppUsage(app_name=name, samples=int(count))
+            for name, count in apps.most_common(TOP_APPS_LIMIT)
+        ],
+    }
+
+
+# --------------------------------------------------------------------------
+# READ
+# --------------------------------------------------------------------------
+async def _get_daily_rows(
+    user_id: str, start_date: date, end_date: date, tz: str
+) -> Dict[date, Dict[str, Any]]:
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range must be at most {MAX_RANGE_DAYS} days")
+
+    zone = _zone(tz)
+    col = get_analytics_daily_collection()
+
+    days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+    blocked_apps = await _get_blocked_apps(user_id)
+
+    # 1. 캐시된 닫힌 날 조회 (차단 앱 목록이 계산 당시와 다르면 캐시 무시)
+    cached = {
+        doc["date"]: doc
+        async for doc in col.find({"_id": {"$in": [_cache_id(user_id, tz, d) for d in days]}})
+        if doc.get("blocked_apps") == blocked_apps
+    }
+    rows: Dict[date, Dict[str, Any]] = {
+        d: {**cached[d.isoformat()], "apps": _apps_to_dict(cached[d.isoformat()].get("apps"))}
+        for d in days
+        if d.isoformat() in cached
+    }
+
+    # 2. 나머지 날짜만 aggregation pipeline으로 계산
+    missing = [d for d in days if d not in rows]
+    if missing:
+        computed = await _compute_days(user_id, missing, tz, zone, blocked_apps)
+        rows.update(computed)
+
+        # 3. 닫힌 날만 캐시에 저장 (오늘/미래는 계속 바뀌므로 제외)
+        close_before = datetime.now(timezone.utc) - timedelta(minutes=settings.ANALYTICS_DAY_CLOSE_GRACE_MINUTES)
+        operations = []
+        for day, row in computed.items():
+            day_start_utc, day_end_utc = _day_bounds_utc(day, zone)
+            if day_end_utc <= close_before:
+                operations.append(
+                    UpdateOne(
+                        {"_id": _cache_id(user_id, tz, day)},
+                        {
+                            "$set": {
+                                **row,
+                                "apps": _apps_to_list(row["apps"]),
+                                "user_id": user_id,
+                                "tz": tz,
+                                "date": day.isoformat(),
+                                "start_utc": day_start_utc,
+                                "end_utc": day_end_utc,
+                                "blocked_apps": blocked_apps,
+                            }
+                        },
+                        upsert=True,
+                    )
+                )
+        if operations:
+            await col.bulk_write(operations, ordered=False)
+
+    return rows
+
+
+# --------------------------------------------------------------------------
+# INVALIDATE (늦게 동기화된 데이터)
+# --------------------------------------------------------------------------
+@timed
+async def invalidate_closed_days(user_id: str, start: datetime, end: datetime) -> int:
+    """
+    [start, end] 시각을 포함하는 닫힌 날 캐시 행을 삭제합니다 (모든 tz). 반환: 삭제된 행 수
+    - 이벤트/세션 쓰기 경로에서 호출: 닫힌 날은 (지금 - 유예 시간) 이전에 끝난 날뿐이므로
+      그보다 최근 데이터만 들어온 일반적인 경우에는 DB를 조회하지 않음
+    """
+    start, end = _as_utc(start), _as_utc(end)
+    close_before = datetime.now(timezone.utc) - timedelta(minutes=settings.ANALYTICS_DAY_CLOSE_GRACE_MINUTES)
+    if start >= close_before:
+        return 0
+    result = await get_analytics_daily_collection().delete_many(
+        {"user_id": user_id, "start_utc": {"$lte": end}, "end_utc": {"$gt": start}}
+    )
+    return result.deleted_count
+
+
+async def invalidate_for_events(user_id: str, docs: Iterable[Dict[str, Any]]) -> int:
+    """
+    저장된 이벤트 문서들의 timestamp 범위로 invalidate_closed_days (session_id 유무와 무관하게 적재 경로에서 호출)
+    """
+    timestamps = [_as_utc(d["timestamp"]) for d in docs if d.get("timestamp") is not None]
+    if not timestamps:
+        return 0
+    return await invalidate_closed_days(user_id, min(timestamps), max(timestamps))
+
+
+@timed
+async def get_daily_focus(
+    user_id: str, start_date: date, end_date: date, tz: str = "UTC"
+) -> List[DailyFocusRead]:
+    rows = await _get_daily_rows(user_id, start_date, end_date, tz)
+    return [DailyFocusRead(date=day, **_summary(rows[day])) for day in sorted(rows)]
+
+
+@timed
+async def get_weekly_focus(
+    user_id: str, start_date: date, end_date: date, tz: str = "UTC"
+) -> List[WeeklyFocusRead]:
+    """
+    일간 집계(캐시 포함)를 월요일 기준 주 단위로 합산합니다.
+    start_date/end_date는 각각 해당 주의 월요일/일요일로 확장됩니다.
+    """
+    week_start = start_date - timedelta(days=start_date.weekday())
+    week_end = end_date + timedelta(days=6 - end_date.weekday())
+    rows = await _get_daily_rows(user_id, week_start, week_end, tz)
+
+    weeks: Dict[date, Dict[str, Any]] = {}
+    for day, row in rows.items():
+        monday = day - timedelta(days=day.weekday())
+        week = weeks.setdefault(monday, {**_empty_day(), "apps": Counter()})
+        for field in ("sessions", "focused_seconds", "interruption_count", "goal_sessions", "goal_completed"):
+            week[field] += row.get(field, 0)
+        week["apps"].update(row.get("apps") or {})
+
+    return [WeeklyFocusRead(week_start=monday, **_summary(weeks[monday])) for monday in sorted(weeks)]
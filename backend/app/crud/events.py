@@ -1,15 +1,29 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import os
+import time
 import uuid
 
-from app.schemas.event import EventCreate, EventRead
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.config import settings
+from app.core.metrics import timed
+from app.crud import pagination, projection, session_stats
+from app.schemas.event import EventColumnarBatch, EventCreate, EventRead
 
 
 def get_events_collection():
-    from app.db.mongo import db
+    """
+    EVENTS_STORAGE 설정(document / timeseries)에 맞는 이벤트 컬렉션을 반환합니다.
+    읽기/쓰기 모두 이 함수를 거치므로 저장 방식이 바뀌어도 호출부는 그대로입니다.
+    """
+    from app.db.mongo import db, events_collection_name
     if db is None:
         raise RuntimeError("MongoDB not initialized. Did you call connect_to_mongo()?")
-    return db["events"]
+    return db[events_collection_name()]
 
 
 def serialize_event(doc) -> EventRead:
@@ -21,10 +35,45 @@ def serialize_event(doc) -> EventRead:
         app_name=doc.get("app_name"),
         window_title=doc.get("window_title"),
         activity_vector=doc.get("activity_vector", {}) or {},
+        distraction_score=doc.get("distraction_score"),
     )
 
 
+# 목록 fast path용: EventRead 필드만 읽는 projection
+EVENT_PROJECTION = {
+    "_id": 1,
+    "user_id": 1,
+    "session_id": 1,
+    "timestamp": 1,
+    "app_name": 1,
+    "window_title": 1,
+    "activity_vector": 1,
+    "distraction_score": 1,
+}
+
+# fields로 일부만 읽어도 EventRead 모델을 만들 수 있도록 항상 읽는 필드
+EVENT_REQUIRED_FIELDS = ("user_id", "timestamp")
+
+
+def event_row(doc) -> Dict[str, Any]:
+    """
+    Mongo 문서 -> EventRead와 같은 키 구성의 dict (모델 생성 없이, FastJSONResponse / export용)
+    projection으로 빠진 필드는 None (호출부에서 select_fields로 잘라냄)
+    """
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc.get("user_id"),
+        "session_id": doc.get("session_id"),
+        "timestamp": doc.get("timestamp"),
+        "app_name": doc.get("app_name"),
+        "window_title": doc.get("window_title"),
+        "activity_vector": doc.get("activity_vector") or {},
+        "distraction_score": doc.get("distraction_score"),
+    }
+
+
 # CREATE
+@timed
 async def create_event(event: EventCreate) -> str:
     """
     이벤트 1개 생성 후 event_id(str) 반환
@@ -47,17 +96,28 @@ async def create_event(event: EventCreate) -> str:
     return event_id
 
 
-# CREATE - 서버에서 user_id 주입하는 버전
-async def create_event_for_user(user_id: str, event: EventCreate) -> str:
+# MongoDB duplicate key 에러 코드
+DUPLICATE_KEY_ERROR = 11000
+
+
+def event_document_id(user_id: str, event_key: Optional[str]) -> str:
     """
-    요청 스키마의 user_id는 무시하고 서버 user_id로 강제 주입
-    - _id를 uuid 문자열로 통일
+    저장용 _id
+    - event_key가 있으면 "{user_id}:{event_key}" (유저별 네임스페이스 -> 재전송해도 같은 _id)
+    - 없으면 uuid 문자열
     """
-    events = get_events_collection()
+    if event_key:
+        return f"{user_id}:{event_key}"
+    return str(uuid.uuid4())
 
-    event_id = str(uuid.uuid4())
-    new_doc = {
-        "_id": event_id,  
+
+def build_event_document_for_user(user_id: str, event: EventCreate) -> Dict[str, Any]:
+    """
+    요청 스키마의 user_id는 무시하고 서버 user_id로 강제 주입한 저장용 문서
+    - _id는 event_key 기반 고정 키 또는 uuid 문자열
+    """
+    return {
+        "_id": event_document_id(user_id, event.event_key),
         "user_id": user_id,
         "session_id": event.session_id,
         "timestamp": event.timestamp,
@@ -66,30 +126,256 @@ async def create_event_for_user(user_id: str, event: EventCreate) -> str:
         "activity_vector": event.activity_vector or {},
     }
 
-    await events.insert_one(new_doc)
+
+# CREATE - 서버에서 user_id 주입하는 버전
+@timed
+async def create_event_for_user(user_id: str, event: EventCreate) -> str:
+    """
+    요청 스키마의 user_id는 무시하고 서버 user_id로 강제 주입
+    - event_key가 이미 저장돼 있으면 다시 저장/집계하지 않고 같은 event_id 반환
+    """
+    new_doc = build_event_document_for_user(user_id, event)
+    event_id = new_doc["_id"]
+
+    inserted, _, errors = await insert_many_unordered([new_doc])
+    if errors:
+        raise HTTPException(status_code=500, detail="Failed to store event")
+    if inserted:
+        # analytics -> events 순환 import를 피하려고 함수 안에서 import
+        from app.crud import analytics
+        await session_stats.apply_event_docs(user_id, inserted)
+        await analytics.invalidate_for_events(user_id, inserted)
     return event_id
 
 
+# CREATE - 열(column) 배열 기반 고속 배치
+def new_event_ids(n: int) -> List[str]:
+    """
+    uuid4 문자열 n개를 한 번에 생성합니다.
+    - os.urandom 1회 호출로 필요한 난수를 모두 받아 잘라 씀 (이벤트마다 uuid4() 호출 X)
+    """
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
+def build_event_documents(user_id: str, batch: EventColumnarBatch) -> List[Dict[str, Any]]:
+    """
+    EventColumnarBatch -> Mongo 문서(dict) 리스트
+    - 이벤트별 Pydantic 모델(EventInDB)을 만들지 않고 열을 zip으로 묶어 바로 dict 생성
+    """
+    n = len(batch.timestamp)
+    nones = [None] * n
+
+    ids = new_event_ids(n)
+    if batch.event_key:
+        ids = [f"{user_id}:{key}" if key else _id for _id, key in zip(ids, batch.event_key)]
+    session_ids = batch.session_id or nones
+    app_names = batch.app_name or nones
+    window_titles = batch.window_title or nones
+    vectors = batch.activity_vector or nones
+
+    return [
+        {
+            "_id": _id,
+            "user_id": user_id,
+            "session_id": sid,
+            "timestamp": ts,
+            "app_name": app,
+            "window_title": title,
+            "activity_vector": vec or {},
+        }
+        for _id, sid, ts, app, title, vec in zip(
+            ids, session_ids, batch.timestamp, app_names, window_titles, vectors
+        )
+    ]
+
+
+async def _drop_stored_ids(
+    documents: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    time-series 컬렉션은 _id unique 인덱스가 없어서 중복 insert가 에러 없이 저장됩니다.
+    그래서 저장 전에 이미 있는 _id(와 배치 안의 중복)를 직접 걸러냅니다.
+    user_id(metaField) + 배치의 timestamp 범위(timeField)를 함께 걸어 해당 유저 / 기간 버킷만 조회합니다.
+
+    best-effort 중복 제거: 조회와 insert 사이에 같은 이벤트가 다른 요청으로 저장되면
+    (동시 재전송) 둘 다 저장될 수 있음. 재전송 이벤트는 timestamp가 같으므로 범위 조건으로 놓치지 않음
+    """
+    from app.db.mongo import events_collection_name
+    if events_collection_name() != "events_ts":
+        return documents, 0
+
+    timestamps = [d["timestamp"] for d in documents]
+    stored = {
+        doc["_id"]
+        async for doc in get_events_collection().find(
+            {
+                "user_id": {"$in": list({d["user_id"] for d in documents})},
+                "timestamp": {"$gte": min(timestamps), "$lte": max(timestamps)},
+                "_id": {"$in": [d["_id"] for d in documents]},
+            },
+            {"_id": 1},
+        )
+    }
+
+    fresh = []
+    for doc in documents:
+        if doc["_id"] in stored:
+            continue
+        stored.add(doc["_id"])
+        fresh.append(doc)
+    return fresh, len(documents) - len(fresh)
+
+
+@timed
+async def insert_many_unordered(
+    documents: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], int, List[Dict[str, Any]]]:
+    """
+    unordered insert_many 후 (실제로 저장된 문서들, 중복 개수, 그 외 writeErrors)를 반환합니다.
+    - 일부 문서가 실패해도 나머지는 저장되므로, 실패한 index만 걸러냅니다.
+    - duplicate key(11000)는 "이미 저장된 이벤트(재전송)"이므로 에러가 아니라 중복으로 집계
+    """
+    if not documents:
+        return [], 0, []
+
+    documents, duplicates = await _drop_stored_ids(documents)
+    if not documents:
+        return [], duplicates, []
+
+    try:
+        await get_events_collection().insert_many(documents, ordered=False)
+        return documents, duplicates, []
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        failed = {err["index"] for err in errors}
+        inserted = [doc for i, doc in enumerate(documents) if i not in failed]
+        others = [err for err in errors if err.get("code") != DUPLICATE_KEY_ERROR]
+        return inserted, duplicates + len(errors) - len(others), others
+    except DuplicateKeyError:
+        # 문서 1개짜리 insert에서 드라이버가 BulkWriteError 대신 올리는 경우
+        return [], duplicates + len(documents), []
+
+
+@timed
+async def insert_event_documents(
+    documents: List[Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], int]:
+    """
+    문서 리스트를 chunk 단위 unordered insert_many로 저장하고 처리량을 기록합니다.
+    반환: ({"count", "duplicates", "chunks", "elapsed_ms", "events_per_sec"}, 실제로 저장된 문서들, 실패 개수)
+    실패 개수에는 duplicate key(재전송)는 포함하지 않습니다.
+    """
+    size = max(1, chunk_size or settings.EVENT_INGEST_CHUNK_SIZE)
+
+    inserted_docs: List[Dict[str, Any]] = []
+    duplicates = 0
+    failed = 0
+    chunks = 0
+    started = time.perf_counter()
+
+    for offset in range(0, len(documents), size):
+        chunk = documents[offset:offset + size]
+        chunk_started = time.perf_counter()
+        inserted, chunk_duplicates, errors = await insert_many_unordered(chunk)
+        chunk_elapsed = time.perf_counter() - chunk_started
+
+        chunks += 1
+        inserted_docs.extend(inserted)
+        duplicates += chunk_duplicates
+        failed += len(errors)
+        rate = len(inserted) / chunk_elapsed if chunk_elapsed > 0 else 0.0
+        print(
+            f"[ingest] pid={os.getpid()} chunk={chunks} size={len(chunk)} "
+            f"duplicates={chunk_duplicates} elapsed={chunk_elapsed * 1000:.1f}ms rate={rate:.0f} events/sec"
+        )
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "count": len(inserted_docs),
+        "duplicates": duplicates,
+        "chunks": chunks,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "events_per_sec": round(len(inserted_docs) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    return report, inserted_docs, failed
+
+
+# CREATE (적재 큐에서 끝내 저장하지 못한 문서 보관)
+def get_dead_letters_collection():
+    from app.db.mongo import db
+    if db is None:
+        raise RuntimeError("MongoDB not initialized. Did you call connect_to_mongo()?")
+    return db["ingest_dead_letters"]
+
+
+@timed
+async def save_dead_letters(documents: List[Dict[str, Any]], reason: str) -> int:
+    """
+    202로 응답한 뒤 저장하지 못한 이벤트 문서를 원본 그대로 보관합니다. 반환: 보관한 문서 수
+    - event 필드의 _id는 원래 값 그대로 -> 나중에 events로 다시 넣어도 중복 저장되지 않음
+    """
+    if not documents:
+        return 0
+    failed_at = datetime.utcnow()
+    await get_dead_letters_collection().insert_many(
+        [
+            {"user_id": doc.get("user_id"), "event": doc, "reason": reason, "failed_at": failed_at}
+            for doc in documents
+        ],
+        ordered=False,
+    )
+    return len(documents)
+
+
+# UPDATE (distraction 점수 기록)
+@timed
+async def set_distraction_scores(
+    event_ids: List[str], scores: List[float], model_version: Optional[str]
+) -> int:
+    """
+    이벤트별 distraction_score를 bulk_write 1회로 기록합니다. 반환: 수정된 문서 수
+    (time-series 컬렉션은 metaField 외 필드를 수정할 수 없으므로 document 저장 방식에서만 호출)
+    """
+    if not event_ids:
+        return 0
+    operations = [
+        UpdateOne(
+            {"_id": event_id},
+            {"$set": {"distraction_score": score, "distraction_model": model_version}},
+        )
+        for event_id, score in zip(event_ids, scores)
+    ]
+    result = await get_events_collection().bulk_write(operations, ordered=False)
+    return result.modified_count
+
+
 # READ ONE
-async def get_event(event_id: str) -> Optional[EventRead]:
+@timed
+async def get_event(event_id: str, user_id: Optional[str] = None) -> Optional[EventRead]:
+    """
+    user_id를 주면 필터에 포함합니다.
+    (time-series 저장 시 metaField(user_id)로 버킷 범위를 좁혀 _id 전체 스캔 방지)
+    """
     events = get_events_collection()
 
-    doc = await events.find_one({"_id": event_id})
+    query = {"_id": event_id}
+    if user_id is not None:
+        query["user_id"] = user_id
+
+    doc = await events.find_one(query)
     if not doc:
         return None
     return serialize_event(doc)
 
 
-# READ MANY
-async def get_events(
+def _build_events_query(
     user_id: str,
     session_id: Optional[str] = None,
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
-    limit: int = 100,
-) -> List[EventRead]:
-    events = get_events_collection()
-
+) -> Dict[str, Any]:
     query = {"user_id": user_id}
 
     if session_id is not None:
@@ -104,8 +390,150 @@ async def get_events(
         if ts:
             query["timestamp"] = ts
 
+    return query
+
+
+# READ MANY
+async def _find_event_docs(
+    user_id: str,
+    session_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    events = get_events_collection()
+
+    query = _build_events_query(user_id, session_id, start_time, end_time)
+
+    # cursor가 있으면 (timestamp, _id) 기준으로 이전 페이지 마지막 문서 이후부터
+    query.update(pagination.keyset_filter("timestamp", cursor))
+
     safe_limit = max(1, min(limit, 1000))
 
-    cursor = events.find(query).sort("timestamp", -1).limit(safe_limit)
-    docs = await cursor.to_list(length=safe_limit)
+    mongo_cursor = events.find(query, projection).sort(pagination.keyset_sort("timestamp")).limit(safe_limit)
+    return await mongo_cursor.to_list(length=safe_limit)
+
+
+@timed
+async def get_events(
+    user_id: str,
+    session_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> List[EventRead]:
+    """
+    fields를 주면 해당 필드(+ 모델 필수 필드)만 읽습니다. 빠진 선택 필드는 기본값(None / {})
+    """
+    proj = projection.build_projection(EVENT_PROJECTION, fields, always=EVENT_REQUIRED_FIELDS)
+    docs = await _find_event_docs(user_id, session_id, start_time, end_time, limit, cursor, proj)
     return [serialize_event(d) for d in docs]
+
+
+# READ MANY (fast path: 모델 없이 응답용 dict + 다음 페이지 cursor)
+@timed
+async def get_event_rows_page(
+    user_id: str,
+    session_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    fields를 주면 해당 필드(+ id)만 응답합니다. (timestamp는 다음 cursor 계산용으로 항상 읽음)
+    """
+    proj = projection.build_projection(EVENT_PROJECTION, fields, always=("timestamp",))
+    docs = await _find_event_docs(user_id, session_id, start_time, end_time, limit, cursor, proj)
+    safe_limit = max(1, min(limit, 1000))
+    rows = [projection.select_fields(event_row(d), fields) for d in docs]
+    return rows, pagination.next_cursor(docs, "timestamp", safe_limit)
+
+
+# READ (세션별 직전 이벤트: 채점 / 학습 시 input_rate / app_switch 문맥)
+@timed
+async def get_previous_event_docs(
+    user_id: str,
+    anchors: Iterable[Tuple[str, datetime]],
+    not_before: timedelta,
+    proj: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    [(session_id, 시각), ...] -> 각각 같은 세션에서 그 시각보다 앞선 마지막 이벤트 1개 (not_before 이내만)
+    채점: 세션별 배치 첫 이벤트 / 학습: 라벨 이벤트마다
+    anchor마다 find_one 1회 (index: user_id, session_id, timestamp) / 같은 이벤트는 1번만 반환
+    """
+    events = get_events_collection()
+
+    async def previous(session_id: str, first: datetime) -> Optional[Dict[str, Any]]:
+        return await events.find_one(
+            {"user_id": user_id, "session_id": session_id, "timestamp": {"$gte": first - not_before, "$lt": first}},
+            proj,
+            sort=[("timestamp", -1)],
+        )
+
+    found = await asyncio.gather(*(previous(sid, first) for sid, first in anchors))
+    unique = {doc["_id"]: doc for doc in found if doc is not None}
+    return list(unique.values())
+
+
+# READ (피드백 시각 직전 이벤트: 학습 라벨 연결)
+@timed
+async def get_event_ids_before(
+    user_id: str,
+    timestamps: Dict[str, datetime],
+    window: timedelta,
+) -> Dict[str, str]:
+    """
+    {key: 시각} -> key마다 그 시각 이전(포함) window 안의 마지막 이벤트 _id (없으면 결과에서 빠짐)
+    key마다 find_one 1회 (index: user_id, timestamp)
+    """
+    events = get_events_collection()
+
+    async def latest(ts: datetime) -> Optional[Dict[str, Any]]:
+        return await events.find_one(
+            {"user_id": user_id, "timestamp": {"$gte": ts - window, "$lte": ts}},
+            {"_id": 1},
+            sort=[("timestamp", -1)],
+        )
+
+    keys = list(timestamps)
+    found = await asyncio.gather(*(latest(timestamps[key]) for key in keys))
+    return {key: doc["_id"] for key, doc in zip(keys, found) if doc is not None}
+
+
+# READ STREAM (export용)
+async def iter_event_docs(
+    user_id: str,
+    session_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    proj: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    조건에 맞는 이벤트 원본 문서를 timestamp 오름차순으로 batch_size개씩 묶어 흘려보냅니다.
+    - to_list로 전부 올리지 않고 Motor cursor를 그대로 순회 -> 메모리 사용량은 batch 1개 분량
+    - Pydantic 모델을 만들지 않음 (직렬화는 호출부에서 문서 dict를 바로 처리)
+    - proj: 필요한 필드만 읽을 때 (예: services/slice_features), 없으면 문서 전체
+    """
+    events = get_events_collection()
+    size = max(1, batch_size or settings.EVENT_EXPORT_BATCH_SIZE)
+
+    query = _build_events_query(user_id, session_id, start_time, end_time)
+    mongo_cursor = events.find(query, proj).sort([("timestamp", 1), ("_id", 1)]).batch_size(size)
+
+    batch: List[Dict[str, Any]] = []
+    async for doc in mongo_cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
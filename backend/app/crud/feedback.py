@@ -1,11 +1,13 @@
 # backend/app/crud/feedback.py
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from fastapi import HTTPException
 
+from app.core.metrics import timed
+from app.crud import pagination, projection
 from app.db.mongo import get_db
 from app.schemas.feedback import FeedbackCreate, FeedbackRead, FeedbackTypeEnum
 
@@ -38,7 +40,27 @@ def serialize_feedback_read(doc) -> FeedbackRead:
     )
 
 
+# 목록 fast path용: FeedbackRead 필드만 읽는 projection
+FEEDBACK_PROJECTION = {"_id": 1, "user_id": 1, "event_id": 1, "feedback_type": 1, "timestamp": 1}
+
+
+def feedback_row(doc) -> Dict[str, Any]:
+    """
+    Mongo document(dict) -> FeedbackRead와 같은 키 구성의 dict (FastJSONResponse용)
+    feedback_type은 DB에 Enum 값(str)으로 저장돼 있으므로 그대로 사용
+    projection으로 빠진 필드는 None (호출부에서 select_fields로 잘라냄)
+    """
+    return {
+        "id": str(doc["_id"]),
+        "user_id": doc.get("user_id"),
+        "event_id": doc.get("event_id"),
+        "feedback_type": doc.get("feedback_type"),
+        "timestamp": doc.get("timestamp"),
+    }
+
+
 # CREATE
+@timed
 async def create_feedback(user_id: str, data: FeedbackCreate) -> FeedbackRead:
     col = get_feedback_collection()
 
@@ -52,20 +74,21 @@ async def create_feedback(user_id: str, data: FeedbackCreate) -> FeedbackRead:
     }
 
     res = await col.insert_one(doc)
-    saved = await col.find_one({"_id": res.inserted_id})
-    if not saved:
-        raise HTTPException(status_code=500, detail="Failed to create feedback")
+    # 방금 저장한 문서를 다시 읽지 않고 그대로 응답에 사용
+    doc["_id"] = res.inserted_id
 
-    return serialize_feedback_read(saved)
+    return serialize_feedback_read(doc)
 
 
 # READ ALL
-async def get_feedbacks(
+async def _find_feedback_docs(
     user_id: str,
     event_id: Optional[str] = None,
     feedback_type: Optional[FeedbackTypeEnum] = None,
     limit: int = 50,
-) -> List[FeedbackRead]:
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     col = get_feedback_collection()
 
     q = {"user_id": user_id}
@@ -74,14 +97,48 @@ async def get_feedbacks(
     if feedback_type:
         q["feedback_type"] = feedback_type.value if isinstance(feedback_type, FeedbackTypeEnum) else str(feedback_type)
 
+    # cursor가 있으면 (timestamp, _id) 기준으로 이전 페이지 마지막 피드백 이후부터
+    q.update(pagination.keyset_filter("timestamp", cursor))
+
     safe_limit = max(1, min(limit, 1000))
-    cursor = col.find(q).sort("timestamp", -1).limit(safe_limit)
-    docs = await cursor.to_list(length=safe_limit)
+    mongo_cursor = col.find(q, projection).sort(pagination.keyset_sort("timestamp")).limit(safe_limit)
+    return await mongo_cursor.to_list(length=safe_limit)
 
+
+@timed
+async def get_feedbacks(
+    user_id: str,
+    event_id: Optional[str] = None,
+    feedback_type: Optional[FeedbackTypeEnum] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> List[FeedbackRead]:
+    docs = await _find_feedback_docs(user_id, event_id, feedback_type, limit, cursor, FEEDBACK_PROJECTION)
     return [serialize_feedback_read(d) for d in docs]
 
 
+# READ ALL (fast path: 모델 없이 응답용 dict + 다음 페이지 cursor)
+@timed
+async def get_feedback_rows_page(
+    user_id: str,
+    event_id: Optional[str] = None,
+    feedback_type: Optional[FeedbackTypeEnum] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    fields를 주면 해당 필드(+ id)만 응답합니다. (timestamp는 다음 cursor 계산용으로 항상 읽음)
+    """
+    proj = projection.build_projection(FEEDBACK_PROJECTION, fields, always=("timestamp",))
+    docs = await _find_feedback_docs(user_id, event_id, feedback_type, limit, cursor, proj)
+    safe_limit = max(1, min(limit, 1000))
+    rows = [projection.select_fields(feedback_row(d), fields) for d in docs]
+    return rows, pagination.next_cursor(docs, "timestamp", safe_limit)
+
+
 # READ ONE
+@timed
 async def get_feedback(feedback_id: str) -> Optional[FeedbackRead]:
     col = get_feedback_collection()
     oid = _safe_object_id(feedback_id)
@@ -94,6 +151,7 @@ async def get_feedback(feedback_id: str) -> Optional[FeedbackRead]:
 
 
 # DELETE
+@timed
 async def delete_feedback(feedback_id: str) -> bool:
     col = get_feedback_collection()
     oid = _safe_object_id(feedback_id)
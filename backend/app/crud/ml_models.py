@@ -0,0 +1,67 @@
+# backend/app/crud/ml_models.py
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from bson import Binary
+
+from app.core.metrics import timed
+from app.db.mongo import get_db
+
+# 유저별 모델이 없을 때 쓰는 전체 유저 공용 모델의 _id
+GLOBAL_MODEL_ID = "__global__"
+
+
+def get_ml_models_collection():
+    """
+    Motor DB 핸들에서 ml_models 컬렉션을 가져옵니다.
+    문서 1개 = 모델 1개 (_id = user_id 또는 GLOBAL_MODEL_ID)
+      model: 직렬화된 sklearn estimator (pickle bytes)
+      feature_version: 학습에 쓴 피처 구성 버전 (services/distraction_scoring.FEATURE_VERSION)
+      version: 학습할 때마다 바뀌는 값 (점수 문서에 같이 기록)
+    """
+    return get_db()["ml_models"]
+
+
+@timed
+async def get_model_doc(model_id: str) -> Optional[Dict[str, Any]]:
+    return await get_ml_models_collection().find_one({"_id": model_id})
+
+
+@timed
+async def get_model_meta(model_id: str) -> Optional[Dict[str, Any]]:
+    """
+    모델 본문(bytes)을 뺀 메타데이터만 조회 (재학습 필요 여부 / 버전 확인용)
+    """
+    return await get_ml_models_collection().find_one({"_id": model_id}, {"model": 0})
+
+
+@timed
+async def save_model_doc(
+    model_id: str,
+    model_bytes: bytes,
+    *,
+    feature_version: int,
+    version: str,
+    n_samples: int,
+    metrics: Optional[Dict[str, Any]] = None,
+    trained_on: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    trained_on: 재학습 필요 여부 판단용 (예: 마지막 피드백 시각 / 피드백 수)
+    """
+    await get_ml_models_collection().update_one(
+        {"_id": model_id},
+        {
+            "$set": {
+                "model": Binary(model_bytes),
+                "feature_version": feature_version,
+                "version": version,
+                "n_samples": n_samples,
+                "metrics": metrics or {},
+                "trained_on": trained_on or {},
+                "trained_at": datetime.now(timezone.utc),
+            }
+        },
+        upsert=True,
+    )
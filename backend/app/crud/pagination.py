@@ -0,0 +1,79 @@
+# backend/app/crud/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+# --------------------------------------------------------------------------
+# Keyset(cursor) 페이지네이션 공용 헬퍼
+# - 정렬 키: (sort_field DESC, _id DESC)
+# - 다음 페이지 토큰: 마지막 문서의 (sort_field 값, _id)를 base64url(JSON)으로 감싼 불투명 문자열
+# - skip을 쓰지 않으므로 몇 번째 페이지든 인덱스 탐색 비용이 동일
+# - 웹 엔드포인트는 응답 본문(List[...])은 그대로 두고 다음 토큰을 헤더로 전달
+# --------------------------------------------------------------------------
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, doc_id: Any) -> str:
+    """
+    (정렬 값, _id) -> 불투명 토큰
+    _id 타입(ObjectId / str)을 함께 기록해 디코딩 시 원래 타입으로 복원합니다.
+    """
+    payload = {
+        "v": sort_value.isoformat(),
+        "i": str(doc_id),
+        "o": isinstance(doc_id, ObjectId),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, Any]:
+    """
+    불투명 토큰 -> (정렬 값, _id). 형식이 잘못되면 400.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value = datetime.fromisoformat(payload["v"])
+        doc_id = ObjectId(payload["i"]) if payload.get("o") else payload["i"]
+        return sort_value, doc_id
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(sort_field: str, token: Optional[str]) -> Dict[str, Any]:
+    """
+    cursor 토큰 이후(= 더 과거)의 문서만 고르는 필터.
+    토큰이 없으면 빈 dict.
+    """
+    if not token:
+        return {}
+
+    sort_value, doc_id = decode_cursor(token)
+    return {
+        "$or": [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, "_id": {"$lt": doc_id}},
+        ]
+    }
+
+
+def keyset_sort(sort_field: str) -> List[Tuple[str, int]]:
+    return [(sort_field, -1), ("_id", -1)]
+
+
+def next_cursor(docs: List[Dict[str, Any]], sort_field: str, limit: int) -> Optional[str]:
+    """
+    이번 페이지가 limit만큼 꽉 찼으면 마지막 문서 기준 다음 토큰, 아니면 None(마지막 페이지).
+    """
+    if len(docs) < limit:
+        return None
+
+    last = docs[-1]
+    return encode_cursor(last[sort_field], last["_id"])
@@ -0,0 +1,223 @@
+# backend/app/crud/profiles.py
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.metrics import timed
+from app.models.profile import ModelTypeEnum, TimeSliceRule
+from app.schemas.profile import AIProfileCreate, AIProfileRead, AIProfileUpdate
+from app.services import profile_rules
+
+# 에이전트 동기화 시 먼저 읽는 필드 (304 판단용, 규칙 본문은 읽지 않음)
+VERSION_PROJECTION = {"_id": 0, "version": 1}
+
+# 기본 프로필 지정이 동시에 들어와 unique 인덱스(user_single_default)에 걸렸을 때 재시도 횟수
+MAX_DEFAULT_RETRIES = 3
+
+
+def get_profiles_collection():
+    from app.db.mongo import db
+    if db is None:
+        raise RuntimeError("MongoDB not initialized. Did you call connect_to_mongo()?")
+    return db["AI_Profiles"]
+
+
+def _safe_object_id(profile_id: str) -> ObjectId:
+    try:
+        return ObjectId(profile_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid profile_id")
+
+
+def serialize_profile(profile) -> AIProfileRead:
+    return AIProfileRead(
+        id=str(profile["_id"]),
+        user_id=profile["user_id"],
+        profile_name=profile["profile_name"],
+        is_default=profile.get("is_default", False),
+        model_type=profile.get("model_type", ModelTypeEnum.TIME_SLICED_RULES),
+        time_slices=profile.get("time_slices") or [],
+        model_confidence_score=profile.get("model_confidence_score", 0.0),
+        last_updated_at=profile["last_updated_at"],
+        custom_thresholds=profile.get("custom_thresholds") or {},
+        version=profile.get("version"),
+    )
+
+
+async def _save_compiled(user_id: str, doc: Dict[str, Any], changes: Dict[str, Any]):
+    """
+    변경 내용을 합쳐 다시 컴파일한 뒤 저장
+    - 읽은 시점의 version을 필터에 넣어 동시 수정 시 나중 요청이 덮어쓰지 않게 함 (409)
+    """
+    merged = {**doc, **changes}
+    changes = {**changes, **profile_rules.compile_profile(merged), "last_updated_at": datetime.now()}
+
+    updated = await get_profiles_collection().find_one_and_update(
+        {"_id": doc["_id"], "user_id": user_id, "version": doc.get("version")},
+        {"$set": changes},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not updated:
+        raise HTTPException(status_code=409, detail="Profile was modified concurrently")
+    return serialize_profile(updated)
+
+
+async def _get_profile_doc(user_id: str, profile_id: str) -> Dict[str, Any]:
+    doc = await get_profiles_collection().find_one({"_id": _safe_object_id(profile_id), "user_id": user_id})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return doc
+
+
+# CREATE
+@timed
+async def create_profile(user_id: str, profile_data: AIProfileCreate) -> AIProfileRead:
+    profiles_collection = get_profiles_collection()
+    has_default = await profiles_collection.find_one({"user_id": user_id, "is_default": True}, {"_id": 1})
+    new_profile = {
+        "_id": ObjectId(),
+        "user_id": user_id,
+        **profile_data.model_dump(),
+        "is_default": has_default is None,  # 첫 프로필은 기본 프로필
+        "model_type": ModelTypeEnum.TIME_SLICED_RULES.value,
+        "time_slices": [],
+        "model_confidence_score": 0.0,
+        "last_updated_at": datetime.now(),
+        "custom_thresholds": {},
+    }
+    new_profile.update(profile_rules.compile_profile(new_profile))
+    try:
+        await profiles_collection.insert_one(new_profile)
+    except DuplicateKeyError:
+        if not new_profile["is_default"]:
+            raise
+        # 동시에 만든 다른 프로필이 먼저 기본이 됨 -> 일반 프로필로 저장
+        new_profile["is_default"] = False
+        await profiles_collection.insert_one(new_profile)
+    return serialize_profile(new_profile)
+
+
+# READ ALL
+@timed
+async def get_profiles(user_id: str) -> List[AIProfileRead]:
+    cursor = get_profiles_collection().find(
+        {"user_id": user_id}, {"compiled": 0}
+    ).sort([("is_default", DESCENDING), ("_id", ASCENDING)])
+    return [serialize_profile(doc) async for doc in cursor]
+
+
+# READ ONE
+@timed
+async def get_profile(user_id: str, profile_id: str) -> Optional[AIProfileRead]:
+    doc = await get_profiles_collection().find_one(
+        {"_id": _safe_object_id(profile_id), "user_id": user_id}, {"compiled": 0}
+    )
+    return serialize_profile(doc) if doc else None
+
+
+# UPDATE
+@timed
+async def update_profile(user_id: str, profile_id: str, profile_data: AIProfileUpdate) -> AIProfileRead:
+    doc = await _get_profile_doc(user_id, profile_id)
+    update_fields = {k: v for k, v in profile_data.model_dump().items() if v is not None}
+    if not update_fields:
+        return serialize_profile(doc)
+    return await _save_compiled(user_id, doc, update_fields)
+
+
+# UPDATE (시간 구간 규칙 전체 교체)
+@timed
+async def replace_time_slices(user_id: str, profile_id: str, time_slices: List[TimeSliceRule]) -> AIProfileRead:
+    doc = await _get_profile_doc(user_id, profile_id)
+    slices = sorted((s.model_dump() for s in time_slices), key=lambda s: s["slice_index"])
+    return await _save_compiled(user_id, doc, {"time_slices": slices})
+
+
+# UPDATE (기본 프로필 지정)
+@timed
+async def set_default_profile(user_id: str, profile_id: str) -> AIProfileRead:
+    """
+    기존 기본 프로필을 먼저 해제한 뒤 지정 -> 기본 프로필이 2개인 순간이 없음
+    (해제와 지정 사이에는 잠깐 기본 프로필이 없음: 에이전트 조회는 404 -> 다음 주기에 재시도)
+    동시에 다른 프로필을 지정한 요청이 먼저 끝나면 unique 인덱스에 걸리므로 다시 해제 후 지정
+    """
+    profiles_collection = get_profiles_collection()
+    oid = _safe_object_id(profile_id)
+    if not await profiles_collection.find_one({"_id": oid, "user_id": user_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    for _ in range(MAX_DEFAULT_RETRIES):
+        await profiles_collection.update_many(
+            {"user_id": user_id, "is_default": True, "_id": {"$ne": oid}},
+            {"$set": {"is_default": False}},
+        )
+        try:
+            updated = await profiles_collection.find_one_and_update(
+                {"_id": oid, "user_id": user_id},
+                {"$set": {"is_default": True}},
+                projection={"compiled": 0},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            continue
+        if not updated:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return serialize_profile(updated)
+
+    raise HTTPException(status_code=409, detail="Default profile was changed concurrently")
+
+
+# DELETE
+@timed
+async def delete_profile(user_id: str, profile_id: str) -> bool:
+    profiles_collection = get_profiles_collection()
+    deleted = await profiles_collection.find_one_and_delete(
+        {"_id": _safe_object_id(profile_id), "user_id": user_id},
+        projection={"is_default": 1},
+    )
+    if not deleted:
+        return False
+
+    # 기본 프로필을 지웠으면 가장 먼저 만든 프로필을 기본으로 승격
+    if deleted.get("is_default"):
+        try:
+            await profiles_collection.find_one_and_update(
+                {"user_id": user_id},
+                {"$set": {"is_default": True}},
+                sort=[("_id", ASCENDING)],
+            )
+        except DuplicateKeyError:
+            pass  # 그 사이 다른 프로필이 기본으로 지정됨
+    return True
+
+
+# --------------------------------------------------------------------------
+# 에이전트 동기화 (GET /api/v1/profiles/default)
+# --------------------------------------------------------------------------
+@timed
+async def get_default_profile_version(user_id: str) -> Optional[str]:
+    """
+    기본 프로필의 version만 조회 (If-None-Match 비교용, 변경 없으면 규칙 본문을 읽지 않음)
+    """
+    doc = await get_profiles_collection().find_one({"user_id": user_id, "is_default": True}, VERSION_PROJECTION)
+    return doc.get("version") if doc else None
+
+
+@timed
+async def get_default_profile_payload(user_id: str) -> Optional[Dict[str, Any]]:
+    doc = await get_profiles_collection().find_one(
+        {"user_id": user_id, "is_default": True},
+        {"profile_name": 1, "model_type": 1, "custom_thresholds": 1, "compiled": 1, "version": 1},
+    )
+    if not doc:
+        return None
+    if "compiled" not in doc:
+        # 컴파일 필드가 없는 예전 문서: 응답용으로만 즉석 컴파일
+        full = await get_profiles_collection().find_one({"_id": doc["_id"]})
+        doc.update(profile_rules.compile_profile(full))
+    return {**profile_rules.profile_payload(doc), "version": doc["version"]}
@@ -0,0 +1,60 @@
+# backend/app/crud/projection.py
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException
+
+
+# --------------------------------------------------------------------------
+# 필드 단위 projection 공용 헬퍼
+# - 응답 필드명(id, timestamp, ...) 기준으로 받아 Mongo projection으로 변환 (id <-> _id)
+# - 정렬/페이지네이션에 필요한 필드(always)는 요청하지 않아도 항상 읽음
+# - 응답 dict는 요청한 필드(+ id)만 남김
+# --------------------------------------------------------------------------
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    쿼리 파라미터 "id,timestamp,app_name" -> ["id", "timestamp", "app_name"]
+    비어 있으면 None (= 전체 필드)
+    """
+    if not fields:
+        return None
+    parsed = [f.strip() for f in fields.split(",") if f.strip()]
+    return parsed or None
+
+
+def _mongo_key(field: str) -> str:
+    return "_id" if field == "id" else field
+
+
+def build_projection(
+    full: Dict[str, Any],
+    fields: Optional[Iterable[str]],
+    always: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """
+    full: 스키마 전체 필드의 projection (예: EVENT_PROJECTION)
+    fields: 요청 필드 (None이면 full + always)
+    알 수 없는 필드가 있으면 400
+    """
+    if not fields:
+        return {**full, **{key: 1 for key in always}}
+
+    wanted = [_mongo_key(f) for f in fields]
+    unknown = [f for f, key in zip(fields, wanted) if key not in full]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(unknown)}")
+
+    projection = {"_id": 1}
+    for key in [*wanted, *always]:
+        projection[key] = 1
+    return projection
+
+
+def select_fields(row: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """
+    응답 dict에서 요청 필드(+ id)만 남김. fields가 없으면 그대로.
+    """
+    if not fields:
+        return row
+    keep = {"id", *fields}
+    return {k: v for k, v in row.items() if k in keep}
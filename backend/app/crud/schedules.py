@@ -3,9 +3,19 @@
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 
+from app.core.metrics import timed
+from app.crud import projection, sync_versions
 from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleRead
+from app.services.schedule_engine import (
+    compile_schedule_fields,
+    parse_hms,
+    schedule_engine,
+    seconds_to_time,
+)
 
 
 def get_schedules_collection():
@@ -22,20 +32,73 @@ def _safe_object_id(schedule_id: str) -> ObjectId:
         raise HTTPException(status_code=400, detail="Invalid schedule_id")
 
 
+def _schedule_time(schedule, field: str):
+    """
+    저장 시점에 계산된 정수(start_sec / end_sec)가 있으면 그대로 사용하고,
+    예전 문서만 "HH:MM:SS" 문자열을 파싱
+    """
+    seconds = schedule.get(field.replace("_time", "_sec"))
+    if seconds is None:
+        value = schedule.get(field)
+        if not value:
+            return None
+        seconds = parse_hms(value)
+    return seconds_to_time(seconds)
+
+
 def serialize_schedule(schedule) -> ScheduleRead:
     return ScheduleRead(
         id=str(schedule.get("_id")),
         user_id=schedule.get("user_id", ""),
         task_id=schedule.get("task_id"),
         name=schedule.get("name", ""),
-        start_time=datetime.strptime(schedule["start_time"], "%H:%M:%S").time() if schedule.get("start_time") else None,
-        end_time=datetime.strptime(schedule["end_time"], "%H:%M:%S").time() if schedule.get("end_time") else None,
+        start_time=_schedule_time(schedule, "start_time"),
+        end_time=_schedule_time(schedule, "end_time"),
         days_of_week=schedule.get("days_of_week", []),
         created_at=schedule.get("created_at"),
         is_active=schedule.get("is_active", True),
     )
 
 
+# 목록 fast path용: ScheduleRead 필드만 읽는 projection
+SCHEDULE_PROJECTION = {
+    "_id": 1,
+    "user_id": 1,
+    "task_id": 1,
+    "name": 1,
+    "start_time": 1,
+    "end_time": 1,
+    "days_of_week": 1,
+    "created_at": 1,
+    "is_active": 1,
+}
+
+# fields로 일부만 읽어도 ScheduleRead 모델을 만들 수 있도록 항상 읽는 필드
+SCHEDULE_REQUIRED_FIELDS = ("start_time", "end_time", "start_sec", "end_sec", "created_at")
+
+# sync_versions 종류 이름 (?since= 델타 동기화)
+SYNC_KIND = "schedules"
+
+
+def schedule_row(schedule) -> Dict[str, Any]:
+    """
+    Mongo document(dict) -> ScheduleRead와 같은 키 구성의 dict (FastJSONResponse용)
+    start_time/end_time은 DB에 "HH:MM:SS" 문자열로 저장돼 있어 time 변환 없이 그대로 사용
+    (ScheduleRead의 time 필드 JSON 표기와 동일)
+    """
+    return {
+        "id": str(schedule.get("_id")),
+        "user_id": schedule.get("user_id", ""),
+        "task_id": schedule.get("task_id"),
+        "name": schedule.get("name", ""),
+        "start_time": schedule.get("start_time"),
+        "end_time": schedule.get("end_time"),
+        "days_of_week": schedule.get("days_of_week", []),
+        "created_at": schedule.get("created_at"),
+        "is_active": schedule.get("is_active", True),
+    }
+
+
 def _normalize_schedule_update_fields(update_fields: dict) -> dict:
     """
     start_time/end_time이 time 객체로 들어오면 DB 저장용 문자열로 변환.
@@ -61,6 +124,7 @@ def _normalize_schedule_update_fields(update_fields: dict) -> dict:
 
 
 # CREATE
+@timed
 async def create_schedule(user_id: str, schedule_data: ScheduleCreate) -> ScheduleRead:
     schedules_collection = get_schedules_collection()
     new_schedule = {
@@ -72,22 +136,58 @@ async def create_schedule(user_id: str, schedule_data: ScheduleCreate) -> Schedu
         "days_of_week": schedule_data.days_of_week,
         "created_at": datetime.now(),
         "is_active": True,
+        # 스케줄 엔진용 정수 필드 (읽을 때 문자열 파싱 X)
+        **compile_schedule_fields(schedule_data.days_of_week, schedule_data.start_time, schedule_data.end_time),
     }
-    result = await schedules_collection.insert_one(new_schedule)
-    saved = await schedules_collection.find_one({"_id": result.inserted_id})
-    if not saved:
-        raise HTTPException(status_code=500, detail="Failed to create schedule")
-    return serialize_schedule(saved)
+    async with sync_versions.writing(user_id, SYNC_KIND) as version:
+        new_schedule["sync_version"] = version
+        result = await schedules_collection.insert_one(new_schedule)
+    schedule_engine.invalidate(user_id)
+    # 방금 저장한 문서를 다시 읽지 않고 그대로 응답에 사용
+    new_schedule["_id"] = result.inserted_id
+    return serialize_schedule(new_schedule)
 
 
 # READ ALL
-async def get_schedules(user_id: str):
+@timed
+async def get_schedules(user_id: str, fields: Optional[List[str]] = None):
+    schedules_collection = get_schedules_collection()
+    proj = projection.build_projection(SCHEDULE_PROJECTION, fields, always=SCHEDULE_REQUIRED_FIELDS)
+    cursor = schedules_collection.find({"user_id": user_id}, proj)
+    return [serialize_schedule(doc) async for doc in cursor]
+
+
+# READ ALL (fast path: 모델 없이 응답용 dict)
+@timed
+async def get_schedule_rows(user_id: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    schedules_collection = get_schedules_collection()
+    proj = projection.build_projection(SCHEDULE_PROJECTION, fields)
+    cursor = schedules_collection.find({"user_id": user_id}, proj)
+    return [projection.select_fields(schedule_row(doc), fields) async for doc in cursor]
+
+
+# READ CHANGED (델타 동기화: since 이후 생성/수정된 스케줄)
+@timed
+async def get_schedule_rows_since(user_id: str, since: int, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    schedules_collection = get_schedules_collection()
+    proj = projection.build_projection(SCHEDULE_PROJECTION, fields)
+    cursor = schedules_collection.find({"user_id": user_id, "sync_version": {"$gt": since}}, proj)
+    return [projection.select_fields(schedule_row(doc), fields) async for doc in cursor]
+
+
+# READ MANY (id 목록)
+@timed
+async def get_schedules_by_ids(user_id: str, schedule_ids: List[str]) -> List[ScheduleRead]:
     schedules_collection = get_schedules_collection()
-    cursor = schedules_collection.find({"user_id": user_id})
+    oids = [_safe_object_id(sid) for sid in schedule_ids]
+    if not oids:
+        return []
+    cursor = schedules_collection.find({"_id": {"$in": oids}, "user_id": user_id})
     return [serialize_schedule(doc) async for doc in cursor]
 
 
 # READ ONE
+@timed
 async def get_schedule(schedule_id: str):
     schedules_collection = get_schedules_collection()
     oid = _safe_object_id(schedule_id)
@@ -96,26 +196,56 @@ async def get_schedule(schedule_id: str):
 
 
 # UPDATE
+@timed
 async def update_schedule(schedule_id: str, schedule_data: ScheduleUpdate):
     schedules_collection = get_schedules_collection()
     oid = _safe_object_id(schedule_id)
 
     update_fields = {k: v for k, v in schedule_data.model_dump().items() if v is not None}
-    update_fields = _normalize_schedule_update_fields(update_fields)
 
     if not update_fields:
         return await get_schedule(schedule_id)
 
-    await schedules_collection.update_one({"_id": oid}, {"$set": update_fields})
-    updated = await schedules_collection.find_one({"_id": oid})
+    # 요일/시각이 바뀌면 정수 필드도 다시 계산 (바뀌지 않은 값은 기존 문서에서)
+    # 변경 버전은 유저 단위 -> 소유자도 같이 읽음
+    current = await schedules_collection.find_one(
+        {"_id": oid},
+        {"user_id": 1, "start_time": 1, "end_time": 1, "start_sec": 1, "end_sec": 1, "days_of_week": 1},
+    )
+    if not current:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    if {"start_time", "end_time", "days_of_week"} & update_fields.keys():
+        update_fields.update(
+            compile_schedule_fields(
+                update_fields.get("days_of_week", current.get("days_of_week", [])),
+                update_fields.get("start_time") or _schedule_time(current, "start_time"),
+                update_fields.get("end_time") or _schedule_time(current, "end_time"),
+            )
+        )
+
+    update_fields = _normalize_schedule_update_fields(update_fields)
+    async with sync_versions.writing(current["user_id"], SYNC_KIND) as version:
+        update_fields["sync_version"] = version
+        updated = await schedules_collection.find_one_and_update(
+            {"_id": oid},
+            {"$set": update_fields},
+            return_document=ReturnDocument.AFTER,
+        )
     if not updated:
         raise HTTPException(status_code=404, detail="Schedule not found")
+    schedule_engine.invalidate(updated.get("user_id"))
     return serialize_schedule(updated)
 
 
 # DELETE
+@timed
 async def delete_schedule(schedule_id: str) -> bool:
     schedules_collection = get_schedules_collection()
     oid = _safe_object_id(schedule_id)
-    result = await schedules_collection.delete_one({"_id": oid})
-    return result.deleted_count == 1
+    deleted = await schedules_collection.find_one_and_delete({"_id": oid}, {"user_id": 1})
+    if not deleted:
+        return False
+    schedule_engine.invalidate(deleted.get("user_id"))
+    async with sync_versions.writing(deleted["user_id"], SYNC_KIND) as version:
+        await sync_versions.record_deletion(deleted["user_id"], SYNC_KIND, schedule_id, version)
+    return True
@@ -0,0 +1,227 @@
+# backend/app/crud/session_stats.py
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.metrics import timed
+from app.db.mongo import get_db
+from app.schemas.session import SessionStatsRead
+
+
+def get_session_stats_collection():
+    """
+    Motor DB 핸들에서 session_stats 컬렉션을 가져옵니다.
+    문서 1개 = (유저, 세션) 1개 (_id = "{user_id}:{session_id}", session_id는 클라이언트가 보낸 값)
+    """
+    return get_db()["session_stats"]
+
+
+def stats_id(user_id: str, session_id: str) -> str:
+    """
+    session_id는 클라이언트가 정하는 값 -> 유저별 네임스페이스로 묶어 다른 유저의 세션 집계에 섞이지 않게
+    """
+    return f"{user_id}:{session_id}"
+
+
+# --------------------------------------------------------------------------
+# 앱 이름 -> Mongo 필드 키
+# "chrome.exe"처럼 '.'이 들어가면 $inc 경로가 중첩 필드로 해석되므로 치환해서 저장
+# --------------------------------------------------------------------------
+_DOT = "．"    # 전각 마침표
+_DOLLAR = "＄"  # 전각 달러
+
+
+def _encode_app_key(app_name: str) -> str:
+    key = app_name.replace(".", _DOT)
+    if key.startswith("$"):
+        key = _DOLLAR + key[1:]
+    return key
+
+
+def _decode_app_key(key: str) -> str:
+    name = key.replace(_DOT, ".")
+    if name.startswith(_DOLLAR):
+        name = "$" + name[1:]
+    return name
+
+
+def _as_naive_utc(ts: datetime) -> datetime:
+    """
+    요청에서 온 timestamp(aware)와 DB에서 읽은 값(naive UTC)을 비교할 수 있게 통일
+    """
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _input_events(doc: Dict[str, Any]) -> float:
+    vector = doc.get("activity_vector") or {}
+    try:
+        return float(vector.get("meaningful_input_events") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# --------------------------------------------------------------------------
+# INGEST ROLLUP
+# --------------------------------------------------------------------------
+# 동시에 같은 세션을 갱신하는 배치가 있을 때 다시 읽고 계산하는 최대 횟수
+MAX_ROLLUP_RETRIES = 5
+
+
+def _rollup_update(
+    user_id: str, session_docs: List[Dict[str, Any]], state: Dict[str, Any], now: datetime
+) -> Dict[str, Any]:
+    """
+    세션 1개의 배치 -> update 문서
+    - 시간(active / idle / 앱별)은 저장된 last_event_at보다 새로운 이벤트 사이 간격만 집계
+      (경계 간격 = 저장된 last_event_at -> 첫 새 이벤트, 늦게 도착한 과거 이벤트는 이미 집계된 구간이라 시간 제외)
+    - 이벤트 수 / first_event_at / 입력 수는 늦게 온 이벤트도 반영
+    """
+    idle_gap = float(settings.SESSION_IDLE_GAP_SECONDS)
+    stored_last = state.get("last_event_at")
+    prev_ts: Optional[datetime] = stored_last
+    prev_app: Optional[str] = state.get("last_app")
+
+    app_seconds: Dict[str, float] = defaultdict(float)
+    active_seconds = 0.0
+    idle_seconds = 0.0
+    idle_gaps = 0
+    max_gap = 0.0
+
+    for doc in session_docs:
+        ts = _as_naive_utc(doc["timestamp"])
+        if stored_last is not None and ts <= stored_last:
+            continue
+        if prev_ts is not None:
+            gap = (ts - prev_ts).total_seconds()
+            if gap > idle_gap:
+                idle_gaps += 1
+                idle_seconds += gap
+                max_gap = max(max_gap, gap)
+            elif gap > 0:
+                active_seconds += gap
+                if prev_app:
+                    app_seconds[prev_app] += gap
+        prev_ts, prev_app = ts, doc.get("app_name")
+
+    first_ts = _as_naive_utc(session_docs[0]["timestamp"])
+    last_ts = _as_naive_utc(session_docs[-1]["timestamp"])
+
+    inc: Dict[str, Any] = {
+        "event_count": len(session_docs),
+        "active_seconds": active_seconds,
+        "idle_seconds": idle_seconds,
+        "idle_gap_count": idle_gaps,
+        "rev": 1,
+    }
+    for app_name, seconds in app_seconds.items():
+        inc[f"app_seconds.{_encode_app_key(app_name)}"] = seconds
+
+    update: Dict[str, Any] = {
+        "$setOnInsert": {"user_id": user_id, "session_id": session_docs[0]["session_id"]},
+        "$inc": inc,
+        "$min": {"first_event_at": first_ts},
+        "$max": {
+            "last_event_at": last_ts,
+            "input_events": max(_input_events(d) for d in session_docs),
+            "max_idle_gap_seconds": max_gap,
+        },
+        "$set": {"updated_at": now},
+    }
+    # 늦게 도착한(과거) 배치가 최신 앱 정보를 덮어쓰지 않도록
+    if stored_last is None or last_ts > stored_last:
+        update["$set"]["last_app"] = prev_app
+    return update
+
+
+@timed
+async def apply_event_docs(user_id: str, docs: Iterable[Dict[str, Any]]) -> int:
+    """
+    저장된 이벤트 문서들을 세션별로 집계해 session_stats에 $inc / $min / $max upsert로 반영합니다.
+    - 앱별 사용 시간: 연속된 두 이벤트 사이 간격을 앞 이벤트의 app_name에 누적
+    - 간격이 SESSION_IDLE_GAP_SECONDS를 넘으면 앱 시간 대신 idle gap으로 집계
+    - 입력 수: activity_vector.meaningful_input_events는 세션 내 누적값이므로 $max로 유지
+    배치 경계의 간격 계산에 쓰는 저장 상태(last_event_at, last_app)는 rev로 낙관적 잠금:
+    읽은 뒤 다른 배치가 먼저 갱신했으면(rev 불일치 / 동시 생성) 다시 읽어 계산 -> 같은 간격을 두 번 더하지 않음
+    반환: 갱신된 세션 수
+    """
+    by_session: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for doc in docs:
+        session_id = doc.get("session_id")
+        if session_id and doc.get("timestamp") is not None:
+            by_session[session_id].append(doc)
+
+    if not by_session:
+        return 0
+
+    col = get_session_stats_collection()
+    previous = {
+        s["_id"]: s
+        async for s in col.find(
+            {"_id": {"$in": [stats_id(user_id, sid) for sid in by_session]}},
+            {"last_event_at": 1, "last_app": 1, "rev": 1},
+        )
+    }
+
+    now = datetime.now(timezone.utc)
+    for session_id, session_docs in by_session.items():
+        session_docs.sort(key=lambda d: _as_naive_utc(d["timestamp"]))
+        doc_id = stats_id(user_id, session_id)
+        state = previous.get(doc_id) or {}
+
+        for _ in range(MAX_ROLLUP_RETRIES):
+            update = _rollup_update(user_id, session_docs, state, now)
+            try:
+                # rev가 없는 문서(예전 문서 / 새 세션)는 $exists: False로 매칭
+                rev = state.get("rev")
+                guard = {"$exists": False} if rev is None else rev
+                result = await col.update_one({"_id": doc_id, "rev": guard}, update, upsert=True)
+            except DuplicateKeyError:
+                result = None  # 다른 배치가 같은 세션 문서를 먼저 만듦
+            if result is not None:
+                break
+            state = await col.find_one({"_id": doc_id}, {"last_event_at": 1, "last_app": 1, "rev": 1}) or {}
+        else:
+            print(f"Session stats rollup gave up after {MAX_ROLLUP_RETRIES} conflicts (session {session_id})")
+
+    return len(by_session)
+
+
+# --------------------------------------------------------------------------
+# READ
+# --------------------------------------------------------------------------
+def serialize_session_stats(doc) -> SessionStatsRead:
+    active_seconds = float(doc.get("active_seconds", 0.0))
+    input_events = float(doc.get("input_events", 0.0))
+    per_minute = input_events / (active_seconds / 60.0) if active_seconds > 0 else 0.0
+
+    return SessionStatsRead(
+        session_id=doc.get("session_id") or str(doc["_id"]),
+        user_id=doc["user_id"],
+        event_count=doc.get("event_count", 0),
+        first_event_at=doc.get("first_event_at"),
+        last_event_at=doc.get("last_event_at"),
+        last_app=doc.get("last_app"),
+        active_seconds=active_seconds,
+        idle_seconds=float(doc.get("idle_seconds", 0.0)),
+        idle_gap_count=doc.get("idle_gap_count", 0),
+        max_idle_gap_seconds=float(doc.get("max_idle_gap_seconds", 0.0)),
+        input_events=input_events,
+        input_events_per_minute=round(per_minute, 3),
+        app_seconds={
+            _decode_app_key(k): float(v) for k, v in (doc.get("app_seconds") or {}).items()
+        },
+    )
+
+
+@timed
+async def get_session_stats(user_id: str, session_id: str) -> Optional[SessionStatsRead]:
+    doc = await get_session_stats_collection().find_one({"_id": stats_id(user_id, session_id), "user_id": user_id})
+    if not doc:
+        return None
+    return serialize_session_stats(doc)
@@ -1,12 +1,15 @@
 # backend/app/crud/sessions.py
 
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from fastapi import HTTPException
+from pymongo import ASCENDING, ReturnDocument
 
+from app.core.metrics import timed
+from app.crud import analytics, pagination, projection
 from app.db.mongo import get_db
 from app.schemas.session import SessionCreate, SessionUpdate, SessionRead
 
@@ -36,6 +39,48 @@ def serialize_session(session) -> SessionRead:
     )
 
 
+# 목록 fast path용: SessionRead 필드만 읽는 projection
+SESSION_PROJECTION = {
+    "_id": 1,
+    "user_id": 1,
+    "task_id": 1,
+    "profile_id": 1,
+    "start_time": 1,
+    "end_time": 1,
+    "duration": 1,
+    "status": 1,
+    "goal_duration": 1,
+    "interruption_count": 1,
+}
+
+# fields로 일부만 읽어도 SessionRead 모델을 만들 수 있도록 항상 읽는 필드
+SESSION_REQUIRED_FIELDS = ("user_id", "start_time")
+
+
+def _as_float(value) -> Optional[float]:
+    # SessionRead의 float 필드와 같은 JSON 표기 (25 -> 25.0)
+    return float(value) if value is not None else None
+
+
+def session_row(session) -> Dict[str, Any]:
+    """
+    Mongo document(dict) -> SessionRead와 같은 키/타입의 dict (FastJSONResponse용)
+    projection으로 빠진 필드는 None (호출부에서 select_fields로 잘라냄)
+    """
+    return {
+        "id": str(session["_id"]),
+        "user_id": session.get("user_id"),
+        "task_id": session.get("task_id"),
+        "profile_id": session.get("profile_id"),
+        "start_time": session.get("start_time"),
+        "end_time": session.get("end_time"),
+        "duration": _as_float(session.get("duration")),
+        "status": session.get("status", "active"),
+        "goal_duration": _as_float(session.get("goal_duration")),
+        "interruption_count": int(session.get("interruption_count", 0)),
+    }
+
+
 def _safe_object_id(session_id: str) -> ObjectId:
     try:
         return ObjectId(session_id)
@@ -47,17 +92,16 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _compute_duration_seconds(start_time: datetime, end_time: datetime) -> float:
+def _duration_seconds_expr(end_time: datetime) -> dict:
     """
-    duration을 초 단위로 계산. 음수 방지.
+    파이프라인 update용: (end_time - $start_time)을 초 단위로 계산하는 식
+    (start_time을 미리 읽지 않고 DB 안에서 바로 계산)
     """
-    sec = (end_time - start_time).total_seconds()
-    if sec < 0:
-        raise HTTPException(status_code=400, detail="end_time must be after start_time")
-    return float(sec)
+    return {"$divide": [{"$subtract": [end_time, "$start_time"]}, 1000]}
 
 
 # CREATE (START)
+@timed
 async def start_session(user_id: str, data: SessionCreate) -> SessionRead:
     col = get_sessions_collection()
 
@@ -77,30 +121,67 @@ async def start_session(user_id: str, data: SessionCreate) -> SessionRead:
     }
 
     result = await col.insert_one(doc)
-    created = await col.find_one({"_id": result.inserted_id})
-    if not created:
-        raise HTTPException(status_code=500, detail="Failed to create session")
-    return serialize_session(created)
+    # 과거 시각으로 시작한 세션(늦은 동기화)이면 그 사이 닫힌 날 analytics 캐시 무효화
+    await analytics.invalidate_closed_days(user_id, start_time, _utcnow())
+    # 방금 저장한 문서를 다시 읽지 않고 그대로 응답에 사용
+    doc["_id"] = result.inserted_id
+    return serialize_session(doc)
 
 
 # READ ALL (user 기준)
-async def get_sessions(
+async def _find_session_docs(
     user_id: str,
     status: Optional[str] = None,
-    limit: int = 50
-) -> List[SessionRead]:
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     col = get_sessions_collection()
 
     query = {"user_id": user_id}
     if status:
         query["status"] = status
 
-    cursor = col.find(query).sort("start_time", -1).limit(limit)
-    sessions = await cursor.to_list(length=limit)
+    # cursor가 있으면 (start_time, _id) 기준으로 이전 페이지 마지막 세션 이후부터
+    query.update(pagination.keyset_filter("start_time", cursor))
+
+    mongo_cursor = col.find(query, projection).sort(pagination.keyset_sort("start_time")).limit(limit)
+    return await mongo_cursor.to_list(length=limit)
+
+
+@timed
+async def get_sessions(
+    user_id: str,
+    status: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> List[SessionRead]:
+    proj = projection.build_projection(SESSION_PROJECTION, fields, always=SESSION_REQUIRED_FIELDS)
+    sessions = await _find_session_docs(user_id, status, limit, cursor, proj)
     return [serialize_session(s) for s in sessions]
 
 
+# READ ALL (fast path: 모델 없이 응답용 dict + 다음 페이지 cursor)
+@timed
+async def get_session_rows_page(
+    user_id: str,
+    status: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    fields를 주면 해당 필드(+ id)만 응답합니다. (start_time은 다음 cursor 계산용으로 항상 읽음)
+    """
+    proj = projection.build_projection(SESSION_PROJECTION, fields, always=("start_time",))
+    sessions = await _find_session_docs(user_id, status, limit, cursor, proj)
+    rows = [projection.select_fields(session_row(s), fields) for s in sessions]
+    return rows, pagination.next_cursor(sessions, "start_time", limit)
+
+
 # READ ONE
+@timed
 async def get_session(session_id: str) -> Optional[SessionRead]:
     col = get_sessions_collection()
     oid = _safe_object_id(session_id)
@@ -112,6 +193,7 @@ async def get_session(session_id: str) -> Optional[SessionRead]:
 
 
 # READ CURRENT (active 세션 1개)
+@timed
 async def get_current_session(user_id: str) -> Optional[SessionRead]:
     col = get_sessions_collection()
 
@@ -124,47 +206,98 @@ async def get_current_session(user_id: str) -> Optional[SessionRead]:
     return serialize_session(session)
 
 
+# READ (세션 이벤트 구간의 끝)
+@timed
+async def get_session_window_end(
+    user_id: str,
+    start_time: datetime,
+    end_time: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+) -> datetime:
+    """
+    세션에 속한 이벤트를 찾을 시간 구간(start_time부터)의 끝 시각
+    이벤트의 session_id는 에이전트 로컬 id(local-/auto-)라 서버 세션 _id와 다름 -> 유저 + 시간 구간으로 찾음
+    - end_time이 있으면 그 시각
+    - 없으면(진행 중 / 비정상 종료) 같은 유저의 다음 세션 시작, 그것도 없으면 now
+    """
+    if end_time is not None:
+        return end_time
+    next_session = await get_sessions_collection().find_one(
+        {"user_id": user_id, "start_time": {"$gt": start_time}},
+        {"start_time": 1},
+        sort=[("start_time", ASCENDING)],
+    )
+    if next_session:
+        return next_session["start_time"]
+    return now or _utcnow()
+
+
 # UPDATE (END 포함)
+@timed
 async def update_session(user_id: str, session_id: str, data: SessionUpdate) -> SessionRead:
+    """
+    find_one_and_update 1회로 소유자 확인 + 수정 + 수정 후 문서 반환을 처리합니다.
+    - 필터에 user_id를 넣어 다른 유저 세션은 매칭되지 않음
+    - duration은 파이프라인 update로 DB의 start_time을 이용해 계산
+    - 매칭 실패 시에만 원인(404/403/400)을 확인하기 위해 추가 조회
+    """
     col = get_sessions_collection()
     oid = _safe_object_id(session_id)
 
-    existing = await col.find_one({"_id": oid})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Session not found")
-
-    # 다른 유저 세션 수정 방지
-    if existing.get("user_id") != user_id:
-        raise HTTPException(status_code=403, detail="Forbidden")
+    if data.interruption_count is not None and data.interruption_count < 0:
+        raise HTTPException(status_code=400, detail="interruption_count must be >= 0")
 
     update_doc = {}
 
     if data.end_time is not None:
-        update_doc["end_time"] = data.end_time
-        update_doc["duration"] = _compute_duration_seconds(existing["start_time"], data.end_time)
+        update_doc["end_time"] = {"$literal": data.end_time}
+        update_doc["duration"] = _duration_seconds_expr(data.end_time)
 
     if data.status is not None:
-        update_doc["status"] = data.status
+        update_doc["status"] = {"$literal": data.status}
 
     if data.goal_duration is not None:
-        update_doc["goal_duration"] = data.goal_duration
+        update_doc["goal_duration"] = {"$literal": data.goal_duration}
 
     if data.interruption_count is not None:
-        if data.interruption_count < 0:
-            raise HTTPException(status_code=400, detail="interruption_count must be >= 0")
-        update_doc["interruption_count"] = data.interruption_count
+        update_doc["interruption_count"] = {"$literal": data.interruption_count}
+
+    query = {"_id": oid, "user_id": user_id}
 
     if not update_doc:
-        return serialize_session(existing)
+        existing = await col.find_one(query)
+        if existing:
+            return serialize_session(existing)
+    else:
+        # 종료 시각이 시작 시각보다 앞서면 매칭되지 않도록 (음수 duration 방지)
+        if data.end_time is not None:
+            query["start_time"] = {"$lte": data.end_time}
+
+        updated = await col.find_one_and_update(
+            query,
+            [{"$set": update_doc}],
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated:
+            if data.end_time is not None:
+                # 며칠 지나 종료/동기화된 세션이면 시작한 날의 analytics 캐시 무효화
+                await analytics.invalidate_closed_days(user_id, updated["start_time"], data.end_time)
+            return serialize_session(updated)
+
+    # --- 실패 원인 판별 ---
+    existing = await col.find_one({"_id": oid}, {"user_id": 1})
+    if not existing:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    # 다른 유저 세션 수정 방지
+    if existing.get("user_id") != user_id:
+        raise HTTPException(status_code=403, detail="Forbidden")
 
-    await col.update_one({"_id": oid}, {"$set": update_doc})
-    updated = await col.find_one({"_id": oid})
-    if not updated:
-        raise HTTPException(status_code=500, detail="Failed to update session")
-    return serialize_session(updated)
+    raise HTTPException(status_code=400, detail="end_time must be after start_time")
 
 
 # (선택) 세션 종료 helper
+@timed
 async def end_session(
     user_id: str,
     session_id: str,
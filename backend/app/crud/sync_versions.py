@@ -0,0 +1,141 @@
+# backend/app/crud/sync_versions.py
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+
+from app.core.metrics import timed
+from app.db.mongo import get_db
+
+# --------------------------------------------------------------------------
+# 유저별 변경 버전 (에이전트 동기화: ETag / ?since= 델타)
+# - sync_versions: _id = "{user_id}:{kind}" / version = 쓰기마다 1씩 증가하는 정수
+#   floor = 잘라낸 tombstone 중 가장 큰 version (since가 이보다 작으면 삭제 목록이 불완전 -> 전체 재동기화)
+# - 문서 쓰기(생성/수정) 시 새 version을 문서의 sync_version에 기록
+# - 삭제 시 sync_tombstones에 (user_id, kind, item_id, version) 기록
+# - version 할당과 문서 쓰기는 별도 연산 -> 할당한 version은 쓰기가 끝날 때까지 pending에 남김
+#   조회에는 끝나지 않은 쓰기보다 앞선 version(= pending 최솟값 - 1)만 알려 줌
+#   -> 그 version까지의 변경은 모두 저장된 상태이므로 ?since=로 받은 클라이언트가 변경을 놓치지 않음
+#   (pending보다 뒤 version의 변경은 다음 동기화 때 한 번 더 받을 수 있음)
+# --------------------------------------------------------------------------
+KINDS = ("tasks", "schedules")
+
+# 유저 / 종류별로 남겨 두는 최근 tombstone 수
+MAX_TOMBSTONES = 1000
+
+# 쓰기가 이 시간 안에 끝나지 않으면(프로세스 중단 등) pending에서 무시 -> 조회 version이 멈춰 있지 않게
+PENDING_TTL = timedelta(seconds=30)
+
+
+def get_sync_versions_collection():
+    return get_db()["sync_versions"]
+
+
+def get_sync_tombstones_collection():
+    return get_db()["sync_tombstones"]
+
+
+def _version_id(user_id: str, kind: str) -> str:
+    return f"{user_id}:{kind}"
+
+
+@timed
+async def next_version(user_id: str, kind: str) -> int:
+    """
+    새 version 할당 + pending 등록을 한 번의 update로 (문서의 sync_version / tombstone에 기록할 값)
+    쓰기가 끝나면 release_version으로 pending에서 빼야 함 -> 보통 writing()으로 감싸서 사용
+    """
+    now = datetime.utcnow()
+    doc = await get_sync_versions_collection().find_one_and_update(
+        {"_id": _version_id(user_id, kind)},
+        [
+            {"$set": {
+                "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+                "user_id": {"$literal": user_id},
+                "kind": {"$literal": kind},
+                "updated_at": now,
+            }},
+            # 만료된 pending은 버리고 새 version 추가 (배열 리터럴 대신 $map: mongomock(벤치)에서도 같은 결과)
+            {"$set": {"pending": {"$concatArrays": [
+                {"$filter": {"input": {"$ifNull": ["$pending", []]}, "cond": {"$gte": ["$$this.at", now - PENDING_TTL]}}},
+                {"$map": {"input": [0], "in": {"v": "$version", "at": now}}},
+            ]}}},
+        ],
+        projection={"version": 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["version"]
+
+
+@timed
+async def release_version(user_id: str, kind: str, version: int) -> None:
+    await get_sync_versions_collection().update_one(
+        {"_id": _version_id(user_id, kind)}, {"$pull": {"pending": {"v": version}}}
+    )
+
+
+@asynccontextmanager
+async def writing(user_id: str, kind: str) -> AsyncIterator[int]:
+    """
+    async with writing(user_id, kind) as version: 문서 / tombstone 쓰기
+    블록이 끝나면(실패해도) pending에서 제거
+    """
+    version = await next_version(user_id, kind)
+    try:
+        yield version
+    finally:
+        await release_version(user_id, kind, version)
+
+
+@timed
+async def get_version(user_id: str, kind: str) -> Tuple[int, int]:
+    """
+    반환: (조회용 version, floor) / 쓰기가 한 번도 없었으면 (0, 0)
+    조회용 version = 진행 중인 쓰기가 없으면 현재 version, 있으면 그 중 가장 앞선 version - 1
+    (이 값 이하의 변경은 모두 저장 완료 -> ETag / since 기준으로 써도 변경을 놓치지 않음)
+    """
+    doc = await get_sync_versions_collection().find_one(
+        {"_id": _version_id(user_id, kind)}, {"version": 1, "floor": 1, "pending": 1}
+    )
+    if not doc:
+        return 0, 0
+    version = doc.get("version", 0)
+    cutoff = datetime.utcnow() - PENDING_TTL
+    pending = [p["v"] for p in doc.get("pending") or [] if p["at"] >= cutoff]
+    if pending:
+        version = min(version, min(pending) - 1)
+    return version, doc.get("floor", 0)
+
+
+@timed
+async def record_deletion(user_id: str, kind: str, item_id: str, version: int) -> None:
+    tombstones = get_sync_tombstones_collection()
+    await tombstones.insert_one({
+        "user_id": user_id,
+        "kind": kind,
+        "item_id": item_id,
+        "version": version,
+        "deleted_at": datetime.utcnow(),
+    })
+
+    # 오래된 tombstone 정리: 최근 MAX_TOMBSTONES개만 남기고 floor를 올림
+    cutoff = await tombstones.find(
+        {"user_id": user_id, "kind": kind}, {"version": 1}
+    ).sort("version", DESCENDING).skip(MAX_TOMBSTONES).limit(1).to_list(length=1)
+    if cutoff:
+        floor = cutoff[0]["version"]
+        await tombstones.delete_many({"user_id": user_id, "kind": kind, "version": {"$lte": floor}})
+        await get_sync_versions_collection().update_one(
+            {"_id": _version_id(user_id, kind)}, {"$max": {"floor": floor}}
+        )
+
+
+@timed
+async def get_deleted_since(user_id: str, kind: str, since: int) -> List[str]:
+    cursor = get_sync_tombstones_collection().find(
+        {"user_id": user_id, "kind": kind, "version": {"$gt": since}}, {"item_id": 1}
+    ).sort("version", ASCENDING)
+    return [doc["item_id"] async for doc in cursor]
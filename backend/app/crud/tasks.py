@@ -3,8 +3,12 @@
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 from fastapi import HTTPException
+from pymongo import ReturnDocument
 
+from app.core.metrics import timed
+from app.crud import projection, sync_versions
 from app.schemas.task import TaskCreate, TaskUpdate, TaskRead
 
 
@@ -37,7 +41,48 @@ def serialize_task(task) -> TaskRead:
     )
 
 
+# 목록 fast path용: TaskRead 필드만 읽는 projection
+TASK_PROJECTION = {
+    "_id": 1,
+    "user_id": 1,
+    "name": 1,
+    "description": 1,
+    "created_at": 1,
+    "due_date": 1,
+    "status": 1,
+    "linked_session_id": 1,
+    "target_executable": 1,
+    "target_arguments": 1,
+}
+
+# fields로 일부만 읽어도 TaskRead 모델을 만들 수 있도록 항상 읽는 필드
+TASK_REQUIRED_FIELDS = ("user_id", "name", "created_at", "status")
+
+# sync_versions 종류 이름 (?since= 델타 동기화)
+SYNC_KIND = "tasks"
+
+
+def task_row(task) -> Dict[str, Any]:
+    """
+    Mongo document(dict) -> TaskRead와 같은 키 구성의 dict (FastJSONResponse용)
+    projection으로 빠진 필드는 None (호출부에서 select_fields로 잘라냄)
+    """
+    return {
+        "id": str(task["_id"]),
+        "user_id": task.get("user_id"),
+        "name": task.get("name"),
+        "description": task.get("description"),
+        "created_at": task.get("created_at"),
+        "due_date": task.get("due_date"),
+        "status": task.get("status"),
+        "linked_session_id": task.get("linked_session_id"),
+        "target_executable": task.get("target_executable"),
+        "target_arguments": task.get("target_arguments"),
+    }
+
+
 # CREATE
+@timed
 async def create_task(user_id: str, task_data: TaskCreate) -> TaskRead:
     tasks_collection = get_tasks_collection()
     new_task = {
@@ -46,21 +91,43 @@ async def create_task(user_id: str, task_data: TaskCreate) -> TaskRead:
         "created_at": datetime.now(),
         "status": "pending",
     }
-    result = await tasks_collection.insert_one(new_task)
-    saved = await tasks_collection.find_one({"_id": result.inserted_id})
-    if not saved:
-        raise HTTPException(status_code=500, detail="Failed to create task")
-    return serialize_task(saved)
+    async with sync_versions.writing(user_id, SYNC_KIND) as version:
+        new_task["sync_version"] = version
+        result = await tasks_collection.insert_one(new_task)
+    # 방금 저장한 문서를 다시 읽지 않고 그대로 응답에 사용
+    new_task["_id"] = result.inserted_id
+    return serialize_task(new_task)
 
 
 # READ ALL
-async def get_tasks(user_id: str):
+@timed
+async def get_tasks(user_id: str, fields: Optional[List[str]] = None):
     tasks_collection = get_tasks_collection()
-    cursor = tasks_collection.find({"user_id": user_id})
+    proj = projection.build_projection(TASK_PROJECTION, fields, always=TASK_REQUIRED_FIELDS)
+    cursor = tasks_collection.find({"user_id": user_id}, proj)
     return [serialize_task(doc) async for doc in cursor]
 
 
+# READ ALL (fast path: 모델 없이 응답용 dict)
+@timed
+async def get_task_rows(user_id: str, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    tasks_collection = get_tasks_collection()
+    proj = projection.build_projection(TASK_PROJECTION, fields)
+    cursor = tasks_collection.find({"user_id": user_id}, proj)
+    return [projection.select_fields(task_row(doc), fields) async for doc in cursor]
+
+
+# READ CHANGED (델타 동기화: since 이후 생성/수정된 할 일)
+@timed
+async def get_task_rows_since(user_id: str, since: int, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    tasks_collection = get_tasks_collection()
+    proj = projection.build_projection(TASK_PROJECTION, fields)
+    cursor = tasks_collection.find({"user_id": user_id, "sync_version": {"$gt": since}}, proj)
+    return [projection.select_fields(task_row(doc), fields) async for doc in cursor]
+
+
 # READ ONE
+@timed
 async def get_task(task_id: str):
     tasks_collection = get_tasks_collection()
     oid = _safe_object_id(task_id)
@@ -69,6 +136,7 @@ async def get_task(task_id: str):
 
 
 # UPDATE
+@timed
 async def update_task(task_id: str, task_data: TaskUpdate):
     tasks_collection = get_tasks_collection()
     oid = _safe_object_id(task_id)
@@ -77,16 +145,30 @@ async def update_task(task_id: str, task_data: TaskUpdate):
     if not update_fields:
         return await get_task(task_id)
 
-    await tasks_collection.update_one({"_id": oid}, {"$set": update_fields})
-    updated = await tasks_collection.find_one({"_id": oid})
+    # 변경 버전은 유저 단위 -> 소유자를 먼저 확인
+    current = await tasks_collection.find_one({"_id": oid}, {"user_id": 1})
+    if not current:
+        raise HTTPException(status_code=404, detail="Task not found")
+    async with sync_versions.writing(current["user_id"], SYNC_KIND) as version:
+        update_fields["sync_version"] = version
+        updated = await tasks_collection.find_one_and_update(
+            {"_id": oid},
+            {"$set": update_fields},
+            return_document=ReturnDocument.AFTER,
+        )
     if not updated:
         raise HTTPException(status_code=404, detail="Task not found")
     return serialize_task(updated)
 
 
 # DELETE
+@timed
 async def delete_task(task_id: str) -> bool:
     tasks_collection = get_tasks_collection()
     oid = _safe_object_id(task_id)
-    result = await tasks_collection.delete_one({"_id": oid})
-    return result.deleted_count == 1
+    deleted = await tasks_collection.find_one_and_delete({"_id": oid}, {"user_id": 1})
+    if not deleted:
+        return False
+    async with sync_versions.writing(deleted["user_id"], SYNC_KIND) as version:
+        await sync_versions.record_deletion(deleted["user_id"], SYNC_KIND, task_id, version)
+    return True
@@ -1,11 +1,17 @@
 # backend/app/crud/users.py
 
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Iterable, Union
 
 from bson import ObjectId
 from bson.errors import InvalidId
+from pymongo import ReturnDocument
 
+from app.core.cache import CacheBackend, LocalCacheBackend
+from app.core.config import settings as app_settings
+from app.core.metrics import timed
+from app.db.migrations import is_applied
+from app.db.migrations.normalize_user_ids import MIGRATION_NAME as NORMALIZE_USER_IDS
 from app.db.mongo import get_db
 from app.models.user import UserInDB
 
@@ -31,14 +37,34 @@ def _safe_object_id(user_id: Union[str, ObjectId]) -> Optional[ObjectId]:
         return None
 
 
+# normalize_user_ids 마이그레이션 적용 여부 (lifespan에서 detect_id_normalization()으로 설정)
+# True면 모든 users._id가 ObjectId -> _id_filter는 단일 매칭
+_ids_normalized = False
+
+
+async def detect_id_normalization() -> bool:
+    """
+    migrations 컬렉션에 normalize_user_ids 적용 기록이 있으면 단일 _id 매칭 모드로 전환
+    """
+    global _ids_normalized
+    _ids_normalized = await is_applied(NORMALIZE_USER_IDS)
+    print(f"User _id lookup: {'ObjectId only' if _ids_normalized else 'ObjectId or string ($or)'}")
+    return _ids_normalized
+
+
 def _id_filter(user_id: Union[str, ObjectId]) -> Dict[str, Any]:
     """
     users 컬렉션의 _id 타입이 ObjectId / string 혼재된 상황을 모두 커버하는 필터.
     - ObjectId로 변환 가능하면: ObjectId / string 둘 다 매칭
     - 변환 불가하면: string 매칭
+    - _id 정규화 마이그레이션 이후에는 ObjectId 단일 매칭
     """
     oid = _safe_object_id(user_id)
 
+    if _ids_normalized:
+        # 변환 불가한 값은 그대로 두면 아무 문서와도 매칭되지 않음
+        return {"_id": oid if oid is not None else user_id}
+
     # user_id가 문자열이고 ObjectId 변환도 가능하면(24 hex), 둘 다 조회/업데이트
     if isinstance(user_id, str) and oid is not None:
         return {"$or": [{"_id": oid}, {"_id": user_id}]}
@@ -51,17 +77,143 @@ def _id_filter(user_id: Union[str, ObjectId]) -> Dict[str, Any]:
     return {"_id": user_id}
 
 
+# UserInDB를 만들 때 항상 필요한 필드 (projection으로 일부만 읽을 때도 포함)
+USER_REQUIRED_FIELDS = ("email", "google_id")
+
+
+def _user_projection(fields: Optional[Iterable[str]]) -> Optional[Dict[str, int]]:
+    """
+    fields가 없으면 None(전체 문서), 있으면 필수 필드 + 요청 필드만 읽는 projection.
+    빠진 필드는 UserInDB 기본값(빈 dict / 빈 list)으로 채워집니다.
+    """
+    if not fields:
+        return None
+    return {key: 1 for key in (*USER_REQUIRED_FIELDS, *fields)}
+
+
 def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-# ---------- READ ----------
+# --------------------------------------------------------------------------
+# 유저 문서 캐시 (read-through / 쓰기 시 무효화)
+# - /users/me, 설정·FCM·차단앱 변경은 전부 get_user_by_id / _update_and_return을 거침
+# - 저장소는 core/cache.CacheBackend: 기본은 프로세스 내 TTL/LRU (LocalCacheBackend,
+#   UserInDB 그대로 보관 -> 조회 시 DB 왕복 + 모델 생성 생략). 공유 캐시(Redis 등)는 같은 인터페이스로 교체
+# - 이 모듈의 모든 mutator는 수정 후 캐시 항목을 지움 (수정 후 문서를 다시 넣지 않음)
+#   -> 동시에 끝난 수정 2개의 put 순서가 뒤바뀌어 오래된 문서가 남는 일이 없음
+# - 로컬 백엔드는 워커 간 공유하지 않음: 다른 워커 프로세스는 수정 전 문서(blocked_apps, settings 등)를
+#   최대 USER_CACHE_TTL_SECONDS 동안 그대로 반환할 수 있음
+#   (차단 앱 변경이 distraction 채점 / analytics에 반영되는 데 최대 TTL만큼 걸림)
+# --------------------------------------------------------------------------
+class _UserCache:
+    def __init__(self, backend: CacheBackend[UserInDB]):
+        self.backend = backend
+        # 무효화마다 증가. DB에서 읽는 도중 쓰기가 끼어들면 읽은 값은 캐시에 넣지 않음
+        self._generation = 0
+
+    @classmethod
+    def from_settings(cls) -> "_UserCache":
+        return cls(
+            backend=LocalCacheBackend(app_settings.USER_CACHE_SIZE, app_settings.USER_CACHE_TTL_SECONDS),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend.enabled
 
-async def get_user_by_id(user_id: Union[str, ObjectId]) -> Optional[UserInDB]:
-    user = await get_users_collection().find_one(_id_filter(user_id))
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def get(self, key: str) -> Optional[UserInDB]:
+        if not self.enabled:
+            return None
+
+        user = await self.backend.get(key)
+        # 호출하는 쪽에서 수정해도 캐시 원본은 그대로 남도록 복사본 반환
+        return user.model_copy(deep=True) if user is not None else None
+
+    async def put(self, user: UserInDB, generation: int) -> None:
+        """
+        generation: read-through 시 DB 조회 전에 읽어 둔 값. 그 사이 무효화가 있었으면 넣지 않음
+        """
+        if not self.enabled or generation != self._generation:
+            return
+        await self.backend.set(str(user.id), user.model_copy(deep=True))
+
+    async def invalidate(self, key: str) -> None:
+        self._generation += 1
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        self._generation += 1
+        await self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend.name, **self.backend.stats()}
+
+
+user_cache = _UserCache.from_settings()
+
+
+def get_user_cache_stats() -> Dict[str, Any]:
+    return user_cache.stats()
+
+
+async def invalidate_cached_user(user_id: Union[str, ObjectId]) -> None:
+    """
+    이 모듈을 거치지 않고 users 문서를 직접 수정한 곳(OAuth 콜백 등)에서 호출
+    """
+    await user_cache.invalidate(str(user_id))
+
+
+async def _update_and_return(
+    user_id: Union[str, ObjectId], update: Dict[str, Any]
+) -> Optional[UserInDB]:
+    """
+    update_one + get_user_by_id 2회 왕복 대신 find_one_and_update 1회로
+    수정과 수정 후 문서 조회를 원자적으로 처리합니다.
+    """
+    user = await get_users_collection().find_one_and_update(
+        _id_filter(user_id),
+        update,
+        return_document=ReturnDocument.AFTER,
+    )
+    await user_cache.invalidate(str(user_id))
     return UserInDB(**user) if user else None
 
 
+# ---------- READ ----------
+
+@timed
+async def get_user_by_id(
+    user_id: Union[str, ObjectId], fields: Optional[Iterable[str]] = None
+) -> Optional[UserInDB]:
+    """
+    fields 예: ["blocked_apps"] -> fcm_tokens / settings 등 나머지 배열·객체는 읽지 않음
+
+    캐시에 전체 문서가 있으면 fields와 관계없이 캐시의 전체 문서를 반환 (DB 조회 없음)
+    -> fields는 "최소한 읽을 필드"이고, 반환 모델에 다른 필드가 채워져 있을 수도 있음
+    캐시 미스 시 fields가 없을 때만 읽은 문서를 캐시에 넣음 (일부 필드만 읽은 문서는 넣지 않음)
+    """
+    key = str(user_id)
+    cached = await user_cache.get(key)
+    if cached is not None:
+        return cached
+
+    generation = user_cache.generation
+    user = await get_users_collection().find_one(_id_filter(user_id), _user_projection(fields))
+    if not user:
+        return None
+
+    model = UserInDB(**user)
+    if not fields:
+        await user_cache.put(model, generation=generation)
+    return model
+
+
+@timed
 async def get_user_by_google_id(google_id: str) -> Optional[UserInDB]:
     user = await get_users_collection().find_one({"google_id": google_id})
     return UserInDB(**user) if user else None
@@ -69,6 +221,7 @@ async def get_user_by_google_id(google_id: str) -> Optional[UserInDB]:
 
 # ---------- CREATE ----------
 
+@timed
 async def create_user(
     *,
     email: str,
@@ -94,69 +247,38 @@ async def create_user(
 
 # ---------- UPDATE ----------
 
+@timed
 async def update_last_login(user_id: Union[str, ObjectId]) -> Optional[UserInDB]:
-    result = await get_users_collection().update_one(
-        _id_filter(user_id),
-        {"$set": {"last_login_at": _now()}}
-    )
-    if result.matched_count == 0:
-        return None
-
-    return await get_user_by_id(user_id)
+    return await _update_and_return(user_id, {"$set": {"last_login_at": _now()}})
 
 
+@timed
 async def update_settings(user_id: Union[str, ObjectId], settings: Dict[str, Any]) -> Optional[UserInDB]:
     if not settings:
         return await get_user_by_id(user_id)
 
-    result = await get_users_collection().update_one(
-        _id_filter(user_id),
+    return await _update_and_return(
+        user_id,
         {"$set": {f"settings.{k}": v for k, v in settings.items()}},
     )
-    if result.matched_count == 0:
-        return None
-
-    return await get_user_by_id(user_id)
 
 
+@timed
 async def add_fcm_token(user_id: Union[str, ObjectId], token: str) -> Optional[UserInDB]:
-    result = await get_users_collection().update_one(
-        _id_filter(user_id),
-        {"$addToSet": {"fcm_tokens": token}}
-    )
-    if result.matched_count == 0:
-        return None
-
-    return await get_user_by_id(user_id)
+    return await _update_and_return(user_id, {"$addToSet": {"fcm_tokens": token}})
 
 
+@timed
 async def remove_fcm_token(user_id: Union[str, ObjectId], token: Optional[str] = None) -> Optional[UserInDB]:
     update = {"$pull": {"fcm_tokens": token}} if token else {"$set": {"fcm_tokens": []}}
-    result = await get_users_collection().update_one(_id_filter(user_id), update)
-
-    if result.matched_count == 0:
-        return None
-
-    return await get_user_by_id(user_id)
+    return await _update_and_return(user_id, update)
 
 
+@timed
 async def add_blocked_app(user_id: Union[str, ObjectId], app_name: str) -> Optional[UserInDB]:
-    result = await get_users_collection().update_one(
-        _id_filter(user_id),
-        {"$addToSet": {"blocked_apps": app_name}}
-    )
-    if result.matched_count == 0:
-        return None
-
-    return await get_user_by_id(user_id)
+    return await _update_and_return(user_id, {"$addToSet": {"blocked_apps": app_name}})
 
 
+@timed
 async def remove_blocked_app(user_id: Union[str, ObjectId], app_name: str) -> Optional[UserInDB]:
-    result = await get_users_collection().update_one(
-        _id_filter(user_id),
-        {"$pull": {"blocked_apps": app_name}}
-    )
-    if result.matched_count == 0:
-        return None
-
-    return await get_user_by_id(user_id)
+    return await _update_and_return(user_id, {"$pull": {"blocked_apps": app_name}})
@@ -0,0 +1,283 @@
+# backend/app/db/indexes.py
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateMany
+from pymongo.errors import DuplicateKeyError
+
+from app.db.mongo import events_collection_name, get_db
+
+
+# --------------------------------------------------------------------------
+# 컬렉션별 인덱스 선언 (Index Registry)
+# - lifespan에서 ensure_indexes()로 매 기동 시 적용 (create_indexes는 멱등)
+# - CRUD 쿼리의 (필터 -> 정렬) 순서에 맞춰 복합 인덱스를 구성
+# - 목록 조회는 keyset 페이지네이션으로 (정렬 필드, _id)까지 정렬하므로 _id를 끝에 포함
+# --------------------------------------------------------------------------
+INDEX_REGISTRY: Dict[str, List[IndexModel]] = {
+    # crud/events.get_events: {user_id, session_id?, timestamp 범위} + sort(timestamp, _id)
+    "events": [
+        IndexModel(
+            [
+                ("user_id", ASCENDING),
+                ("session_id", ASCENDING),
+                ("timestamp", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="user_session_timestamp_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_timestamp_id",
+        ),
+    ],
+    # crud/sessions.get_current_session: {user_id, status} + sort(start_time, -1)
+    # crud/sessions.get_sessions: {user_id, status?} + sort(start_time, _id)
+    "sessions": [
+        IndexModel(
+            [
+                ("user_id", ASCENDING),
+                ("status", ASCENDING),
+                ("start_time", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name="user_status_start_time_id",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING), ("start_time", DESCENDING), ("_id", DESCENDING)],
+            name="user_start_time_id",
+        ),
+        # services/session_reaper: {status: "active", start_time < cutoff} + sort(start_time, _id)
+        IndexModel(
+            [("status", ASCENDING), ("start_time", ASCENDING), ("_id", ASCENDING)],
+            name="status_start_time_id",
+        ),
+    ],
+    # crud/feedback.get_feedbacks: {user_id, ...} + sort(timestamp, _id)
+    "user_feedback": [
+        IndexModel(
+            [("user_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="user_timestamp_id",
+        ),
+    ],
+    # crud/tasks.get_task_rows_since / crud/schedules.get_schedule_rows_since: {user_id, sync_version > since}
+    "tasks": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("user_id", ASCENDING), ("sync_version", ASCENDING)], name="user_sync_version"),
+    ],
+    # services/schedule_engine 전체 유저 조회: {is_active: True} + sort(user_id)
+    "schedules": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("user_id", ASCENDING), ("sync_version", ASCENDING)], name="user_sync_version"),
+        IndexModel([("is_active", ASCENDING), ("user_id", ASCENDING)], name="is_active_user_id"),
+    ],
+    # crud/sync_versions.get_deleted_since: {user_id, kind, version > since} + sort(version)
+    "sync_tombstones": [
+        IndexModel(
+            [("user_id", ASCENDING), ("kind", ASCENDING), ("version", ASCENDING)],
+            name="user_kind_version",
+        ),
+    ],
+    # crud/profiles: 에이전트 동기화 {user_id, is_default: True} (version만 읽는 covered 조회)
+    # 유저당 기본 프로필 1개 보장 (기본 지정 / 첫 프로필 생성이 동시에 들어와도 두 번째 쓰기는 duplicate key)
+    "AI_Profiles": [
+        IndexModel(
+            [("user_id", ASCENDING), ("is_default", ASCENDING), ("version", ASCENDING)],
+            name="user_default_version",
+        ),
+        IndexModel(
+            [("user_id", ASCENDING)],
+            name="user_single_default",
+            unique=True,
+            partialFilterExpression={"is_default": True},
+        ),
+    ],
+    # crud/analytics.invalidate_closed_days: {user_id, start_utc <= end, end_utc > start}
+    "analytics_daily": [
+        IndexModel([("user_id", ASCENDING), ("start_utc", ASCENDING)], name="user_start_utc"),
+    ],
+    # crud/admin_jobs.fail_interrupted_jobs / find_active_job: {job_type, status in (pending, running)}
+    "admin_job_logs": [
+        IndexModel([("job_type", ASCENDING), ("status", ASCENDING)], name="job_type_status"),
+    ],
+    # auth 콜백: find_one({"email": ...})
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email"),
+        IndexModel([("google_id", ASCENDING)], name="google_id"),
+    ],
+}
+
+
+def _resolve_collection(name: str) -> str:
+    """
+    레지스트리의 논리 이름 -> 실제 컬렉션 이름 ('events'는 저장 방식에 따라 달라짐)
+    """
+    if name == "events":
+        return events_collection_name()
+    return name
+
+
+async def _dedupe_default_profiles(db) -> int:
+    """
+    user_single_default(unique) 생성 전에 기본 프로필이 2개 이상인 유저 정리
+    (인덱스 도입 전의 set_default 경합으로 생긴 중복) -> 가장 먼저 만든 프로필만 기본으로 남김
+    반환: 기본 해제한 프로필 수
+    """
+    pipeline = [
+        {"$match": {"is_default": True}},
+        {"$sort": {"user_id": 1, "_id": 1}},
+        {"$group": {"_id": "$user_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    operations = [
+        UpdateMany({"_id": {"$in": row["ids"][1:]}}, {"$set": {"is_default": False}})
+        async for row in db["AI_Profiles"].aggregate(pipeline)
+    ]
+    if not operations:
+        return 0
+    result = await db["AI_Profiles"].bulk_write(operations, ordered=False)
+    print(f"⚠️ AI_Profiles: unset {result.modified_count} duplicate default profiles ({len(operations)} users)")
+    return result.modified_count
+
+
+async def _create_indexes(collection, indexes: List[IndexModel]) -> List[str]:
+    """
+    create_indexes 1회. 기존 데이터가 unique 인덱스에 걸리면 하나씩 만들고 실패한 인덱스는 경고만 남김
+    (기동은 계속 / 해당 인덱스는 데이터 정리 후 다음 기동 때 생성)
+    """
+    try:
+        return await collection.create_indexes(indexes)
+    except DuplicateKeyError:
+        pass
+
+    created: List[str] = []
+    for index in indexes:
+        try:
+            created += await collection.create_indexes([index])
+        except DuplicateKeyError as e:
+            print(f"⚠️ Index {index.document['name']} on '{collection.name}' not created (duplicate keys): {e}")
+    return created
+
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """
+    INDEX_REGISTRY의 인덱스를 모두 생성합니다. 이미 있으면 그대로 둡니다.
+    반환: {컬렉션: [인덱스 이름, ...]}
+    """
+    db = get_db()
+    created: Dict[str, List[str]] = {}
+
+    await _dedupe_default_profiles(db)
+    for collection, indexes in INDEX_REGISTRY.items():
+        if not indexes:
+            continue
+        created[collection] = await _create_indexes(db[_resolve_collection(collection)], indexes)
+
+    print(f"MongoDB indexes ensured: {sum(len(v) for v in created.values())} indexes")
+    return created
+
+
+# --------------------------------------------------------------------------
+# 쿼리 플랜 자가 점검 (Explain Self-Check)
+# - CRUD 모듈의 대표 쿼리를 explain()으로 돌려
+#   COLLSCAN(전체 스캔) / SORT(메모리 정렬) 단계가 있는지 검사
+# --------------------------------------------------------------------------
+_CHECK_USER_ID = "__explain_check__"
+_CHECK_TIME = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# (이름, 컬렉션, 필터, 정렬) - 각 CRUD 함수가 실제로 보내는 쿼리 형태와 동일하게 유지
+QUERY_PLAN_CHECKS: List[Tuple[str, str, Dict[str, Any], List[Tuple[str, int]]]] = [
+    (
+        "events.get_events",
+        "events",
+        {"user_id": _CHECK_USER_ID},
+        [("timestamp", DESCENDING), ("_id", DESCENDING)],
+    ),
+    (
+        "events.get_events(session_id, range)",
+        "events",
+        {
+            "user_id": _CHECK_USER_ID,
+            "session_id": "s",
+            "timestamp": {"$gte": _CHECK_TIME, "$lte": _CHECK_TIME},
+        },
+        [("timestamp", DESCENDING), ("_id", DESCENDING)],
+    ),
+    (
+        "sessions.get_sessions",
+        "sessions",
+        {"user_id": _CHECK_USER_ID},
+        [("start_time", DESCENDING), ("_id", DESCENDING)],
+    ),
+    (
+        "sessions.get_current_session",
+        "sessions",
+        {"user_id": _CHECK_USER_ID, "status": "active"},
+        [("start_time", DESCENDING)],
+    ),
+    (
+        "session_reaper.find_candidates",
+        "sessions",
+        {"status": "active", "start_time": {"$lt": _CHECK_TIME}},
+        [("start_time", ASCENDING), ("_id", ASCENDING)],
+    ),
+    (
+        "feedback.get_feedbacks",
+        "user_feedback",
+        {"user_id": _CHECK_USER_ID},
+        [("timestamp", DESCENDING), ("_id", DESCENDING)],
+    ),
+    ("tasks.get_tasks", "tasks", {"user_id": _CHECK_USER_ID}, []),
+    ("schedules.get_schedules", "schedules", {"user_id": _CHECK_USER_ID}, []),
+    (
+        "schedule_engine.active_now",
+        "schedules",
+        {"is_active": True},
+        [("is_active", ASCENDING), ("user_id", ASCENDING)],
+    ),
+    ("profiles.get_default_profile_version", "AI_Profiles", {"user_id": _CHECK_USER_ID, "is_default": True}, []),
+]
+
+_BAD_STAGES = {"COLLSCAN", "SORT"}
+
+
+def _iter_stages(plan: Any) -> Iterator[str]:
+    """
+    explain 결과(중첩 dict/list)에서 모든 'stage' 값을 재귀적으로 꺼냅니다.
+    (classic / SBE 엔진의 플랜 구조 차이를 모두 커버)
+    """
+    if isinstance(plan, dict):
+        stage = plan.get("stage")
+        if isinstance(stage, str):
+            yield stage
+        for value in plan.values():
+            yield from _iter_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _iter_stages(item)
+
+
+async def verify_query_plans() -> List[Dict[str, Any]]:
+    """
+    QUERY_PLAN_CHECKS의 쿼리를 explain하여 winningPlan에 COLLSCAN / SORT가 있으면 경고합니다.
+    반환: 문제가 발견된 쿼리 목록 [{"query", "collection", "stages"}]
+    """
+    db = get_db()
+    problems: List[Dict[str, Any]] = []
+
+    for name, collection, query, sort in QUERY_PLAN_CHECKS:
+        cursor = db[_resolve_collection(collection)].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explained = await cursor.explain()
+
+        winning_plan = explained.get("queryPlanner", {}).get("winningPlan", {})
+        bad = sorted({s for s in _iter_stages(winning_plan) if s in _BAD_STAGES})
+        if bad:
+            problems.append({"query": name, "collection": collection, "stages": bad})
+            print(f"⚠️ Query plan check: {name} uses {', '.join(bad)} on '{collection}'")
+
+    if not problems:
+        print(f"Query plan check passed: {len(QUERY_PLAN_CHECKS)} queries use indexes")
+    return problems
@@ -0,0 +1,42 @@
+# backend/app/db/migrations/__init__.py
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.db.mongo import get_db
+
+# 적용 완료된 일회성 마이그레이션 기록 (문서 1개 = 마이그레이션 1개, _id = 이름)
+MIGRATIONS_COLLECTION = "migrations"
+
+
+def get_migrations_collection():
+    return get_db()[MIGRATIONS_COLLECTION]
+
+
+async def get_migration(name: str) -> Optional[Dict[str, Any]]:
+    return await get_migrations_collection().find_one({"_id": name})
+
+
+async def is_applied(name: str) -> bool:
+    doc = await get_migration(name)
+    return bool(doc and doc.get("applied_at"))
+
+
+async def save_progress(name: str, progress: Dict[str, Any]) -> None:
+    """
+    진행 상황 기록 (중단 후 재실행 시 어디까지 했는지 확인용)
+    """
+    await get_migrations_collection().update_one(
+        {"_id": name},
+        {"$set": {"progress": progress, "updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+
+
+async def mark_applied(name: str, report: Dict[str, Any]) -> None:
+    now = datetime.now(timezone.utc)
+    await get_migrations_collection().update_one(
+        {"_id": name},
+        {"$set": {"applied_at": now, "updated_at": now, "report": report}},
+        upsert=True,
+    )
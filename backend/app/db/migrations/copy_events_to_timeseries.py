@@ -0,0 +1,187 @@
+# backend/app/db/migrations/copy_events_to_timeseries.py
+"""
+events(document 저장) -> events_ts(time-series) 복사 마이그레이션
+
+EVENTS_STORAGE=timeseries로 바꾸면 이벤트를 읽고 쓰는 컬렉션이 events_ts로 바뀌므로,
+기존 events의 이력을 옮기지 않으면 목록 / export / 분석에서 과거 이벤트가 모두 사라집니다.
+그래서 ensure_events_storage는 events에 문서가 있는데 이 마이그레이션 적용 기록이 없으면 기동을 거부합니다.
+
+- _id 오름차순 keyset으로 batch_size개씩 복사, batch마다 마지막 _id를 migrations 컬렉션에 기록 (중단 후 재실행하면 이어서)
+- time-series 컬렉션은 _id 유일성을 보장하지 않으므로, 재실행 시 기록된 _id 이후 batch를 넣기 전에
+  같은 _id가 이미 들어가 있으면 먼저 지움 (중단 직전 batch 중복 방지, MongoDB 7.0+ 의 time-series 임의 필터 삭제 필요)
+- event _id는 uuid4 / "{user_id}:{event_key}"라 정렬 순서가 저장 순서와 무관
+  -> 복사 중(또는 복사 후 EVENTS_STORAGE 전환 전)에 저장된 이벤트는 _id가 지나간 위치보다 작으면 keyset 복사에서 빠짐
+  -> 마지막에 원본 전체를 _id 순으로 다시 훑어 대상에 없는 _id만 복사(catch-up)하고,
+     원본보다 대상 이벤트 수가 적으면 적용 기록을 남기지 않음
+  정확한 복사를 위해서는 이벤트 쓰기를 멈춘 상태(서버 중지)에서 실행하거나, 전환 직전에 --force로 한 번 더 실행
+  (기동 시 ensure_events_storage도 원본 / 대상 수를 비교해 대상이 적으면 기동 거부)
+- 원본 events는 지우지 않음 (확인 후 직접 drop)
+
+실행 (backend/ 디렉토리에서, EVENTS_STORAGE 값과 무관):
+    python -m app.db.migrations.copy_events_to_timeseries --dry-run
+    python -m app.db.migrations.copy_events_to_timeseries --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING
+
+from app.core.config import settings
+from app.db.migrations import get_migration, is_applied, mark_applied, save_progress
+from app.db.mongo import close_mongo_connection, connect_to_mongo, get_db
+
+MIGRATION_NAME = "copy_events_to_timeseries"
+
+SOURCE_COLLECTION = "events"
+TARGET_COLLECTION = "events_ts"
+
+
+async def _ensure_target() -> None:
+    existing = await get_db().list_collection_names(filter={"name": TARGET_COLLECTION})
+    if existing:
+        return
+    await get_db().create_collection(
+        TARGET_COLLECTION,
+        timeseries={
+            "timeField": "timestamp",
+            "metaField": "user_id",
+            "granularity": settings.EVENTS_TIMESERIES_GRANULARITY,
+        },
+    )
+
+
+async def _catch_up(source, target, batch_size: int) -> int:
+    """
+    원본 전체를 _id 순으로 훑어 대상에 없는 이벤트만 복사 (반환: 복사한 수)
+    대상 조회는 user_id(metaField) + batch의 timestamp 범위(timeField)를 함께 걸어 해당 버킷만 읽음
+    """
+    added = 0
+    after: Optional[Any] = None
+    while True:
+        query = {"_id": {"$gt": after}} if after is not None else {}
+        keys = await source.find(query, {"_id": 1, "user_id": 1, "timestamp": 1}).sort(
+            "_id", ASCENDING
+        ).limit(batch_size).to_list(length=batch_size)
+        if not keys:
+            break
+        after = keys[-1]["_id"]
+
+        timestamps = [k["timestamp"] for k in keys if k.get("timestamp") is not None]
+        stored_query: Dict[str, Any] = {
+            "user_id": {"$in": list({k.get("user_id") for k in keys})},
+            "_id": {"$in": [k["_id"] for k in keys]},
+        }
+        if len(timestamps) == len(keys):
+            stored_query["timestamp"] = {"$gte": min(timestamps), "$lte": max(timestamps)}
+        stored = {doc["_id"] async for doc in target.find(stored_query, {"_id": 1})}
+
+        missing = [k["_id"] for k in keys if k["_id"] not in stored]
+        if missing:
+            docs = await source.find({"_id": {"$in": missing}}).to_list(length=None)
+            await target.insert_many(docs, ordered=False)
+            added += len(docs)
+    return added
+
+
+async def copy_events(batch_size: int = 5000, dry_run: bool = False) -> Dict[str, Any]:
+    started = time.perf_counter()
+    source = get_db()[SOURCE_COLLECTION]
+    target = get_db()[TARGET_COLLECTION]
+
+    total = await source.count_documents({})
+    previous = await get_migration(MIGRATION_NAME)
+    after: Optional[Any] = ((previous or {}).get("progress") or {}).get("last_id")
+    copied = ((previous or {}).get("progress") or {}).get("copied", 0)
+    print(
+        f"[{MIGRATION_NAME}] {total} events in '{SOURCE_COLLECTION}'"
+        f"{f', resuming after {after}' if after is not None else ''}{' (dry run)' if dry_run else ''}",
+        file=sys.stderr,
+    )
+    if dry_run:
+        remaining = await source.count_documents({"_id": {"$gt": after}} if after is not None else {})
+        return {"total": total, "remaining": remaining, "dry_run": True}
+
+    await _ensure_target()
+    batches = 0
+    while True:
+        query = {"_id": {"$gt": after}} if after is not None else {}
+        docs = await source.find(query).sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            break
+
+        ids = [doc["_id"] for doc in docs]
+        if batches == 0 and previous is not None:
+            # 이전 실행이 insert 후 진행 기록 전에 멈췄을 수 있음
+            await target.delete_many({"_id": {"$in": ids}})
+        await target.insert_many(docs, ordered=False)
+
+        after = ids[-1]
+        copied += len(docs)
+        batches += 1
+        await save_progress(MIGRATION_NAME, {"last_id": after, "copied": copied})
+        print(
+            f"[{MIGRATION_NAME}] batch {batches}: {copied}/{total} events ({time.perf_counter() - started:.1f}s)",
+            file=sys.stderr,
+        )
+
+    # keyset 위치보다 작은 _id로 나중에 저장된 이벤트
+    caught_up = await _catch_up(source, target, batch_size)
+    copied += caught_up
+    if caught_up:
+        await save_progress(MIGRATION_NAME, {"last_id": after, "copied": copied})
+    print(f"[{MIGRATION_NAME}] catch-up: {caught_up} events", file=sys.stderr)
+
+    source_count = await source.count_documents({})
+    target_count = await target.count_documents({})
+    report = {
+        "total": source_count,
+        "copied": copied,
+        "caught_up": caught_up,
+        "target_count": target_count,
+        "batches": batches,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+    if target_count < source_count:
+        # catch-up 중에도 쓰기가 계속됨 -> 쓰기를 멈추고 --force로 다시 실행
+        report["applied"] = False
+        print(
+            f"[{MIGRATION_NAME}] not applied: '{TARGET_COLLECTION}' has {target_count} < {source_count} events "
+            "(stop event writes and rerun with --force)",
+            file=sys.stderr,
+        )
+        return report
+
+    await mark_applied(MIGRATION_NAME, report)
+    print(f"[{MIGRATION_NAME}] applied", file=sys.stderr)
+    return report
+
+
+async def _main(args) -> Dict[str, Any]:
+    await connect_to_mongo()
+    try:
+        if not args.dry_run and not args.force and await is_applied(MIGRATION_NAME):
+            print(f"[{MIGRATION_NAME}] already applied (use --force to re-check)", file=sys.stderr)
+            return {"already_applied": True}
+        return await copy_events(args.batch_size, args.dry_run)
+    finally:
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy document-stored events into the time-series collection")
+    parser.add_argument("--batch-size", type=int, default=5000, help="한 번에 복사할 이벤트 수")
+    parser.add_argument("--dry-run", action="store_true", help="쓰기 없이 대상 이벤트 수만 집계")
+    parser.add_argument("--force", action="store_true", help="적용 기록이 있어도 마지막 위치부터 다시 실행")
+    args = parser.parse_args()
+
+    report = asyncio.run(_main(args))
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
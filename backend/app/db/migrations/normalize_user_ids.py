@@ -0,0 +1,313 @@
+# backend/app/db/migrations/normalize_user_ids.py
+"""
+users._id 정규화 마이그레이션 (string _id -> ObjectId)
+
+예전 OAuth 콜백이 UserInDB.model_dump()를 그대로 insert해서 _id가 문자열로 저장된 유저가 남아 있고,
+그 때문에 crud/users._id_filter가 매 조회/수정마다 {$or: [ObjectId, string]} 두 번 탐색을 합니다.
+이 마이그레이션이 끝나면(migrations 컬렉션에 적용 기록) _id_filter는 ObjectId 단일 매칭만 사용합니다.
+
+유저 1명 처리 순서 (어느 단계에서 중단돼도 재실행하면 이어서 진행 = 멱등)
+  1) 새 _id 결정
+     - 24 hex 문자열: ObjectId(같은 값) -> 다른 컬렉션의 user_id(str) 참조는 그대로
+     - 그 외(uuid 등): 새 ObjectId를 옛 문서의 normalized_id에 먼저 기록 (재실행해도 같은 값)
+  2) ObjectId _id 문서 upsert (이미 있으면 fcm_tokens / blocked_apps만 합침)
+  3) 참조 갱신 (user_id가 바뀌는 경우만)
+     sessions, events, tasks, schedules, user_feedback, session_stats, AI_Profiles,
+     sync_versions, sync_tombstones: user_id 변경
+     _id에 user_id가 들어 있는 문서는 새 _id로 다시 만듦 (insert 후 옛 문서 삭제)
+       events(document 저장): "{user_id}:{event_key}"
+       session_stats: "{user_id}:{session_id}"
+       sync_versions: "{user_id}:{kind}" (version / floor / tombstone 유지 -> 에이전트 증분 동기화 그대로 동작)
+       ml_models: _id = user_id (유저 모델)
+     analytics_daily: 캐시라 삭제 (다음 조회 때 다시 계산)
+  4) 옛 string _id 문서 삭제
+
+user_id가 바뀐 유저(uuid 등)는 예전 토큰의 sub로는 더 이상 찾을 수 없어 다시 로그인해야 합니다.
+
+실행 (backend/ 디렉토리에서):
+    python -m app.db.migrations.normalize_user_ids --dry-run
+    python -m app.db.migrations.normalize_user_ids --batch-size 200
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.migrations import is_applied, mark_applied, save_progress
+from app.db.mongo import close_mongo_connection, connect_to_mongo, events_collection_name, get_db
+
+MIGRATION_NAME = "normalize_user_ids"
+
+# user_id(str)로 유저를 참조하는 컬렉션 (events는 저장 방식에 따라 이름이 달라서 따로 처리)
+REFERENCE_COLLECTIONS = (
+    "sessions",
+    "tasks",
+    "schedules",
+    "user_feedback",
+    "session_stats",
+    "AI_Profiles",
+    "sync_versions",
+    "sync_tombstones",
+)
+
+# _id가 "{user_id}:..." 인 컬렉션 (user_id가 바뀌면 _id도 다시 만듦 / events는 document 저장일 때만)
+PREFIXED_ID_COLLECTIONS = ("session_stats", "sync_versions")
+
+# 유저 문서에서 합칠 배열 필드 (같은 유저의 ObjectId 문서가 이미 있을 때)
+MERGE_ARRAY_FIELDS = ("fcm_tokens", "blocked_apps")
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _string_id_query(after: Optional[str]) -> Dict[str, Any]:
+    id_filter: Dict[str, Any] = {"$type": "string"}
+    if after is not None:
+        id_filter["$gt"] = after
+    return {"_id": id_filter}
+
+
+class UserIdNormalizer:
+    def __init__(self, batch_size: int, dry_run: bool):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.db = get_db()
+        self.events = self.db[events_collection_name()]
+        self.rekey_event_ids = settings.EVENTS_STORAGE != "timeseries"
+
+        # --- counters ---
+        self.users = 0
+        self.users_total = 0
+        self.renamed = 0   # user_id(str)가 바뀐 유저 (uuid 등)
+        self.merged = 0    # 같은 ObjectId 문서가 이미 있어 합친 유저
+        self.references: Dict[str, int] = {}
+        self.rekeyed: Dict[str, int] = {}
+        self.batches = 0
+
+    # ----------------------------------------------------------------------
+    # 1) 새 _id
+    # ----------------------------------------------------------------------
+    async def _target_id(self, doc: Dict[str, Any]) -> ObjectId:
+        old_id = doc["_id"]
+        if ObjectId.is_valid(old_id):
+            return ObjectId(old_id)
+        if isinstance(doc.get("normalized_id"), ObjectId):
+            return doc["normalized_id"]
+
+        new_id = ObjectId()
+        if not self.dry_run:
+            await self.db.users.update_one(
+                {"_id": old_id, "normalized_id": {"$exists": False}},
+                {"$set": {"normalized_id": new_id}},
+            )
+            # 동시에 다른 실행이 먼저 기록했을 수 있으므로 저장된 값을 다시 읽음
+            stored = await self.db.users.find_one({"_id": old_id}, {"normalized_id": 1})
+            new_id = stored["normalized_id"]
+        return new_id
+
+    # ----------------------------------------------------------------------
+    # 2) ObjectId 문서 upsert
+    # ----------------------------------------------------------------------
+    def _upsert_user(self, doc: Dict[str, Any], new_id: ObjectId) -> UpdateOne:
+        rest = {
+            k: v for k, v in doc.items()
+            if k not in ("_id", "normalized_id", *MERGE_ARRAY_FIELDS)
+        }
+        if str(new_id) != doc["_id"]:
+            rest["legacy_id"] = doc["_id"]  # 예전 user_id 추적용
+        return UpdateOne(
+            {"_id": new_id},
+            {
+                "$setOnInsert": rest,
+                "$addToSet": {f: {"$each": doc.get(f) or []} for f in MERGE_ARRAY_FIELDS},
+            },
+            upsert=True,
+        )
+
+    # ----------------------------------------------------------------------
+    # 3) 참조 갱신
+    # ----------------------------------------------------------------------
+    async def _count_references(self, renames: List[Tuple[str, str]]) -> None:
+        old_ids = [old for old, _ in renames]
+        for name in (*REFERENCE_COLLECTIONS, "events", "analytics_daily"):
+            collection = self.events if name == "events" else self.db[name]
+            count = await collection.count_documents({"user_id": {"$in": old_ids}})
+            self.references[name] = self.references.get(name, 0) + count
+        count = await self.db.ml_models.count_documents({"_id": {"$in": old_ids}})
+        self.references["ml_models"] = self.references.get("ml_models", 0) + count
+
+    async def _rewrite_references(self, renames: List[Tuple[str, str]]) -> None:
+        for name in (*REFERENCE_COLLECTIONS, "events"):
+            collection = self.events if name == "events" else self.db[name]
+            result = await collection.bulk_write(
+                [UpdateMany({"user_id": old}, {"$set": {"user_id": new}}) for old, new in renames],
+                ordered=False,
+            )
+            self.references[name] = self.references.get(name, 0) + result.modified_count
+
+        # 닫힌 날 캐시: _id에 user_id가 들어 있으므로 지우고 다시 계산하게 둠
+        result = await self.db.analytics_daily.delete_many({"user_id": {"$in": [old for old, _ in renames]}})
+        self.references["analytics_daily"] = self.references.get("analytics_daily", 0) + result.deleted_count
+
+        for old, new in renames:
+            if self.rekey_event_ids:
+                await self._rekey_prefixed(self.events, "events", old, new)
+            for name in PREFIXED_ID_COLLECTIONS:
+                await self._rekey_prefixed(self.db[name], name, old, new)
+            await self._rekey_model(old, new)
+
+    async def _insert_rekeyed(
+        self, collection, name: str, docs: List[Dict[str, Any]], copies: List[Dict[str, Any]]
+    ) -> None:
+        """
+        _id는 수정할 수 없으므로 새 _id로 insert 후 옛 문서 삭제
+        """
+        try:
+            await collection.insert_many(copies, ordered=False)
+        except BulkWriteError as e:
+            # 이전 실행에서 이미 복사된 문서(중복 키)는 무시
+            others = [err for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY_ERROR]
+            if others:
+                raise
+        await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+        self.rekeyed[name] = self.rekeyed.get(name, 0) + len(docs)
+
+    async def _rekey_prefixed(self, collection, name: str, old: str, new: str) -> None:
+        """
+        _id "{old}:..." -> "{new}:..." (batch_size씩)
+        events: 재전송 중복 제거(event_key) / session_stats: 세션 집계 이어쓰기 / sync_versions: 동기화 version 유지
+        """
+        prefix = re.compile("^" + re.escape(f"{old}:"))
+        while True:
+            docs = await collection.find({"_id": prefix}).sort("_id", ASCENDING).to_list(length=self.batch_size)
+            if not docs:
+                return
+            copies = [{**doc, "_id": new + doc["_id"][len(old):]} for doc in docs]
+            await self._insert_rekeyed(collection, name, docs, copies)
+
+    async def _rekey_model(self, old: str, new: str) -> None:
+        """
+        유저 모델 ml_models._id = user_id -> 새 user_id (재학습 없이 계속 채점)
+        """
+        doc = await self.db.ml_models.find_one({"_id": old})
+        if doc:
+            await self._insert_rekeyed(self.db.ml_models, "ml_models", [doc], [{**doc, "_id": new}])
+
+    # ----------------------------------------------------------------------
+    # batch
+    # ----------------------------------------------------------------------
+    async def _run_batch(self, docs: List[Dict[str, Any]]) -> None:
+        upserts = []
+        new_ids = []
+        renames: List[Tuple[str, str]] = []
+        for doc in docs:
+            new_id = await self._target_id(doc)
+            if str(new_id) != doc["_id"]:
+                renames.append((doc["_id"], str(new_id)))
+            new_ids.append(new_id)
+            upserts.append(self._upsert_user(doc, new_id))
+
+        existing = await self.db.users.count_documents({"_id": {"$in": new_ids}})
+        self.merged += existing
+        self.renamed += len(renames)
+
+        if self.dry_run:
+            if renames:
+                await self._count_references(renames)
+            return
+
+        await self.db.users.bulk_write(upserts, ordered=False)
+        if renames:
+            await self._rewrite_references(renames)
+        await self.db.users.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+
+    def progress(self) -> Dict[str, Any]:
+        return {
+            "users": self.users,
+            "users_total": self.users_total,
+            "renamed": self.renamed,
+            "merged": self.merged,
+            "references": dict(self.references),
+            "rekeyed": dict(self.rekeyed),
+            "batches": self.batches,
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.users_total = await self.db.users.count_documents(_string_id_query(None))
+        print(
+            f"[{MIGRATION_NAME}] {self.users_total} users with string _id"
+            f"{' (dry run)' if self.dry_run else ''}",
+            file=sys.stderr,
+        )
+
+        after = None
+        while True:
+            docs = await (
+                self.db.users.find(_string_id_query(after))
+                .sort("_id", ASCENDING)
+                .limit(self.batch_size)
+                .to_list(length=self.batch_size)
+            )
+            if not docs:
+                break
+
+            await self._run_batch(docs)
+            self.users += len(docs)
+            self.batches += 1
+            after = docs[-1]["_id"]
+
+            print(
+                f"[{MIGRATION_NAME}] batch {self.batches}: {self.users}/{self.users_total} users "
+                f"(renamed {self.renamed}, merged {self.merged}, {time.perf_counter() - started:.1f}s)",
+                file=sys.stderr,
+            )
+            if not self.dry_run:
+                await save_progress(MIGRATION_NAME, self.progress())
+
+        report = {**self.progress(), "dry_run": self.dry_run, "elapsed_s": round(time.perf_counter() - started, 3)}
+        if not self.dry_run:
+            remaining = await self.db.users.count_documents(_string_id_query(None))
+            report["remaining"] = remaining
+            if remaining == 0:
+                await mark_applied(MIGRATION_NAME, report)
+                print(f"[{MIGRATION_NAME}] applied", file=sys.stderr)
+        return report
+
+
+async def normalize_user_ids(batch_size: int = 500, dry_run: bool = False) -> Dict[str, Any]:
+    return await UserIdNormalizer(batch_size, dry_run).run()
+
+
+async def _main(args) -> Dict[str, Any]:
+    await connect_to_mongo()
+    try:
+        if not args.dry_run and not args.force and await is_applied(MIGRATION_NAME):
+            print(f"[{MIGRATION_NAME}] already applied (use --force to re-check)", file=sys.stderr)
+            return {"already_applied": True}
+        return await normalize_user_ids(args.batch_size, args.dry_run)
+    finally:
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize string user _ids to ObjectId")
+    parser.add_argument("--batch-size", type=int, default=500, help="한 번에 처리할 유저 수")
+    parser.add_argument("--dry-run", action="store_true", help="쓰기 없이 대상 유저/참조 수만 집계")
+    parser.add_argument("--force", action="store_true", help="적용 기록이 있어도 다시 실행")
+    args = parser.parse_args()
+
+    report = asyncio.run(_main(args))
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
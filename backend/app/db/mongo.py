@@ -2,13 +2,16 @@
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.core.metrics import mongo_command_metrics
 
 client: AsyncIOMotorClient | None = None
 db = None
 
 async def connect_to_mongo():
     global client, db
-    client = AsyncIOMotorClient(settings.MONGO_URI)
+    # 명령별 지연 시간(컬렉션 단위)을 /metrics로 노출
+    listeners = [mongo_command_metrics] if settings.METRICS_ENABLED else []
+    client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=listeners)
     db = client[settings.MONGO_DB_NAME]
     print("MongoDB Connected!")
 
@@ -18,6 +21,63 @@ async def close_mongo_connection():
         client.close()
         print("MongoDB Connection Closed!")
 
+def events_collection_name() -> str:
+    """
+    EVENTS_STORAGE 설정에 따라 이벤트를 읽고 쓸 컬렉션 이름을 반환합니다.
+    """
+    if settings.EVENTS_STORAGE == "timeseries":
+        return "events_ts"
+    return "events"
+
+
+async def ensure_events_storage():
+    """
+    EVENTS_STORAGE=timeseries일 때 time-series 컬렉션을 준비합니다.
+    - timeField: timestamp / metaField: user_id
+      -> 한 유저의 이벤트가 granularity(분/시간) 단위 버킷 문서로 묶여 저장됨
+    - 이미 있으면 아무것도 하지 않음
+    - 기존 events에 이력이 있는데 복사 마이그레이션(copy_events_to_timeseries) 기록이 없거나
+      events_ts의 이벤트 수가 events보다 적으면 기동 거부
+      (그대로 전환하면 과거 이벤트가 목록 / export / 분석에서 사라짐)
+    """
+    if settings.EVENTS_STORAGE != "timeseries":
+        return
+
+    from app.db.migrations.copy_events_to_timeseries import MIGRATION_NAME, SOURCE_COLLECTION, TARGET_COLLECTION
+    from app.db.migrations import is_applied
+
+    if await get_db()[SOURCE_COLLECTION].find_one({}, {"_id": 1}):
+        if not await is_applied(MIGRATION_NAME):
+            raise RuntimeError(
+                f"EVENTS_STORAGE=timeseries but '{SOURCE_COLLECTION}' still has events. "
+                "Run `python -m app.db.migrations.copy_events_to_timeseries` first."
+            )
+        # 적용 후에도 원본에 이벤트가 더 쓰였으면(전환 전 쓰기) 대상이 원본보다 적음
+        # 원본을 drop하기 전까지만 하는 검사 (전체 count)
+        source_count = await get_db()[SOURCE_COLLECTION].count_documents({})
+        target_count = await get_db()[TARGET_COLLECTION].count_documents({})
+        if target_count < source_count:
+            raise RuntimeError(
+                f"'{TARGET_COLLECTION}' has {target_count} events but '{SOURCE_COLLECTION}' has {source_count}. "
+                "Stop event writes and rerun `python -m app.db.migrations.copy_events_to_timeseries --force`."
+            )
+
+    name = events_collection_name()
+    existing = await get_db().list_collection_names(filter={"name": name})
+    if existing:
+        return
+
+    await get_db().create_collection(
+        name,
+        timeseries={
+            "timeField": "timestamp",
+            "metaField": "user_id",
+            "granularity": settings.EVENTS_TIMESERIES_GRANULARITY,
+        },
+    )
+    print(f"MongoDB time-series collection '{name}' created ({settings.EVENTS_TIMESERIES_GRANULARITY})")
+
+
 def get_db():
     if db is None:
         raise RuntimeError("MongoDB not initialized. Did you call connect_to_mongo()?")
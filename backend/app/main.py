@@ -4,11 +4,25 @@ import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.db.mongo import connect_to_mongo, close_mongo_connection
+from app.api.deps import get_token_cache_stats, require_admin
+from app.api.sync import SYNC_VERSION_HEADER
+from app.core import metrics
+from app.core.compression import RequestDecompressionMiddleware
+from app.core.config import settings
+from app.crud.pagination import NEXT_CURSOR_HEADER
+from app.crud.users import detect_id_normalization, get_user_cache_stats
+from app.db.mongo import connect_to_mongo, close_mongo_connection, ensure_events_storage
+from app.db.indexes import ensure_indexes, verify_query_plans
+from app.services.distraction_scoring import distraction_scorer
+from app.services.ingest_queue import ingest_queue
+from app.services.ml_training import ml_training_runner
+from app.services.schedule_engine import schedule_engine
+from app.services.session_reaper import session_reaper
 
 # -------------------------
 # Env
@@ -28,7 +42,26 @@ if not IS_PRODUCTION:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_mongo()
+    await ensure_events_storage()
+    await detect_id_normalization()
+    if settings.MONGO_ENSURE_INDEXES:
+        await ensure_indexes()
+    if settings.MONGO_EXPLAIN_CHECK:
+        await verify_query_plans()
+    if settings.INGEST_QUEUE_ENABLED:
+        await ingest_queue.start()
+    if settings.SESSION_REAPER_ENABLED:
+        await session_reaper.start()
+    if settings.ML_TRAINING_ENABLED:
+        await ml_training_runner.start()
     yield
+    # 진행 중인 학습 작업은 취소하고 admin_job_logs에 failed로 기록
+    await ml_training_runner.stop()
+    await session_reaper.stop()
+    # 큐에 남은 이벤트를 모두 저장한 뒤 DB 연결 종료
+    await ingest_queue.stop()
+    # flush 과정에서 들어온 채점 작업까지 마무리
+    await distraction_scorer.stop()
     await close_mongo_connection()
 
 app = FastAPI(
@@ -52,8 +85,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # keyset 페이지네이션 토큰 / 동기화 version을 브라우저(웹 대시보드)에서 읽을 수 있도록 노출
+    expose_headers=[NEXT_CURSOR_HEADER, SYNC_VERSION_HEADER],
 )
 
+# 큰 목록 응답(/events, /sessions, export 등) gzip 압축
+app.add_middleware(GZipMiddleware, minimum_size=settings.RESPONSE_GZIP_MIN_SIZE)
+
+# 데스크탑 이벤트 업로드의 gzip / zstd 요청 본문 해제
+app.add_middleware(RequestDecompressionMiddleware)
+
 SESSION_SECRET = (
     os.getenv("SESSION_SECRET_KEY")
     or os.getenv("JWT_SECRET_KEY")
@@ -68,6 +109,10 @@ app.add_middleware(
     max_age=3600,
 )
 
+# 요청 지연 / 처리 중 요청 수 (마지막에 등록 = 가장 바깥 -> 압축 해제, 세션 처리 시간까지 포함)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # -------------------------
 # Health check
 # -------------------------
@@ -75,6 +120,23 @@ app.add_middleware(
 async def read_root():
     return {"message": "Backend is running!"}
 
+# -------------------------
+# Metrics (Prometheus)
+# -------------------------
+metrics.registry.register_stats("ingest_queue", "Ingest queue stats", ingest_queue.stats)
+metrics.registry.register_stats("user_cache", "User document cache stats", get_user_cache_stats)
+metrics.registry.register_stats("token_cache", "Verified JWT cache stats", get_token_cache_stats)
+metrics.registry.register_stats("session_reaper", "Session reaper stats", session_reaper.stats)
+metrics.registry.register_stats("distraction_scoring", "Distraction scoring stats", distraction_scorer.stats)
+metrics.registry.register_stats("ml_training", "ML training runner stats", ml_training_runner.stats)
+metrics.registry.register_stats("schedule_engine", "Schedule index cache stats", schedule_engine.stats)
+
+
+# 유저 수 / 큐 상태 등 내부 정보 -> 관리자 키(X-Admin-Key) 필요 (ADMIN_API_KEY 미설정 시 403)
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def read_metrics():
+    return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
 # -------------------------
 # Routers
 # -------------------------
@@ -87,15 +149,21 @@ from app.api.endpoints.web import (
     sessions,
     events as web_events,
     feedback,
+    analytics,
+    profiles,
 )
 
 # User
 from app.api.endpoints.user import me
 
+# Admin
+from app.api.endpoints.admin import ml as admin_ml
+
 # Desktop
 from app.api.endpoints.desktop import (
     auth as desktop_auth,
     events as desktop_events,
+    profiles as desktop_profiles,
 )
 
 # Web Auth
@@ -110,7 +178,13 @@ app.include_router(schedules.router)
 app.include_router(sessions.router)
 app.include_router(web_events.router)
 app.include_router(feedback.router)
+app.include_router(analytics.router)
+app.include_router(profiles.router)
+
+# Admin
+app.include_router(admin_ml.router)
 
 # Desktop APIs
 app.include_router(desktop_auth.router, prefix="/api/v1/auth/desktop", tags=["auth-desktop"])
 app.include_router(desktop_events.router, prefix="/api/v1/events", tags=["events"])
+app.include_router(desktop_profiles.router, prefix="/api/v1/profiles", tags=["profiles-desktop"])
@@ -1,7 +1,8 @@
 # 파일 위치: backend/app/schemas/admin.py
 
 from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 
 class MLTrainRequest(BaseModel):
     """
@@ -17,4 +18,20 @@ class JobStatusResponse(BaseModel):
     백그라운드 작업이 시작되었음을 알리는 응답 데이터 구조입니다.
     """
     job_id: str # 생성된 백그라운드 작업 ID (예: admin_job_logs의 id)
-    status: str = "started"
\ No newline at end of file
+    status: str = "started"
+
+class JobLogRead(BaseModel):
+    """
+    [응답] GET /admin/jobs/{job_id}
+    admin_job_logs 문서 1건 (progress: 진행 중 카운터, 작업 중에도 주기적으로 갱신)
+    """
+    id: str
+    job_type: str
+    triggered_by: str
+    start_time: datetime
+    end_time: Optional[datetime] = None
+    status: str # "pending", "running", "completed", "failed"
+    parameters: Dict[str, Any] = {}
+    progress: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
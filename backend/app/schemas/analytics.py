@@ -0,0 +1,40 @@
+# backend/app/schemas/analytics.py
+
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AppUsage(BaseModel):
+    """앱별 이벤트 샘플 수"""
+    app_name: str
+    samples: int
+
+
+# --- API 응답(Response) 스키마 ---
+
+class FocusSummary(BaseModel):
+    """일간/주간 집중 통계 공통 필드"""
+    sessions: int = 0
+    focused_seconds: float = 0.0        # 세션 duration 합 (초)
+    interruption_count: int = 0
+    goal_sessions: int = 0              # goal_duration이 설정된 세션 수
+    goal_completed: int = 0             # duration >= goal_duration 을 달성한 세션 수
+    completion_rate: Optional[float] = None  # goal_completed / goal_sessions (목표 세션 없으면 None)
+    top_distracting_apps: List[AppUsage] = Field(default_factory=list)
+
+
+class DailyFocusRead(FocusSummary):
+    """
+    [응답] GET /analytics/daily
+    """
+    date: date
+
+
+class WeeklyFocusRead(FocusSummary):
+    """
+    [응답] GET /analytics/weekly
+    week_start는 해당 주의 월요일
+    """
+    week_start: date
@@ -1,8 +1,11 @@
 # backend/app/schemas/feeeventdback.py
 
 from datetime import datetime
-from typing import Dict, Optional, Any, List
-from pydantic import BaseModel, Field
+from typing import Annotated, Dict, Optional, Any, List
+from pydantic import BaseModel, Field, model_validator
+
+# 클라이언트 이벤트 키 (서버 _id = "{user_id}:{event_key}"): 단건 / 컬럼형 배치 모두 같은 제약
+EventKey = Annotated[str, Field(min_length=1, max_length=200)]
 
 
 class EventCreate(BaseModel):
@@ -17,6 +20,10 @@ class EventCreate(BaseModel):
     window_title: Optional[str] = None
     activity_vector: Dict[str, Any] = Field(default_factory=dict)
 
+    # 클라이언트가 정한 이벤트 고유 키 (예: 에이전트 로컬 DB의 세션 + rowid)
+    # 주면 서버 _id = "{user_id}:{event_key}" -> 같은 이벤트를 재전송해도 한 번만 저장
+    event_key: Optional[EventKey] = None
+
 
 class EventBatchCreate(BaseModel):
     """
@@ -39,6 +46,8 @@ class EventRead(BaseModel):
     app_name: Optional[str] = None
     window_title: Optional[str] = None
     activity_vector: Dict[str, Any] = Field(default_factory=dict)
+    # 모델이 채점한 이벤트만 값이 있음 (0~1, 높을수록 딴짓)
+    distraction_score: Optional[float] = None
 
     model_config = {"from_attributes": True}
 
@@ -58,11 +67,58 @@ class EventCreateResponse(BaseModel):
     """
     [응답] 이벤트 생성/배치 생성 공용
     - 단일 생성: event_id
-    - 배치 생성: count
+    - 배치 생성: count (새로 저장된 개수), duplicates (이미 저장돼 있던 event_key 개수)
     """
     status: str = "success"
 
     # 배치 처리 시에는 저장된 개수를 반환하는 것이 일반적
     count: Optional[int] = None
+    duplicates: Optional[int] = None
     event_id: Optional[str] = None
 
+
+
+class EventColumnarBatch(BaseModel):
+    """
+    [요청] POST /events/batch/columnar
+    이벤트 배치를 "열(column) 배열" 형태로 전송하는 고속 업로드용 구조입니다.
+    이벤트마다 EventCreate 모델을 만들지 않고, 열 단위 리스트만 한 번에 검증합니다.
+    {
+        "session_id": ["s1", "s1", ...],
+        "timestamp": [1700000000, 1700000005, ...],
+        "app_name": [...],
+        "window_title": [...],
+        "activity_vector": [{...}, {...}, ...],
+        "event_key": ["s1:1", "s1:2", ...]
+    }
+    - 모든 열의 길이는 timestamp와 같아야 합니다.
+    - session_id/app_name/window_title/activity_vector/event_key는 생략 가능 (None / {}로 채움)
+    """
+    timestamp: List[datetime]
+    session_id: Optional[List[Optional[str]]] = None
+    app_name: Optional[List[Optional[str]]] = None
+    window_title: Optional[List[Optional[str]]] = None
+    activity_vector: Optional[List[Optional[Dict[str, Any]]]] = None
+    event_key: Optional[List[Optional[EventKey]]] = None
+
+    @model_validator(mode="after")
+    def check_column_lengths(self):
+        n = len(self.timestamp)
+        for name in ("session_id", "app_name", "window_title", "activity_vector", "event_key"):
+            column = getattr(self, name)
+            if column is not None and len(column) != n:
+                raise ValueError(f"column '{name}' has {len(column)} values, expected {n}")
+        return self
+
+
+class EventIngestResponse(BaseModel):
+    """
+    [응답] POST /events/batch/columnar
+    저장 개수와 함께 청크 단위 처리량(events/sec)을 반환합니다.
+    """
+    status: str = "success"
+    count: int = 0
+    duplicates: int = 0
+    chunks: int = 0
+    elapsed_ms: float = 0.0
+    events_per_sec: float = 0.0
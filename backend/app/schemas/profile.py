@@ -15,6 +15,10 @@ class AIProfileUpdate(BaseModel):
     profile_name: Optional[str] = None
     custom_thresholds: Optional[Dict[str, float]] = None
 
+class AIProfileSlicesUpdate(BaseModel):
+    """[요청] PUT /profiles/{profile_id}/time-slices - 시간 구간 규칙 전체 교체 시"""
+    time_slices: List[TimeSliceRule]
+
 # --- API 응답(Response) 스키마 ---
 class AIProfileRead(BaseModel):
     """[응답] GET /profiles, GET /profiles/{profile_id} 등 조회 시"""
@@ -27,6 +31,19 @@ class AIProfileRead(BaseModel):
     model_confidence_score: float
     last_updated_at: datetime
     custom_thresholds: Dict[str, float]
+    version: Optional[str] = None # 컴파일된 규칙의 내용 해시 (에이전트 ETag와 같은 값)
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class AIProfileCompiled(BaseModel):
+    """[응답] GET /api/v1/profiles/default - 에이전트 동기화용 압축 payload (ETag = version)"""
+    profile_id: str
+    profile_name: str
+    model_type: ModelTypeEnum
+    thresholds: Dict[str, float]
+    format: int
+    slice_minutes: int
+    n_slices: int
+    columns: Dict[str, List[Any]] # 규칙 키별 dense 배열 (index = slice_index, 규칙 없는 구간은 null)
+    version: str
\ No newline at end of file
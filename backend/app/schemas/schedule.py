@@ -59,3 +59,16 @@ class ScheduleRead(BaseModel):
     model_config = {
         "from_attributes": True
     }
+
+
+class ScheduleStatusRead(BaseModel):
+    """
+    [응답] GET /schedules/active
+    지금 활성인 스케줄과 다음 전환(시작/종료) 시각
+    """
+    at: datetime
+    tz: str
+    active: list[ScheduleRead]
+    next_transition_at: Optional[datetime] = None
+    starting_schedule_ids: list[str] = Field(default_factory=list)
+    ending_schedule_ids: list[str] = Field(default_factory=list)
@@ -1,7 +1,7 @@
 # backend/app/schemas/session.py
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -54,3 +54,26 @@ class SessionRead(BaseModel):
     model_config = {
         "from_attributes": True
     }
+
+
+class SessionStatsRead(BaseModel):
+    """
+    [응답] GET /sessions/{session_id}/stats
+    이벤트 수집 시점에 누적 집계된 세션 요약 통계
+    """
+    session_id: str
+    user_id: str
+    event_count: int = 0
+    first_event_at: Optional[datetime] = None
+    last_event_at: Optional[datetime] = None
+    last_app: Optional[str] = None
+
+    active_seconds: float = 0.0          # idle gap을 제외한 이벤트 간 시간 합 (초)
+    idle_seconds: float = 0.0            # idle gap 시간 합 (초)
+    idle_gap_count: int = 0
+    max_idle_gap_seconds: float = 0.0
+
+    input_events: float = 0.0            # meaningful_input_events (세션 누적 최댓값)
+    input_events_per_minute: float = 0.0
+
+    app_seconds: Dict[str, float] = Field(default_factory=dict)  # app_name별 사용 시간 (초)
@@ -0,0 +1,366 @@
+# backend/app/services/distraction_scoring.py
+
+import asyncio
+import pickle
+import re
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.crud import events as event_crud
+from app.crud import ml_models
+from app.crud import users as users_crud
+
+# --------------------------------------------------------------------------
+# 피처 행렬 (이벤트 N개 -> N x N_FEATURES float32)
+# - 문서 dict에서 값을 한 번 꺼낸 뒤 나머지는 전부 NumPy 배열 연산
+# - 구성이 바뀌면 FEATURE_VERSION을 올려야 함 (예전 버전으로 학습한 모델은 채점에 쓰지 않음)
+# --------------------------------------------------------------------------
+FEATURE_VERSION = 1
+
+NUMERIC_FEATURES = (
+    "input_rate",           # 같은 세션 직전 샘플 이후 meaningful_input_events 증가량 / 초
+    "log_idle_seconds",     # log1p(timestamp - last_meaningful_input_timestamp_ms)
+    "log_mouse_idle_seconds",
+    "visible_windows",
+    "app_switch",           # 같은 세션 직전 샘플과 앱이 다르면 1
+    "is_blocked_app",       # 유저의 blocked_apps에 포함되면 1
+)
+APP_BUCKETS = 64     # app_name feature hashing 버킷 (one-hot)
+TITLE_BUCKETS = 128  # window_title 토큰 feature hashing 버킷 (L2 정규화 빈도)
+
+APP_OFFSET = len(NUMERIC_FEATURES)
+TITLE_OFFSET = APP_OFFSET + APP_BUCKETS
+N_FEATURES = TITLE_OFFSET + TITLE_BUCKETS
+
+MAX_INPUT_RATE = 50.0
+MAX_VISIBLE_WINDOWS = 20.0
+
+# input_rate / app_switch는 같은 세션 직전 샘플과의 차이 -> 학습 / 채점 모두 이 시간 안의 앞쪽 문맥 이벤트를 같이 읽음
+CONTEXT_BEFORE = timedelta(seconds=60)
+
+# 피처 계산에 필요한 이벤트 필드
+FEATURE_FIELDS = {"_id": 1, "session_id": 1, "timestamp": 1, "app_name": 1, "window_title": 1, "activity_vector": 1}
+
+_TOKEN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=65536)
+def _bucket(value: str, buckets: int) -> int:
+    return zlib.crc32(value.encode("utf-8")) % buckets
+
+
+def epoch_ms(ts: Any) -> float:
+    """
+    이벤트 timestamp -> epoch ms (피처 / 구간 계산 공용. 숫자는 이미 ms로 보고 그대로, 없으면 0)
+    """
+    if isinstance(ts, datetime):
+        if ts.tzinfo is None:  # Mongo에서 읽은 naive datetime은 UTC
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp() * 1000
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    return 0.0
+
+
+def _float_column(vectors: Sequence[Dict[str, Any]], key: str) -> np.ndarray:
+    return np.fromiter((float(v.get(key) or 0) for v in vectors), dtype=np.float64, count=len(vectors))
+
+
+def build_feature_matrix(docs: Sequence[Dict[str, Any]], blocked_apps: Iterable[str] = ()) -> np.ndarray:
+    n = len(docs)
+    X = np.zeros((n, N_FEATURES), dtype=np.float32)
+    if n == 0:
+        return X
+
+    vectors = [d.get("activity_vector") or {} for d in docs]
+    apps = [d.get("app_name") or "" for d in docs]
+    titles = [d.get("window_title") or "" for d in docs]
+    sessions = [d.get("session_id") or "" for d in docs]
+
+    ts_ms = np.fromiter((epoch_ms(d.get("timestamp")) for d in docs), dtype=np.float64, count=n)
+    inputs = _float_column(vectors, "meaningful_input_events")
+    last_input = _float_column(vectors, "last_meaningful_input_timestamp_ms")
+    last_mouse = _float_column(vectors, "last_mouse_move_timestamp_ms")
+    windows = np.fromiter((len(v.get("visible_windows") or ()) for v in vectors), dtype=np.float64, count=n)
+
+    # --- 세션 내 시간순 직전 샘플과의 차이 (배치 안에서 계산) ---
+    _, session_codes = np.unique(sessions, return_inverse=True)
+    _, app_codes = np.unique(apps, return_inverse=True)
+    order = np.lexsort((ts_ms, session_codes))
+
+    s_sessions = session_codes[order]
+    same_session = np.zeros(n, dtype=bool)
+    same_session[1:] = s_sessions[1:] == s_sessions[:-1]
+
+    dt = np.diff(ts_ms[order], prepend=0.0) / 1000
+    d_input = np.diff(inputs[order], prepend=0.0)
+    valid = same_session & (dt > 0) & (d_input >= 0)  # 카운터 리셋(에이전트 재시작)은 제외
+    rate_sorted = np.where(valid, d_input / np.where(dt > 0, dt, 1.0), 0.0)
+
+    s_apps = app_codes[order]
+    switch_sorted = np.zeros(n, dtype=bool)
+    switch_sorted[1:] = same_session[1:] & (s_apps[1:] != s_apps[:-1])
+
+    rate = np.empty(n)
+    rate[order] = rate_sorted
+    switch = np.empty(n, dtype=bool)
+    switch[order] = switch_sorted
+
+    # --- idle (last_* 값이 없으면 0) ---
+    idle = np.where(last_input > 0, np.maximum(ts_ms - last_input, 0) / 1000, 0.0)
+    mouse_idle = np.where(last_mouse > 0, np.maximum(ts_ms - last_mouse, 0) / 1000, 0.0)
+
+    blocked = {a.lower() for a in blocked_apps}
+    is_blocked = np.fromiter((a.lower() in blocked for a in apps), dtype=bool, count=n) if blocked else 0.0
+
+    X[:, 0] = np.clip(rate, 0, MAX_INPUT_RATE)
+    X[:, 1] = np.log1p(idle)
+    X[:, 2] = np.log1p(mouse_idle)
+    X[:, 3] = np.minimum(windows, MAX_VISIBLE_WINDOWS)
+    X[:, 4] = switch
+    X[:, 5] = is_blocked
+
+    # --- app one-hot (고유 앱 이름별로 해시 1번) ---
+    rows = np.arange(n)
+    X[rows, APP_OFFSET + np.array([_bucket(a.lower(), APP_BUCKETS) for a in apps])] = 1.0
+
+    # --- title 토큰 빈도 -> 행별 L2 정규화 ---
+    token_rows: List[int] = []
+    token_cols: List[int] = []
+    for i, title in enumerate(titles):
+        for token in _TOKEN.findall(title.lower()):
+            token_rows.append(i)
+            token_cols.append(TITLE_OFFSET + _bucket(token, TITLE_BUCKETS))
+    if token_rows:
+        np.add.at(X, (np.array(token_rows), np.array(token_cols)), 1.0)
+        block = X[:, TITLE_OFFSET:]
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        np.divide(block, norms, out=block, where=norms > 0)
+
+    return X
+
+
+def positive_proba(model: Any, X: np.ndarray) -> np.ndarray:
+    """
+    predict_proba에서 distraction(=1) 클래스 확률만. 학습 데이터에 1이 없던 모델은 0
+    """
+    classes = list(getattr(model, "classes_", []))
+    if 1 not in classes:
+        return np.zeros(len(X), dtype=np.float64)
+    return model.predict_proba(X)[:, classes.index(1)]
+
+
+# --------------------------------------------------------------------------
+# 채점 서비스
+# --------------------------------------------------------------------------
+_NO_MODEL = ("", None)  # 모델 없음도 캐시 (매 배치마다 DB 조회하지 않도록)
+
+
+class DistractionScorer:
+    """
+    저장된 이벤트 묶음을 유저별 모델로 채점해 events.distraction_score에 기록하는 백그라운드 작업
+
+    - submit(user_id, docs): 인제스트 경로에서 호출. 응답을 기다리게 하지 않도록 태스크로 분리
+    - 유저 1명의 묶음 = 피처 행렬 1개 = predict_proba 1회 = bulk_write 1회
+    - 모델: ml_models의 유저 모델 -> 없으면 공용 모델(GLOBAL_MODEL_ID) -> 둘 다 없으면 채점 생략
+      유저 캐시에는 user_id -> (model_id, version) 포인터만, estimator는 (model_id, version)으로 따로 캐시
+      -> 공용 모델을 쓰는 유저가 많아도 모델 본문은 버전당 1번만 읽고 unpickle
+      포인터는 TTL이 지나면 메타데이터(모델 본문 제외)만 다시 읽어 재학습 반영
+    - 배치 첫 이벤트의 input_rate / app_switch는 세션별 직전 저장 이벤트를 문맥으로 같이 계산 (학습과 동일)
+    """
+
+    def __init__(self, enabled: bool, cache_size: int, cache_ttl: float, max_pending: int):
+        self.enabled = enabled
+        self.max_pending = max_pending
+        self._models: TTLCache[Tuple[str, Optional[str]]] = TTLCache(cache_size, cache_ttl)
+        self._estimators: TTLCache[Any] = TTLCache(cache_size, cache_ttl)
+        self._loading: Dict[Tuple[str, Optional[str]], asyncio.Task] = {}
+        self._pending: Set[asyncio.Task] = set()
+
+        # --- counters ---
+        self.scored_events = 0
+        self.scored_batches = 0
+        self.skipped_no_model = 0
+        self.dropped_batches = 0
+        self.failed_batches = 0
+        self.last_batch_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "DistractionScorer":
+        return cls(
+            # time-series 컬렉션은 이벤트 필드를 수정할 수 없어 점수를 기록할 수 없음
+            enabled=settings.DISTRACTION_SCORING_ENABLED and settings.EVENTS_STORAGE != "timeseries",
+            cache_size=settings.DISTRACTION_MODEL_CACHE_SIZE,
+            cache_ttl=settings.DISTRACTION_MODEL_CACHE_TTL_SECONDS,
+            max_pending=settings.DISTRACTION_SCORING_MAX_PENDING,
+        )
+
+    # ----------------------------------------------------------------------
+    # model cache
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _load(doc: Optional[Dict[str, Any]]) -> Optional[Any]:
+        if not doc or doc.get("feature_version") != FEATURE_VERSION or not doc.get("model"):
+            return None
+        return pickle.loads(doc["model"])
+
+    async def _resolve(self, user_id: str) -> Tuple[str, Optional[str]]:
+        """
+        user_id -> 채점에 쓸 (model_id, version) (메타데이터만 조회)
+        """
+        for model_id in (user_id, ml_models.GLOBAL_MODEL_ID):
+            meta = await ml_models.get_model_meta(model_id)
+            if meta and meta.get("feature_version") == FEATURE_VERSION:
+                return model_id, meta.get("version")
+        return _NO_MODEL
+
+    async def _fetch_estimator(self, key: Tuple[str, Optional[str]]) -> Optional[Any]:
+        doc = await ml_models.get_model_doc(key[0])
+        if doc and doc.get("version") != key[1]:
+            return None  # 포인터를 읽은 뒤 재학습됨 -> 다음 포인터 갱신 때 새 버전으로
+        estimator = await asyncio.to_thread(self._load, doc)
+        if estimator is not None:
+            self._estimators.put(key, estimator)
+        return estimator
+
+    async def _get_estimator(self, key: Tuple[str, Optional[str]]) -> Optional[Any]:
+        estimator = self._estimators.get(key)
+        if estimator is not None:
+            return estimator
+        # 같은 모델을 여러 유저 배치가 동시에 요청하면 읽기 / unpickle은 1번만
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_estimator(key))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await task
+
+    async def get_model(self, user_id: str) -> Tuple[str, Optional[str], Any]:
+        """
+        반환: (source, version, estimator) / 모델이 없으면 ("", None, None)
+        """
+        pointer = self._models.get(user_id)
+        if pointer is None:
+            pointer = await self._resolve(user_id)
+            self._models.put(user_id, pointer)
+
+        model_id, version = pointer
+        if not model_id:
+            return "", None, None
+        estimator = await self._get_estimator(pointer)
+        if estimator is None:
+            self._models.invalidate(user_id)
+            return "", None, None
+        return model_id, version, estimator
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """
+        재학습 직후 호출 (user_id=None이면 공용 모델이 바뀐 경우 -> 포인터 전체 비움)
+        estimator 캐시는 버전이 키라서 비우지 않아도 새 버전을 읽음 (예전 버전은 TTL / LRU로 빠짐)
+        """
+        if user_id is None:
+            self._models.clear()
+        else:
+            self._models.invalidate(user_id)
+
+    # ----------------------------------------------------------------------
+    # scoring
+    # ----------------------------------------------------------------------
+    async def score(self, user_id: str, docs: Sequence[Dict[str, Any]]) -> Optional[Tuple[np.ndarray, Optional[str]]]:
+        """
+        반환: (docs 순서대로 점수 배열, 모델 버전) / 모델이 없으면 None
+        """
+        _, version, estimator = await self.get_model(user_id)
+        if estimator is None:
+            return None
+
+        user = await users_crud.get_user_by_id(user_id, fields=["blocked_apps"])
+        blocked_apps = user.blocked_apps if user else []
+
+        # 세션별 직전 저장 이벤트 (배치 첫 이벤트의 input_rate / app_switch 계산용, 행렬에서는 잘라냄)
+        firsts: Dict[str, datetime] = {}
+        for doc in docs:
+            session_id, ts = doc.get("session_id"), doc.get("timestamp")
+            if session_id and isinstance(ts, datetime) and (session_id not in firsts or ts < firsts[session_id]):
+                firsts[session_id] = ts
+        context = await event_crud.get_previous_event_docs(user_id, firsts.items(), CONTEXT_BEFORE, FEATURE_FIELDS)
+
+        def run() -> np.ndarray:
+            X = build_feature_matrix([*context, *docs], blocked_apps)
+            return positive_proba(estimator, X[len(context):])
+
+        # 피처 계산 + predict는 CPU 작업 -> 이벤트 루프 밖에서
+        return await asyncio.to_thread(run), version
+
+    async def score_and_store(self, user_id: str, docs: Sequence[Dict[str, Any]]) -> int:
+        started = time.perf_counter()
+        result = await self.score(user_id, docs)
+        if result is None:
+            self.skipped_no_model += 1
+            return 0
+
+        scores, version = result
+        await event_crud.set_distraction_scores(
+            [d["_id"] for d in docs],
+            [round(float(s), 4) for s in scores],
+            version,
+        )
+        self.scored_batches += 1
+        self.scored_events += len(docs)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+        return len(docs)
+
+    def submit(self, user_id: str, docs: Sequence[Dict[str, Any]]) -> None:
+        if not self.enabled or not docs:
+            return
+        if len(self._pending) >= self.max_pending:
+            # 채점은 부가 정보 -> 밀리면 버리고 인제스트는 계속
+            self.dropped_batches += 1
+            return
+
+        task = asyncio.create_task(self._run(user_id, list(docs)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _run(self, user_id: str, docs: List[Dict[str, Any]]) -> None:
+        try:
+            await self.score_and_store(user_id, docs)
+        except Exception as e:
+            self.failed_batches += 1
+            print(f"Distraction scoring failed for {len(docs)} events: {e}")
+
+    async def stop(self) -> None:
+        """
+        대기 중인 채점 작업을 마저 끝냄 (DB 연결 종료 전에 호출)
+        """
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    # ----------------------------------------------------------------------
+    # stats
+    # ----------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        model_cache = self._models.stats()
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "scored_events": self.scored_events,
+            "scored_batches": self.scored_batches,
+            "skipped_no_model": self.skipped_no_model,
+            "dropped_batches": self.dropped_batches,
+            "failed_batches": self.failed_batches,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+            "model_cache_size": model_cache["size"],
+            "model_cache_hit_rate": model_cache["hit_rate"],
+            "estimator_cache_size": self._estimators.stats()["size"],
+        }
+
+
+distraction_scorer = DistractionScorer.from_settings()
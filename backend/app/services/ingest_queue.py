@@ -0,0 +1,311 @@
+# backend/app/services/ingest_queue.py
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+
+from app.core.config import settings
+from app.core.metrics import record_ingest
+from app.crud import analytics
+from app.crud import events as event_crud
+from app.crud import session_stats
+from app.services.distraction_scoring import distraction_scorer
+
+
+# 재시도 대기 시간 상한 (초)
+MAX_RETRY_BACKOFF = 5.0
+
+
+class IngestQueue:
+    """
+    HTTP 핸들러와 MongoDB 쓰기 사이의 인프로세스 이벤트 적재 큐
+
+    - 핸들러는 submit()으로 문서 묶음을 넣고 바로 202 응답 (DB 쓰기를 기다리지 않음)
+    - 큐가 가득 차면 enqueue_timeout 동안 대기(backpressure) 후 실패 -> 핸들러는 503
+    - writer 태스크들이 여러 유저의 묶음을 flush_size / flush_interval 기준으로 모아
+      unordered insert_many 1회로 저장 (write coalescing)
+    - 저장 실패(중복 제외)한 문서는 backoff를 두고 max_retries번 재시도, 그래도 실패하거나
+      종료 중이면 ingest_dead_letters 컬렉션에 보관 (202로 받은 이벤트를 조용히 버리지 않음)
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        workers: int,
+        flush_size: int,
+        flush_interval: float,
+        enqueue_timeout: float,
+        max_retries: int = 5,
+        retry_backoff: float = 0.2,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+        # --- counters ---
+        self.enqueued_events = 0
+        self.dropped_events = 0
+        self.flushed_events = 0
+        self.duplicate_events = 0
+        self.failed_events = 0
+        self.retried_events = 0
+        self.dead_letter_events = 0
+        self.lost_events = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "IngestQueue":
+        return cls(
+            maxsize=settings.INGEST_QUEUE_MAXSIZE,
+            workers=settings.INGEST_QUEUE_WORKERS,
+            flush_size=settings.INGEST_QUEUE_FLUSH_SIZE,
+            flush_interval=settings.INGEST_QUEUE_FLUSH_INTERVAL_MS / 1000,
+            enqueue_timeout=settings.INGEST_QUEUE_ENQUEUE_TIMEOUT_MS / 1000,
+            max_retries=settings.INGEST_QUEUE_MAX_RETRIES,
+            retry_backoff=settings.INGEST_QUEUE_RETRY_BACKOFF_MS / 1000,
+        )
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    # ----------------------------------------------------------------------
+    # lifecycle
+    # ----------------------------------------------------------------------
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._writer(i), name=f"ingest-writer-{i}")
+            for i in range(self.workers)
+        ]
+        print(f"Ingest queue started ({self.workers} writers, maxsize={self.maxsize})")
+
+    async def stop(self) -> None:
+        """
+        남은 묶음을 모두 저장(drain)한 뒤 writer 종료
+        종료 중에는 재시도 대기 없이 실패한 문서를 바로 dead letter로 보관
+        """
+        if not self.running:
+            return
+        self._stopping.set()
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print(f"Ingest queue stopped (flushed {self.flushed_events} events)")
+
+    # ----------------------------------------------------------------------
+    # producer
+    # ----------------------------------------------------------------------
+    async def submit(self, user_id: str, documents: List[Dict[str, Any]]) -> bool:
+        """
+        문서 묶음을 큐에 넣습니다. 큐가 enqueue_timeout 동안 계속 가득 차 있으면 False.
+        """
+        if not documents:
+            return True
+
+        try:
+            await asyncio.wait_for(self._queue.put((user_id, documents)), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.dropped_events += len(documents)
+            return False
+
+        self.enqueued_events += len(documents)
+        return True
+
+    # ----------------------------------------------------------------------
+    # consumer
+    # ----------------------------------------------------------------------
+    async def _collect(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        첫 묶음이 올 때까지 기다린 뒤, flush_size가 찰 때까지 또는 flush_interval이 지날 때까지 추가로 모음
+        """
+        items = [await self._queue.get()]
+        count = len(items[0][1])
+        deadline = time.monotonic() + self.flush_interval
+
+        while count < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            item = await self._get_within(remaining)
+            if item is None:
+                break
+            items.append(item)
+            count += len(item[1])
+
+        return items
+
+    async def _get_within(self, timeout: float) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        timeout 안에 꺼낸 묶음 1개 (없으면 None)
+        asyncio.wait_for(queue.get())는 Python 3.10에서 timeout과 get 완료가 겹치면 꺼낸 묶음을 버리므로
+        get을 별도 task로 기다리고, 끝나지 않았을 때만 취소 (취소된 get은 묶음을 큐에 그대로 남김)
+        """
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        getter = asyncio.ensure_future(self._queue.get())
+        try:
+            await asyncio.wait({getter}, timeout=timeout)
+        finally:
+            if not getter.done():
+                getter.cancel()
+        if not getter.done():
+            await asyncio.gather(getter, return_exceptions=True)
+        if getter.cancelled():
+            return None
+        return getter.result()
+
+    async def _insert(self, documents: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], str]:
+        """
+        insert_many 1회 -> (저장된 문서, 재시도할 문서, 실패 사유)
+        - 중복(재전송)은 저장된 것으로 봄 / 그 외 writeError 문서와 예외 시 전체를 재시도 대상으로
+        - 문서 _id는 큐에 넣을 때 정해지므로 일부가 이미 저장된 뒤 재시도해도 중복으로 걸러짐
+        """
+        started = time.perf_counter()
+        try:
+            inserted, duplicates, errors = await event_crud.insert_many_unordered(documents)
+        except Exception as e:
+            self.failed_events += len(documents)
+            record_ingest("queue", len(documents), 0, 0, len(documents))
+            return [], documents, f"{type(e).__name__}: {e}"
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.flushes += 1
+        self.flushed_events += len(inserted)
+        self.duplicate_events += duplicates
+        self.failed_events += len(errors)
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        record_ingest("queue", len(documents), len(inserted), duplicates, len(errors))
+
+        if not errors:
+            return inserted, [], ""
+        failed_ids = {err["op"]["_id"] for err in errors}
+        retry = [doc for doc in documents if doc["_id"] in failed_ids]
+        return inserted, retry, errors[0].get("errmsg", "write error")
+
+    async def _backoff(self, attempt: int) -> None:
+        """
+        재시도 대기 (종료가 시작되면 바로 깨어남)
+        """
+        delay = min(self.retry_backoff * (2 ** attempt), MAX_RETRY_BACKOFF)
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _dead_letter(self, documents: List[Dict[str, Any]], reason: str) -> None:
+        try:
+            self.dead_letter_events += await event_crud.save_dead_letters(documents, reason)
+            print(f"Ingest queue: {len(documents)} events moved to ingest_dead_letters ({reason})")
+        except Exception as e:
+            self.lost_events += len(documents)
+            ids = [doc["_id"] for doc in documents]
+            print(f"Ingest queue: LOST {len(documents)} events, dead letter write failed: {e} (ids={ids})")
+
+    async def _flush(self, items: List[Tuple[str, List[Dict[str, Any]]]]) -> None:
+        pending = [doc for _, docs in items for doc in docs]
+
+        attempt = 0
+        while True:
+            inserted, pending, reason = await self._insert(pending)
+            await self._after_insert(inserted)
+            if not pending:
+                return
+            if attempt >= self.max_retries or self._stopping.is_set():
+                break
+            self.retried_events += len(pending)
+            await self._backoff(attempt)
+            attempt += 1
+
+        await self._dead_letter(pending, reason)
+
+    async def _after_insert(self, inserted: List[Dict[str, Any]]) -> None:
+        # 세션 통계 / 닫힌 날 analytics 캐시 무효화는 유저별로 (저장에 성공한 문서만)
+        by_user: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for doc in inserted:
+            by_user[doc["user_id"]].append(doc)
+        try:
+            for user_id, docs in by_user.items():
+                await session_stats.apply_event_docs(user_id, docs)
+                await analytics.invalidate_for_events(user_id, docs)
+                distraction_scorer.submit(user_id, docs)
+        except Exception as e:
+            # 이벤트는 이미 저장됨 -> 통계 갱신 실패만 기록
+            print(f"Ingest queue: session stats rollup failed: {e}")
+
+    async def _writer(self, worker_id: int) -> None:
+        while True:
+            items = await self._collect()
+            try:
+                await self._flush(items)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Ingest writer {worker_id} flush failed: {e}")
+                await self._dead_letter([doc for _, docs in items for doc in docs], f"flush failed: {e}")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    # ----------------------------------------------------------------------
+    # stats
+    # ----------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "enqueued_events": self.enqueued_events,
+            "flushed_events": self.flushed_events,
+            "duplicate_events": self.duplicate_events,
+            "dropped_events": self.dropped_events,
+            "failed_events": self.failed_events,
+            "retried_events": self.retried_events,
+            "dead_letter_events": self.dead_letter_events,
+            "lost_events": self.lost_events,
+            "flushes": self.flushes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+        }
+
+
+ingest_queue = IngestQueue.from_settings()
+
+
+async def enqueue_or_reject(user_id: str, documents: List[Dict[str, Any]], response: Response) -> None:
+    """
+    적재 큐에 문서를 넣고 응답 코드를 202로 바꿉니다.
+    큐가 계속 가득 차 있으면(backpressure) 503 -> 에이전트는 로컬 캐시를 지우지 않고 다음 주기에 재시도
+    """
+    if not await ingest_queue.submit(user_id, documents):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingest queue is full",
+            headers={"Retry-After": "1"},
+        )
+    response.status_code = status.HTTP_202_ACCEPTED
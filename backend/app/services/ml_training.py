@@ -0,0 +1,415 @@
+# backend/app/services/ml_training.py
+
+import asyncio
+import multiprocessing
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.crud import admin_jobs
+from app.crud import events as event_crud
+from app.crud import ml_models
+from app.crud import users as users_crud
+from app.crud.events import get_events_collection
+from app.crud.feedback import get_feedback_collection
+from app.schemas.feedback import FeedbackTypeEnum
+from app.services.distraction_scoring import (
+    CONTEXT_BEFORE,
+    FEATURE_FIELDS,
+    FEATURE_VERSION,
+    build_feature_matrix,
+    distraction_scorer,
+)
+
+JOB_TYPE = "ml_retrain"
+
+# 피드백 -> 라벨 (distraction = 1)
+LABELS = {
+    FeedbackTypeEnum.IS_WORK.value: 0,
+    FeedbackTypeEnum.DISTRACTION_IGNORED.value: 1,
+}
+
+# 피드백 event_id가 저장된 이벤트가 아니면(에이전트는 피드백마다 임의의 "event-<uuid>"를 보냄)
+# 피드백 시각 이전 이 시간 안의 마지막 이벤트에 라벨을 붙임
+FEEDBACK_EVENT_WINDOW = timedelta(minutes=2)
+
+PROGRESS_FLUSH_SECONDS = 1.0
+
+# heartbeat가 이 횟수만큼 끊긴 작업은 owner 프로세스가 사라진 것으로 보고 failed 처리
+HEARTBEAT_STALE_FACTOR = 3
+
+
+# --------------------------------------------------------------------------
+# 학습 (프로세스 풀에서 실행: 모듈 최상위 함수 + 인자/반환값은 pickle 가능해야 함)
+# --------------------------------------------------------------------------
+def fit_distraction_model(X: np.ndarray, y: np.ndarray) -> Tuple[bytes, Dict[str, Any]]:
+    from sklearn.linear_model import LogisticRegression
+
+    model = LogisticRegression(max_iter=500, class_weight="balanced")
+    model.fit(X, y)
+    metrics = {
+        "train_accuracy": round(float(model.score(X, y)), 4),
+        "positives": int(y.sum()),
+        "negatives": int(len(y) - y.sum()),
+    }
+    return pickle.dumps(model), metrics
+
+
+# --------------------------------------------------------------------------
+# 학습 데이터 적재
+# --------------------------------------------------------------------------
+def _feedback_query(user_id: Optional[str]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"feedback_type": {"$in": list(LABELS)}}
+    if user_id is not None:
+        query["user_id"] = user_id
+    return query
+
+
+async def feedback_summary(user_id: Optional[str]) -> Dict[str, Any]:
+    """
+    재학습 필요 여부 판단용 (ml_models.trained_on과 비교): 라벨 수 + 마지막 피드백 시각
+    user_id=None이면 전체 유저 (공용 모델)
+    """
+    pipeline = [
+        {"$match": _feedback_query(user_id)},
+        {"$group": {"_id": None, "count": {"$sum": 1}, "last_at": {"$max": "$timestamp"}}},
+    ]
+    rows = await get_feedback_collection().aggregate(pipeline).to_list(length=1)
+    if not rows:
+        return {"feedback_count": 0, "last_feedback_at": None}
+    return {"feedback_count": rows[0]["count"], "last_feedback_at": rows[0]["last_at"]}
+
+
+async def _labels(user_id: Optional[str], limit: int) -> Dict[Tuple[str, str], Tuple[int, datetime]]:
+    """
+    최근 피드백부터 최대 limit건 -> {(user_id, event_id): (label, 피드백 시각)} (같은 event_id는 마지막 피드백만)
+    """
+    labels: Dict[Tuple[str, str], Tuple[int, datetime]] = {}
+    cursor = (
+        get_feedback_collection()
+        .find(_feedback_query(user_id), {"user_id": 1, "event_id": 1, "feedback_type": 1, "timestamp": 1})
+        .sort("timestamp", -1)
+        .limit(limit)
+    )
+    async for doc in cursor:
+        labels.setdefault((doc["user_id"], doc["event_id"]), (LABELS[doc["feedback_type"]], doc["timestamp"]))
+    return labels
+
+
+async def _resolve_labels(user_id: str, feedback: Dict[str, Tuple[int, datetime]]) -> Dict[str, int]:
+    """
+    {피드백 event_id: (label, 피드백 시각)} -> {라벨을 붙일 이벤트 _id: label}
+    - event_id가 저장된 이벤트 _id면 그 이벤트
+    - 아니면 피드백 시각 이전 FEEDBACK_EVENT_WINDOW 안의 마지막 이벤트 (없으면 버림)
+    여러 피드백이 같은 이벤트로 모이면 최근 피드백 라벨 (feedback은 최신순)
+    """
+    stored = {
+        doc["_id"]
+        async for doc in get_events_collection().find({"_id": {"$in": list(feedback)}, "user_id": user_id}, {"_id": 1})
+    }
+    nearest = await event_crud.get_event_ids_before(
+        user_id, {eid: ts for eid, (_, ts) in feedback.items() if eid not in stored}, FEEDBACK_EVENT_WINDOW
+    )
+
+    labels: Dict[str, int] = {}
+    for eid, (label, _) in feedback.items():
+        target = eid if eid in stored else nearest.get(eid)
+        if target is not None:
+            labels.setdefault(target, label)
+    return labels
+
+
+async def _user_samples(user_id: str, feedback: Dict[str, Tuple[int, datetime]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    유저 1명의 피드백 -> (X, y)
+    라벨 이벤트의 input_rate / app_switch는 같은 세션 직전 이벤트와의 차이
+    -> 채점과 같은 조회(get_previous_event_docs)로 라벨 이벤트마다 직전 이벤트(CONTEXT_BEFORE 이내)를 붙여
+       한 행렬로 계산한 뒤 라벨 행만 추림
+       (세션 안에서 시간순으로 정렬하면 각 라벨 이벤트 바로 앞은 항상 자기 직전 이벤트)
+    """
+    events = get_events_collection()
+    labels = await _resolve_labels(user_id, feedback)
+    if not labels:
+        return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int8)
+    labeled = await events.find(
+        {"_id": {"$in": list(labels)}, "user_id": user_id}, FEATURE_FIELDS
+    ).to_list(length=None)
+    if not labeled:
+        return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int8)
+
+    anchors = [
+        (d["session_id"], d["timestamp"])
+        for d in labeled
+        if d.get("session_id") and isinstance(d.get("timestamp"), datetime)
+    ]
+    context = await event_crud.get_previous_event_docs(user_id, anchors, CONTEXT_BEFORE, FEATURE_FIELDS)
+    # 연속된 라벨 이벤트는 서로의 직전 이벤트 -> 라벨 쪽에만 남김
+    label_ids = {d["_id"] for d in labeled}
+    docs = [*(d for d in context if d["_id"] not in label_ids), *labeled]
+
+    user = await users_crud.get_user_by_id(user_id, fields=["blocked_apps"])
+    X_all = await asyncio.to_thread(build_feature_matrix, docs, user.blocked_apps if user else [])
+
+    rows = [i for i, d in enumerate(docs) if d["_id"] in labels]
+    y = np.fromiter((labels[docs[i]["_id"]] for i in rows), dtype=np.int8, count=len(rows))
+    return X_all[rows], y
+
+
+async def load_training_set(user_id: Optional[str], max_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    user_id=None이면 전체 유저의 최근 라벨 (공용 모델)
+    """
+    by_user: Dict[str, Dict[str, Tuple[int, datetime]]] = {}
+    for (uid, event_id), labeled in (await _labels(user_id, max_samples)).items():
+        by_user.setdefault(uid, {})[event_id] = labeled
+
+    parts = [await _user_samples(uid, feedback) for uid, feedback in by_user.items()]
+    parts = [(X, y) for X, y in parts if len(y)]
+    if not parts:
+        return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int8)
+    return np.vstack([X for X, _ in parts]), np.concatenate([y for _, y in parts])
+
+
+# --------------------------------------------------------------------------
+# 작업 러너
+# --------------------------------------------------------------------------
+class MLTrainingRunner:
+    """
+    POST /admin/ml/train으로 시작되는 재학습 작업을 실행하는 백그라운드 서비스
+
+    - 작업 1건 = admin_job_logs 문서 1개 (pending -> running -> completed / failed)
+    - 대상: 요청의 user_id 1명, 없으면 피드백이 있는 전체 유저 + 공용 모델(GLOBAL_MODEL_ID)
+    - 유저별 증분 학습: 피드백 요약(수 / 마지막 시각)이 ml_models.trained_on과 같으면 건너뜀 (force_retrain이면 항상 학습)
+    - sklearn fit은 CPU 작업 -> ProcessPoolExecutor에서 실행 (이벤트 루프 / GIL을 막지 않음)
+    - 동시에 적재 + 학습하는 유저 수는 semaphore로 제한 (작업이 여러 개여도 공유)
+    - 진행 카운터는 최대 PROGRESS_FLUSH_SECONDS마다 admin_job_logs.progress에 기록
+    - 워커가 여러 개일 수 있으므로 실행 중 작업에 heartbeat를 남기고,
+      heartbeat가 끊긴 작업(종료 / 중단된 프로세스의 작업)만 주기적으로 failed 처리
+      같은 파라미터 작업 중복 실행도 heartbeat가 살아 있는 다른 워커의 작업까지 확인
+    """
+
+    def __init__(self, workers: int, concurrency: int, min_samples: int, max_samples: int, heartbeat_seconds: float):
+        self.workers = workers
+        self.concurrency = concurrency
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after = timedelta(seconds=heartbeat_seconds * HEARTBEAT_STALE_FACTOR)
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._submit_lock = asyncio.Lock()  # 중복 확인 -> 작업 생성 사이에 같은 요청이 끼어들지 않게
+        self._jobs: Set[asyncio.Task] = set()
+        self._active: Dict[Tuple[Optional[str], bool], str] = {}  # 같은 파라미터로 실행 중인 작업
+
+        # --- counters ---
+        self.jobs_started = 0
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.models_trained = 0
+        self.users_skipped = 0
+        self.interrupted_jobs = 0
+        self.last_fit_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "MLTrainingRunner":
+        return cls(
+            workers=settings.ML_TRAINING_WORKERS,
+            concurrency=settings.ML_TRAINING_CONCURRENCY,
+            min_samples=settings.ML_TRAINING_MIN_SAMPLES,
+            max_samples=settings.ML_TRAINING_MAX_SAMPLES,
+            heartbeat_seconds=settings.ML_TRAINING_HEARTBEAT_SECONDS,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    # ----------------------------------------------------------------------
+    # lifecycle
+    # ----------------------------------------------------------------------
+    async def start(self) -> None:
+        if self.running:
+            return
+        interrupted = await self._fail_interrupted()
+        # fork는 부모의 스레드(Motor / 채점 to_thread) 상태를 복사하므로 spawn 사용
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop(), name="ml-train-heartbeat")
+        print(
+            f"ML training runner started ({self.workers} workers, concurrency {self.concurrency}"
+            f"{f', marked {interrupted} interrupted jobs failed' if interrupted else ''})"
+        )
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._heartbeat.cancel()
+        await asyncio.gather(self._heartbeat, return_exceptions=True)
+        self._heartbeat = None
+        for task in list(self._jobs):
+            task.cancel()
+        if self._jobs:
+            await asyncio.gather(*list(self._jobs), return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        print(f"ML training runner stopped (trained {self.models_trained} models)")
+
+    async def _fail_interrupted(self) -> int:
+        interrupted = await admin_jobs.fail_interrupted_jobs(JOB_TYPE, self.stale_after)
+        self.interrupted_jobs += interrupted
+        return interrupted
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                if self._active:
+                    await admin_jobs.heartbeat_jobs(list(self._active.values()))
+                interrupted = await self._fail_interrupted()
+                if interrupted:
+                    print(f"ML training: marked {interrupted} interrupted jobs failed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ML training heartbeat failed: {e}")
+
+    # ----------------------------------------------------------------------
+    # jobs
+    # ----------------------------------------------------------------------
+    async def submit(self, user_id: Optional[str], force_retrain: bool, triggered_by: str = "manual") -> Tuple[str, bool]:
+        """
+        반환: (job_id, 새로 시작했는지) / 같은 파라미터 작업이 실행 중이면 그 작업 id
+        """
+        key = (user_id, force_retrain)
+        async with self._submit_lock:
+            if key in self._active:
+                return self._active[key], False
+
+            parameters = {"user_id": user_id, "force_retrain": force_retrain}
+            running = await admin_jobs.find_active_job(JOB_TYPE, parameters, self.stale_after)
+            if running is not None:
+                return running, False
+
+            job_id = await admin_jobs.create_job(JOB_TYPE, triggered_by, parameters)
+            self._active[key] = job_id
+
+        task = asyncio.create_task(self._run_job(job_id, user_id, force_retrain), name=f"ml-train-{job_id}")
+        self._jobs.add(task)
+        task.add_done_callback(self._jobs.discard)
+        task.add_done_callback(lambda _: self._active.pop(key, None))
+        self.jobs_started += 1
+        return job_id, True
+
+    async def _run_job(self, job_id: str, user_id: Optional[str], force: bool) -> None:
+        progress: Dict[str, Any] = {"total": 0, "done": 0, "trained": 0, "skipped": 0, "failed": 0}
+        models: Dict[str, Any] = {}
+        try:
+            await admin_jobs.update_job(job_id, status="running")
+            if user_id is not None:
+                targets: List[Optional[str]] = [user_id]
+            else:
+                targets = [*sorted(await get_feedback_collection().distinct("user_id")), None]
+            progress["total"] = len(targets)
+
+            last_flush = time.monotonic()
+
+            async def run_target(target: Optional[str]) -> None:
+                nonlocal last_flush
+                model_id = target if target is not None else ml_models.GLOBAL_MODEL_ID
+                async with self._semaphore:
+                    try:
+                        outcome = await self._train(job_id, target, force)
+                    except Exception as e:
+                        outcome = {"status": "failed", "error": str(e)}
+                        print(f"ML training failed for {model_id}: {e}")
+
+                models[model_id] = outcome
+                if outcome["status"] == "skipped":
+                    self.users_skipped += 1
+                progress["done"] += 1
+                progress[outcome["status"]] += 1
+                if time.monotonic() - last_flush >= PROGRESS_FLUSH_SECONDS:
+                    last_flush = time.monotonic()
+                    await admin_jobs.update_job(job_id, progress=dict(progress))
+
+            # 공용 모델(None)은 유저 모델과 같이 semaphore로 제한
+            await asyncio.gather(*(run_target(t) for t in targets))
+
+            await admin_jobs.finish_job(job_id, "completed", progress=progress, result={"models": models})
+            self.jobs_completed += 1
+        except asyncio.CancelledError:
+            await admin_jobs.finish_job(
+                job_id, "failed", progress=progress, result={"models": models}, error_message="cancelled (server shutdown)"
+            )
+            self.jobs_failed += 1
+            raise
+        except Exception as e:
+            await admin_jobs.finish_job(job_id, "failed", progress=progress, result={"models": models}, error_message=str(e))
+            self.jobs_failed += 1
+            print(f"ML training job {job_id} failed: {e}")
+
+    async def _train(self, job_id: str, user_id: Optional[str], force: bool) -> Dict[str, Any]:
+        """
+        유저 1명(또는 공용 모델) 재학습. 반환: admin_job_logs.result.models[model_id]
+        """
+        model_id = user_id if user_id is not None else ml_models.GLOBAL_MODEL_ID
+        trained_on = await feedback_summary(user_id)
+
+        if not force:
+            meta = await ml_models.get_model_meta(model_id)
+            if meta and meta.get("feature_version") == FEATURE_VERSION and meta.get("trained_on") == trained_on:
+                return {"status": "skipped", "reason": "unchanged"}
+
+        if trained_on["feedback_count"] < self.min_samples:
+            return {"status": "skipped", "reason": "insufficient_feedback", "n_samples": trained_on["feedback_count"]}
+
+        X, y = await load_training_set(user_id, self.max_samples)
+        if len(y) < self.min_samples or len(np.unique(y)) < 2:
+            return {"status": "skipped", "reason": "insufficient_samples", "n_samples": int(len(y))}
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        model_bytes, metrics = await loop.run_in_executor(self._executor, fit_distraction_model, X, y)
+        self.last_fit_ms = (time.perf_counter() - started) * 1000
+
+        await ml_models.save_model_doc(
+            model_id,
+            model_bytes,
+            feature_version=FEATURE_VERSION,
+            version=job_id,
+            n_samples=int(len(y)),
+            metrics=metrics,
+            trained_on=trained_on,
+        )
+        # 공용 모델이 바뀌면 공용 모델로 채점하던 유저 캐시도 모두 비워야 함
+        distraction_scorer.invalidate(user_id)
+        self.models_trained += 1
+        return {"status": "trained", "n_samples": int(len(y)), "fit_ms": round(self.last_fit_ms, 1), **metrics}
+
+    # ----------------------------------------------------------------------
+    # stats
+    # ----------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "active_jobs": len(self._jobs),
+            "jobs_started": self.jobs_started,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "models_trained": self.models_trained,
+            "users_skipped": self.users_skipped,
+            "interrupted_jobs": self.interrupted_jobs,
+            "last_fit_ms": round(self.last_fit_ms, 3),
+        }
+
+
+ml_training_runner = MLTrainingRunner.from_settings()
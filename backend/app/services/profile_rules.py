@@ -0,0 +1,94 @@
+# backend/app/services/profile_rules.py
+
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import HTTPException
+
+SLICE_MINUTES = 5
+
+# 세션 시작부터 최대 24시간 (288 구간) -> 컴파일된 테이블 크기 상한
+MAX_SLICES = 24 * 60 // SLICE_MINUTES
+
+# 컴파일 결과 구조가 바뀌면 올림 (버전 해시에 포함 -> 에이전트가 새로 받음)
+COMPILED_FORMAT = 1
+
+
+# --------------------------------------------------------------------------
+# time_slices 컴파일 (프로필 저장 시점에 계산해 문서에 같이 저장)
+# - 입력: [{slice_index, rules: {key: value}}, ...] (순서 / 누락 구간 자유)
+# - 출력: 규칙 키별 dense 배열 (columns[key][slice_index] = 값, 규칙이 없는 구간은 None)
+#   에이전트는 slice_index = 경과 분 // SLICE_MINUTES 로 바로 조회
+#   (n_slices 이상이면 마지막 구간 규칙을 계속 사용)
+# --------------------------------------------------------------------------
+def compile_time_slices(time_slices: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    by_index: Dict[int, Dict[str, Any]] = {}
+    for item in time_slices:
+        index = item["slice_index"]
+        if index < 0 or index >= MAX_SLICES:
+            raise HTTPException(status_code=400, detail=f"slice_index must be in [0, {MAX_SLICES})")
+        if index in by_index:
+            raise HTTPException(status_code=400, detail=f"Duplicate slice_index: {index}")
+        by_index[index] = item.get("rules") or {}
+
+    n_slices = max(by_index) + 1 if by_index else 0
+    keys = sorted({key for rules in by_index.values() for key in rules})
+
+    columns: Dict[str, List[Any]] = {key: [None] * n_slices for key in keys}
+    for index, rules in by_index.items():
+        for key, value in rules.items():
+            columns[key][index] = value
+
+    return {
+        "format": COMPILED_FORMAT,
+        "slice_minutes": SLICE_MINUTES,
+        "n_slices": n_slices,
+        "columns": columns,
+    }
+
+
+def rules_at(compiled: Dict[str, Any], slice_index: int) -> Dict[str, Any]:
+    """
+    컴파일된 테이블에서 slice_index 구간의 규칙 (에이전트 조회 방식과 동일, 디버깅/서버 측 평가용)
+    """
+    n_slices = compiled["n_slices"]
+    if n_slices == 0:
+        return {}
+    index = min(max(slice_index, 0), n_slices - 1)
+    return {
+        key: column[index]
+        for key, column in compiled["columns"].items()
+        if column[index] is not None
+    }
+
+
+def profile_payload(doc: Dict[str, Any], compiled: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    에이전트에 내려주는 압축 payload (version 제외 본문)
+    """
+    return {
+        "profile_id": str(doc["_id"]),
+        "profile_name": doc.get("profile_name"),
+        "model_type": doc.get("model_type"),
+        "thresholds": doc.get("custom_thresholds") or {},
+        **(compiled if compiled is not None else doc["compiled"]),
+    }
+
+
+def content_version(payload: Dict[str, Any]) -> str:
+    """
+    payload 내용 해시 (키 정렬 JSON의 sha256 앞 16자) -> ETag 값
+    내용이 같으면 프로세스/서버가 달라도 같은 값
+    """
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def compile_profile(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    프로필 문서 -> 문서에 같이 저장할 {"compiled", "version"}
+    """
+    compiled = compile_time_slices(doc.get("time_slices") or [])
+    return {"compiled": compiled, "version": content_version(profile_payload(doc, compiled))}
+
@@ -0,0 +1,327 @@
+# backend/app/services/schedule_engine.py
+
+from bisect import bisect_right
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import HTTPException
+from pymongo import ASCENDING
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+# --------------------------------------------------------------------------
+# 시각 <-> 정수 변환 (스케줄 저장 시점에 계산해 문서에 같이 저장)
+# - start_sec / end_sec: 하루 중 초 (0 ~ 86399)
+# - week_intervals: [[시작 분, 끝 분), ...] 주 단위 분 (월요일 00:00 = 0, days_of_week 0=월 ~ 6=일)
+# --------------------------------------------------------------------------
+def time_to_seconds(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def seconds_to_time(seconds: int) -> time:
+    return time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+
+def parse_hms(value: str) -> int:
+    """
+    예전 문서의 "HH:MM:SS" 문자열 -> 하루 중 초
+    """
+    hours, minutes, seconds = (int(part) for part in value.split(":"))
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def week_intervals(days_of_week: Iterable[int], start_sec: int, end_sec: int) -> List[List[int]]:
+    """
+    요일 + 시작/종료 시각 -> 정렬된 주 단위 분 구간 리스트
+    - end <= start 이면 자정을 넘기는 스케줄 (예: 23:00 ~ 01:00)
+    - start == end 이면 빈 구간
+    - 일요일 밤 -> 월요일 새벽처럼 주 경계를 넘으면 두 구간으로 나눔
+    """
+    start_min = start_sec // 60
+    end_min = end_sec // 60
+    if start_min == end_min:
+        return []
+
+    length = (end_min - start_min) % MINUTES_PER_DAY
+    intervals = []
+    for day in sorted(set(days_of_week)):
+        begin = day * MINUTES_PER_DAY + start_min
+        end = begin + length
+        if end <= MINUTES_PER_WEEK:
+            intervals.append([begin, end])
+        else:
+            intervals.append([begin, MINUTES_PER_WEEK])
+            intervals.append([0, end - MINUTES_PER_WEEK])
+    intervals.sort()
+    return intervals
+
+
+def compile_schedule_fields(days_of_week: Iterable[int], start: time, end: time) -> Dict[str, Any]:
+    """
+    schedules 문서에 같이 저장할 정수 필드
+    """
+    start_sec = time_to_seconds(start)
+    end_sec = time_to_seconds(end)
+    return {
+        "start_sec": start_sec,
+        "end_sec": end_sec,
+        "week_intervals": week_intervals(days_of_week, start_sec, end_sec),
+    }
+
+
+def _doc_intervals(doc: Dict[str, Any]) -> List[List[int]]:
+    """
+    정수 필드가 없는 예전 문서는 문자열을 한 번 파싱해 계산
+    """
+    if "week_intervals" in doc:
+        return doc["week_intervals"]
+    if not doc.get("start_time") or not doc.get("end_time"):
+        return []
+    return week_intervals(
+        doc.get("days_of_week", []), parse_hms(doc["start_time"]), parse_hms(doc["end_time"])
+    )
+
+
+def zone_for(tz: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid tz")
+
+
+def minute_of_week(moment: datetime, zone: ZoneInfo) -> int:
+    local = moment.astimezone(zone)
+    return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+
+# --------------------------------------------------------------------------
+# 유저 1명의 주간 인덱스
+# --------------------------------------------------------------------------
+class UserScheduleIndex:
+    """
+    한 유저의 활성 스케줄 구간들을 경계(breakpoint) 기준 구간으로 펼친 인덱스
+
+    breakpoints[i] <= 분 < breakpoints[i + 1] 동안 활성 스케줄 집합 = active[i]
+    -> 지금 활성 / 다음 전환 시각 모두 bisect 1회 (O(log n))
+    """
+
+    def __init__(self, docs: Iterable[Dict[str, Any]]):
+        edges: Dict[int, List[Tuple[int, str]]] = {}
+        for doc in docs:
+            schedule_id = str(doc["_id"])
+            for begin, end in _doc_intervals(doc):
+                edges.setdefault(begin, []).append((1, schedule_id))
+                edges.setdefault(end, []).append((-1, schedule_id))
+
+        self.breakpoints: List[int] = [0]
+        self.active: List[frozenset] = []
+
+        current: Dict[str, int] = {}
+        for minute in sorted(edges):
+            # 주 끝(10080)은 다음 주 0분과 같은 지점 -> 마지막 구간을 닫기만 하고 경계로 두지 않음
+            if minute >= MINUTES_PER_WEEK:
+                break
+            if minute != self.breakpoints[-1]:
+                self.active.append(frozenset(current))
+                self.breakpoints.append(minute)
+            for delta, schedule_id in edges[minute]:
+                count = current.get(schedule_id, 0) + delta
+                if count:
+                    current[schedule_id] = count
+                else:
+                    current.pop(schedule_id, None)
+        self.active.append(frozenset(current))
+
+    def _segment(self, minute: int) -> int:
+        return bisect_right(self.breakpoints, minute % MINUTES_PER_WEEK) - 1
+
+    def active_at(self, minute: int) -> frozenset:
+        return self.active[self._segment(minute)]
+
+    def next_transition(self, minute: int) -> Optional[Tuple[int, frozenset, frozenset]]:
+        """
+        minute 이후 처음으로 활성 집합이 바뀌는 시점
+        반환: (몇 분 뒤, 시작하는 스케줄들, 끝나는 스케줄들) / 전환이 없으면 None
+        """
+        minute %= MINUTES_PER_WEEK
+        idx = self._segment(minute)
+        current = self.active[idx]
+
+        # 주 끝을 넘어가면 처음 구간과 이어 붙여 확인 (최대 한 바퀴)
+        for step in range(1, len(self.breakpoints) + 1):
+            nxt = (idx + step) % len(self.breakpoints)
+            nxt_active = self.active[nxt]
+            if nxt_active != current:
+                at = self.breakpoints[nxt]
+                delta = (at - minute) % MINUTES_PER_WEEK or MINUTES_PER_WEEK
+                return delta, nxt_active - current, current - nxt_active
+        return None
+
+
+# --------------------------------------------------------------------------
+# 전체 유저 엔진
+# --------------------------------------------------------------------------
+class ScheduleEngine:
+    """
+    유저별 UserScheduleIndex 캐시 (core/cache.TTLCache: LRU + TTL)
+    - 스케줄 생성/수정/삭제 시 crud에서 invalidate(user_id) -> 이 프로세스는 다음 조회 때 바로 다시 컴파일
+    - 다른 워커 프로세스의 수정은 ttl(SCHEDULE_ENGINE_REFRESH_SECONDS) 안에 반영
+    - maxsize(SCHEDULE_ENGINE_CACHE_SIZE)를 넘으면 오래 안 쓴 유저부터 제거
+    - 전체 유저 조회(active_now / starting_within)는 캐시를 쓰지 않고
+      {is_active, user_id} 인덱스 순서로 스케줄을 읽으며 유저 batch_size명씩 컴파일 (메모리 상한)
+    - 유저 시간대: users.settings.timezone (없으면 UTC)
+    """
+
+    def __init__(self, maxsize: int, ttl: float, bulk_batch_size: int):
+        self._indexes: TTLCache[UserScheduleIndex] = TTLCache(maxsize, ttl)
+        self.bulk_batch_size = bulk_batch_size
+
+    def invalidate(self, user_id: Optional[str]) -> None:
+        if user_id is not None:
+            self._indexes.invalidate(user_id)
+
+    async def _load_user(self, user_id: str) -> UserScheduleIndex:
+        from app.crud.schedules import get_schedules_collection
+
+        docs = get_schedules_collection().find(
+            {"user_id": user_id, "is_active": True},
+            {"_id": 1, "week_intervals": 1, "start_time": 1, "end_time": 1, "days_of_week": 1},
+        )
+        index = UserScheduleIndex([doc async for doc in docs])
+        self._indexes.put(user_id, index)
+        return index
+
+    async def get_index(self, user_id: str) -> UserScheduleIndex:
+        index = self._indexes.get(user_id)
+        if index is None:
+            index = await self._load_user(user_id)
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        return self._indexes.stats()
+
+    async def status(self, user_id: str, zone: ZoneInfo, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        지금 활성인 스케줄 id들과 다음 전환 시각
+        """
+        now = now or datetime.now(timezone.utc)
+        index = await self.get_index(user_id)
+        minute = minute_of_week(now, zone)
+
+        result: Dict[str, Any] = {
+            "at": now,
+            "active_schedule_ids": sorted(index.active_at(minute)),
+            "next_transition_at": None,
+            "starting_schedule_ids": [],
+            "ending_schedule_ids": [],
+        }
+        transition = index.next_transition(minute)
+        if transition:
+            delta, starting, ending = transition
+            boundary = now.replace(second=0, microsecond=0) + timedelta(minutes=delta)
+            result["next_transition_at"] = boundary
+            result["starting_schedule_ids"] = sorted(starting)
+            result["ending_schedule_ids"] = sorted(ending)
+        return result
+
+    # ----------------------------------------------------------------------
+    # 전체 유저 (세션 자동 시작 / 알림용)
+    # ----------------------------------------------------------------------
+    @staticmethod
+    async def _load_zones(user_ids: List[str]) -> Dict[str, ZoneInfo]:
+        from bson import ObjectId
+
+        from app.crud.users import get_users_collection
+
+        ids: List[Any] = list(user_ids)
+        ids += [ObjectId(u) for u in user_ids if ObjectId.is_valid(u)]
+
+        zones: Dict[str, ZoneInfo] = {}
+        async for user in get_users_collection().find({"_id": {"$in": ids}}, {"settings.timezone": 1}):
+            tz = (user.get("settings") or {}).get("timezone")
+            if tz:
+                try:
+                    zones[str(user["_id"])] = ZoneInfo(tz)
+                except (ZoneInfoNotFoundError, ValueError):
+                    pass
+        return zones
+
+    async def _iter_user_indexes(self) -> AsyncIterator[Tuple[str, UserScheduleIndex, ZoneInfo]]:
+        """
+        활성 스케줄을 user_id 순서로 한 번 훑으며 (user_id, 인덱스, 시간대)를 차례로 반환
+        - {is_active, user_id} 인덱스를 타므로 정렬 단계 없이 유저별 문서가 연속으로 옴
+        - 유저 bulk_batch_size명을 모을 때마다 시간대를 $in 1회로 읽고 내보냄
+        """
+        from app.crud.schedules import get_schedules_collection
+
+        cursor = get_schedules_collection().find(
+            {"is_active": True},
+            {"_id": 1, "user_id": 1, "week_intervals": 1, "start_time": 1, "end_time": 1, "days_of_week": 1},
+        ).sort([("is_active", ASCENDING), ("user_id", ASCENDING)])
+
+        batch: List[Tuple[str, UserScheduleIndex]] = []
+        user_id: Optional[str] = None
+        docs: List[Dict[str, Any]] = []
+
+        async def flush() -> AsyncIterator[Tuple[str, UserScheduleIndex, ZoneInfo]]:
+            zones = await self._load_zones([uid for uid, _ in batch])
+            for uid, index in batch:
+                yield uid, index, zones.get(uid, timezone.utc)
+            batch.clear()
+
+        async for doc in cursor:
+            if doc.get("user_id") != user_id:
+                if docs:
+                    batch.append((user_id, UserScheduleIndex(docs)))
+                user_id, docs = doc.get("user_id"), []
+                if len(batch) >= self.bulk_batch_size:
+                    async for item in flush():
+                        yield item
+            docs.append(doc)
+        if docs:
+            batch.append((user_id, UserScheduleIndex(docs)))
+        if batch:
+            async for item in flush():
+                yield item
+
+    async def active_now(self, now: Optional[datetime] = None) -> AsyncIterator[Tuple[str, List[str]]]:
+        """
+        (user_id, [지금 활성인 schedule_id, ...]) (활성 스케줄이 있는 유저만, user_id 순)
+        """
+        now = now or datetime.now(timezone.utc)
+        async for user_id, index, zone in self._iter_user_indexes():
+            active = index.active_at(minute_of_week(now, zone))
+            if active:
+                yield user_id, sorted(active)
+
+    async def starting_within(
+        self, minutes: int = 1, now: Optional[datetime] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        앞으로 minutes분 안에 시작하는 스케줄 {user_id, schedule_ids, starts_at} (user_id 순)
+        """
+        now = now or datetime.now(timezone.utc)
+        async for user_id, index, zone in self._iter_user_indexes():
+            transition = index.next_transition(minute_of_week(now, zone))
+            if not transition:
+                continue
+            delta, starting, _ = transition
+            if starting and delta <= minutes:
+                yield {
+                    "user_id": user_id,
+                    "schedule_ids": sorted(starting),
+                    "starts_at": now.replace(second=0, microsecond=0) + timedelta(minutes=delta),
+                }
+
+
+schedule_engine = ScheduleEngine(
+    maxsize=settings.SCHEDULE_ENGINE_CACHE_SIZE,
+    ttl=settings.SCHEDULE_ENGINE_REFRESH_SECONDS,
+    bulk_batch_size=settings.SCHEDULE_ENGINE_BULK_BATCH_SIZE,
+)
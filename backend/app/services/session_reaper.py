@@ -0,0 +1,260 @@
+# backend/app/services/session_reaper.py
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, UpdateOne
+
+from app.core.config import settings
+from app.crud.events import get_events_collection
+from app.crud.sessions import get_sessions_collection
+
+ABANDONED_STATUS = "abandoned"
+
+
+def _as_naive_utc(ts: datetime) -> datetime:
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class SessionReaper:
+    """
+    에이전트가 비정상 종료해서 끝나지 않은 active 세션을 주기적으로 닫는 백그라운드 태스크
+
+    - 후보: status="active" 이고 start_time이 기준 시각(cutoff)보다 이전인 세션
+      (index: status, start_time, _id / 시작한 지 abandon_after가 안 지난 세션은 볼 필요 없음)
+    - 마지막 활동 = 세션 시간 구간 안에서 그 유저의 마지막 이벤트 timestamp
+      구간 = [start_time, 같은 유저의 다음 세션 start_time 또는 지금)
+      (에이전트 이벤트의 session_id는 local-/auto- 값이라 서버 세션 _id로 찾을 수 없음 / index: user_id, timestamp)
+    - 후보 batch마다 aggregate 2회: sessions $group으로 구간 끝, events $group으로 구간별 마지막 이벤트
+      (후보마다 find_one 2회 하던 것을 batch 단위로 묶음)
+    - 마지막 활동이 cutoff 이전이면 end_time = 마지막 활동, duration = 마지막 활동 - start_time 으로
+      bulk_write 1회에 종료 (필터에 status="active"를 다시 걸어 그 사이 정상 종료된 세션은 건드리지 않음)
+    - 구간 안에 이벤트가 하나도 없으면 시작 후 abandon_after 동안 활동이 없었던 것이므로
+      end_time = start_time, duration = 0 으로 종료 (last_empty)
+    """
+
+    def __init__(self, interval: float, abandon_after: timedelta, batch_size: int):
+        self.interval = interval
+        self.abandon_after = abandon_after
+        self.batch_size = batch_size
+
+        self._task: Optional[asyncio.Task] = None
+
+        # --- counters ---
+        self.cycles = 0
+        self.reaped_sessions = 0
+        self.last_reaped = 0
+        self.last_empty = 0
+        self.last_cycle_ms = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "SessionReaper":
+        return cls(
+            interval=settings.SESSION_REAPER_INTERVAL_SECONDS,
+            abandon_after=timedelta(minutes=settings.SESSION_ABANDON_AFTER_MINUTES),
+            batch_size=settings.SESSION_REAPER_BATCH_SIZE,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    # ----------------------------------------------------------------------
+    # lifecycle
+    # ----------------------------------------------------------------------
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._loop(), name="session-reaper")
+        print(f"Session reaper started (every {self.interval}s, abandon after {self.abandon_after})")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        print(f"Session reaper stopped (reaped {self.reaped_sessions} sessions)")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Session reaper cycle failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ----------------------------------------------------------------------
+    # reap
+    # ----------------------------------------------------------------------
+    async def _find_candidates(
+        self, cutoff: datetime, after: Optional[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        query: Dict[str, Any] = {"status": "active", "start_time": {"$lt": cutoff}}
+        if after is not None:
+            # 이번 주기에서 이미 본 세션 이후부터 (start_time, _id) 오름차순 keyset
+            query["$or"] = [
+                {"start_time": {"$gt": after["start_time"]}},
+                {"start_time": after["start_time"], "_id": {"$gt": after["_id"]}},
+            ]
+
+        cursor = (
+            get_sessions_collection()
+            .find(query, {"_id": 1, "user_id": 1, "start_time": 1})
+            .sort([("start_time", ASCENDING), ("_id", ASCENDING)])
+            .limit(self.batch_size)
+        )
+        return await cursor.to_list(length=self.batch_size)
+
+    @staticmethod
+    def _in_window(session: Dict[str, Any], field: str, window_end: Any = None) -> Dict[str, Any]:
+        """
+        aggregate 식: 문서가 이 세션 유저의 것이고 field가 start_time 이후(window_end가 있으면 그 전)인지
+        """
+        conditions = [
+            {"$eq": ["$user_id", session["user_id"]]},
+            {"$gt" if window_end is None else "$gte": [f"${field}", session["start_time"]]},
+        ]
+        if window_end is not None:
+            conditions.append({"$lt": [f"${field}", window_end]})
+        return {"$and": conditions}
+
+    async def _window_ends(self, sessions: List[Dict[str, Any]], now: datetime) -> List[datetime]:
+        """
+        후보마다 구간 끝 (같은 유저의 다음 세션 start_time, 없으면 now) / aggregate 1회
+        """
+        pipeline = [
+            {
+                "$match": {
+                    "user_id": {"$in": sorted({s["user_id"] for s in sessions})},
+                    "start_time": {"$gt": min(s["start_time"] for s in sessions)},
+                }
+            },
+            {
+                "$group": {
+                    "_id": None,
+                    **{
+                        f"s{i}": {"$min": {"$cond": [self._in_window(s, "start_time"), "$start_time", None]}}
+                        for i, s in enumerate(sessions)
+                    },
+                }
+            },
+        ]
+        rows = await get_sessions_collection().aggregate(pipeline).to_list(length=1)
+        row = rows[0] if rows else {}
+        return [row.get(f"s{i}") or now for i in range(len(sessions))]
+
+    async def _last_activities(self, sessions: List[Dict[str, Any]], now: datetime) -> List[Optional[datetime]]:
+        """
+        후보마다 구간 [start_time, 구간 끝) 안의 마지막 이벤트 시각 (없으면 None) / aggregate 1회
+        같은 유저의 구간끼리는 겹치지 않으므로 이벤트 1개는 최대 1개 구간($switch 분기)에 속함
+        """
+        window_ends = await self._window_ends(sessions, now)
+        pipeline = [
+            {
+                "$match": {
+                    "$or": [
+                        {"user_id": s["user_id"], "timestamp": {"$gte": s["start_time"], "$lt": end}}
+                        for s, end in zip(sessions, window_ends)
+                    ]
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        "$switch": {
+                            "branches": [
+                                {"case": self._in_window(s, "timestamp", end), "then": i}
+                                for i, (s, end) in enumerate(zip(sessions, window_ends))
+                            ],
+                            "default": None,
+                        }
+                    },
+                    "last": {"$max": "$timestamp"},
+                }
+            },
+        ]
+        last: Dict[Any, datetime] = {}
+        async for row in get_events_collection().aggregate(pipeline):
+            last[row["_id"]] = row["last"]
+        return [_as_naive_utc(last[i]) if i in last else None for i in range(len(sessions))]
+
+    async def _reap_batch(self, sessions: List[Dict[str, Any]], cutoff: datetime, now: datetime) -> int:
+        activities = await self._last_activities(sessions, now)
+
+        operations = []
+        for session, last_event in zip(sessions, activities):
+            start_time = _as_naive_utc(session["start_time"])
+            if last_event is None:
+                self.last_empty += 1  # 시작 후 이벤트 없이 abandon_after가 지남 -> 길이 0으로 종료
+            last_activity = max(start_time, last_event or start_time)
+            if last_activity >= cutoff:
+                continue  # 최근까지 이벤트가 들어온 진행 중 세션
+
+            operations.append(
+                UpdateOne(
+                    {"_id": session["_id"], "status": "active"},
+                    {
+                        "$set": {
+                            "status": ABANDONED_STATUS,
+                            "end_time": last_activity,
+                            "duration": (last_activity - start_time).total_seconds(),
+                        }
+                    },
+                )
+            )
+
+        if not operations:
+            return 0
+        result = await get_sessions_collection().bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        한 주기 실행. 반환: 이번 주기에 종료한 세션 수
+        """
+        started = time.perf_counter()
+        now = now or datetime.now(timezone.utc)
+        cutoff = _as_naive_utc(now - self.abandon_after)
+
+        reaped = 0
+        self.last_empty = 0
+        after = None
+        while True:
+            sessions = await self._find_candidates(cutoff, after)
+            if not sessions:
+                break
+            reaped += await self._reap_batch(sessions, cutoff, now)
+            if len(sessions) < self.batch_size:
+                break
+            after = sessions[-1]
+
+        self.cycles += 1
+        self.last_reaped = reaped
+        self.reaped_sessions += reaped
+        self.last_cycle_ms = (time.perf_counter() - started) * 1000
+        if reaped:
+            print(f"Session reaper: closed {reaped} abandoned sessions ({self.last_cycle_ms:.1f}ms)")
+        return reaped
+
+    # ----------------------------------------------------------------------
+    # stats
+    # ----------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "cycles": self.cycles,
+            "reaped_sessions": self.reaped_sessions,
+            "last_reaped": self.last_reaped,
+            "last_empty": self.last_empty,
+            "last_cycle_ms": round(self.last_cycle_ms, 3),
+        }
+
+
+session_reaper = SessionReaper.from_settings()
@@ -0,0 +1,219 @@
+# backend/app/services/slice_features.py
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set
+
+import numpy as np
+
+from app.crud import events as event_crud
+from app.services.distraction_scoring import epoch_ms
+from app.services.profile_rules import MAX_SLICES, SLICE_MINUTES
+
+# --------------------------------------------------------------------------
+# 세션 이벤트 -> 5분 구간(slice) 피처 행
+# - slice_index = (timestamp - 세션 시작) // 5분  (TimeSliceRule.slice_index와 같은 기준)
+# - 구간 1개 = 고정 길이 float32 행 1개 (열 순서 = SLICE_FEATURES)
+# - timestamp 오름차순으로 한 건씩 흘려 넣으면 구간이 끝날 때마다 행을 내보냄
+#   -> 메모리는 진행 중인 구간 1개의 누적값(+ 그 구간의 고유 앱 이름)만 사용
+# - 학습(피처 행렬), 분석(세션 구간 통계), 실시간 점검(최근 이벤트 -> 현재 구간 규칙 비교)에서 같이 사용
+# --------------------------------------------------------------------------
+SLICE_MS = SLICE_MINUTES * 60 * 1000
+
+SLICE_FEATURES = (
+    "slice_index",
+    "event_count",
+    "input_events",         # meaningful_input_events 증가량 합 (카운터 리셋 시 새 값 자체를 증가량으로)
+    "input_per_minute",
+    "idle_mean_seconds",    # timestamp - last_meaningful_input_timestamp_ms (값이 있는 이벤트만)
+    "idle_max_seconds",
+    "context_switches",     # 직전 이벤트와 app_name이 다른 횟수 (구간 경계를 넘는 전환은 뒤 구간에 집계)
+    "distinct_apps",
+)
+N_SLICE_FEATURES = len(SLICE_FEATURES)
+
+# 스트리밍에 필요한 이벤트 필드만 읽음 (window_title 등 큰 필드 제외)
+SLICE_EVENT_PROJECTION = {
+    "_id": 0,
+    "timestamp": 1,
+    "app_name": 1,
+    "activity_vector.meaningful_input_events": 1,
+    "activity_vector.last_meaningful_input_timestamp_ms": 1,
+}
+
+
+class SliceAccumulator:
+    """
+    이벤트를 timestamp 오름차순으로 받아 구간별 피처 행을 만드는 상태 객체
+
+    - push(doc): 이번 이벤트로 끝난 구간들의 행을 반환 (보통 0개, 구간이 바뀌면 1개 이상)
+    - flush(): 진행 중인 마지막 구간의 행 (스트림 끝에서 호출)
+    - fill_gaps=True면 이벤트가 없는 구간도 event_count=0 행으로 채움 (행 번호 = slice_index)
+      빈 구간 채우기는 MAX_SLICES(24시간)까지만 (잘못된 timestamp 하나로 행이 폭증하지 않도록)
+    - 세션 시작 이전 timestamp는 0번 구간으로, 순서가 뒤바뀐 이벤트는 현재 구간으로 집계
+    """
+
+    def __init__(self, start: Optional[datetime] = None, fill_gaps: bool = True):
+        self.start_ms: Optional[float] = epoch_ms(start) if start is not None else None
+        self.fill_gaps = fill_gaps
+
+        # 세션 전체에 걸친 직전 이벤트 상태 (증가량 / 전환 계산용)
+        self._prev_inputs: Optional[float] = None
+        self._prev_app: Optional[str] = None
+
+        self._slice: Optional[int] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._count = 0
+        self._inputs = 0.0
+        self._idle_sum = 0.0
+        self._idle_n = 0
+        self._idle_max = 0.0
+        self._switches = 0
+        self._apps: Set[str] = set()
+
+    def _row(self, index: int) -> np.ndarray:
+        idle_mean = self._idle_sum / self._idle_n if self._idle_n else 0.0
+        return np.array(
+            [
+                index,
+                self._count,
+                self._inputs,
+                self._inputs / SLICE_MINUTES,
+                idle_mean,
+                self._idle_max,
+                self._switches,
+                len(self._apps),
+            ],
+            dtype=np.float32,
+        )
+
+    def _gap_rows(self, first: int, end: int) -> List[np.ndarray]:
+        if not self.fill_gaps:
+            return []
+        rows = []
+        for index in range(first, min(end, MAX_SLICES)):
+            row = np.zeros(N_SLICE_FEATURES, dtype=np.float32)
+            row[0] = index
+            rows.append(row)
+        return rows
+
+    def _close_until(self, index: int) -> List[np.ndarray]:
+        """
+        현재 구간을 닫고 index 직전까지의 빈 구간 행을 만듦
+        """
+        rows = [self._row(self._slice), *self._gap_rows(self._slice + 1, index)]
+        self._reset()
+        return rows
+
+    def push(self, doc: Dict[str, Any]) -> List[np.ndarray]:
+        ts_ms = epoch_ms(doc.get("timestamp"))
+        if self.start_ms is None:
+            self.start_ms = ts_ms
+        index = max(int((ts_ms - self.start_ms) // SLICE_MS), 0)
+
+        rows: List[np.ndarray] = []
+        if self._slice is None:
+            rows = self._gap_rows(0, index)
+            self._slice = index
+        elif index > self._slice:
+            rows = self._close_until(index)
+            self._slice = index
+
+        vector = doc.get("activity_vector") or {}
+        inputs = float(vector.get("meaningful_input_events") or 0)
+        if self._prev_inputs is not None:
+            delta = inputs - self._prev_inputs
+            self._inputs += delta if delta >= 0 else inputs  # 에이전트 재시작 -> 카운터 리셋
+        self._prev_inputs = inputs
+
+        last_input = float(vector.get("last_meaningful_input_timestamp_ms") or 0)
+        if last_input > 0:
+            idle = max(ts_ms - last_input, 0.0) / 1000
+            self._idle_sum += idle
+            self._idle_n += 1
+            self._idle_max = max(self._idle_max, idle)
+
+        app = doc.get("app_name") or ""
+        if self._prev_app is not None and app != self._prev_app:
+            self._switches += 1
+        self._prev_app = app
+        self._apps.add(app)
+
+        self._count += 1
+        return rows
+
+    def flush(self) -> List[np.ndarray]:
+        if self._slice is None:
+            return []
+        rows = [self._row(self._slice)]
+        self._reset()
+        self._slice = None
+        return rows
+
+
+# --------------------------------------------------------------------------
+# 파이프라인 (동기: 메모리 안의 이벤트 / 비동기: Motor cursor 스트림)
+# --------------------------------------------------------------------------
+def iter_slice_rows(
+    docs: Iterable[Dict[str, Any]], start: Optional[datetime] = None, fill_gaps: bool = True
+) -> Iterator[np.ndarray]:
+    """
+    timestamp 오름차순 이벤트 -> 구간 행 (실시간 점검처럼 최근 이벤트가 이미 메모리에 있을 때)
+    """
+    acc = SliceAccumulator(start, fill_gaps)
+    for doc in docs:
+        yield from acc.push(doc)
+    yield from acc.flush()
+
+
+async def aiter_slice_rows(
+    batches: AsyncIterator[List[Dict[str, Any]]], start: Optional[datetime] = None, fill_gaps: bool = True
+) -> AsyncIterator[np.ndarray]:
+    """
+    crud/events.iter_event_docs 같은 batch 스트림 -> 구간 행
+    """
+    acc = SliceAccumulator(start, fill_gaps)
+    async for batch in batches:
+        for doc in batch:
+            for row in acc.push(doc):
+                yield row
+    for row in acc.flush():
+        yield row
+
+
+async def stream_session_slices(
+    user_id: str,
+    start: datetime,
+    end: datetime,
+    fill_gaps: bool = True,
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[np.ndarray]:
+    """
+    세션 시간 구간 [start, end]의 유저 이벤트를 Motor cursor로 timestamp 순 스트리밍 -> 구간 행
+    이벤트의 session_id는 에이전트 로컬 id라 서버 세션 _id로 찾지 않음 (end: crud/sessions.get_session_window_end)
+    """
+    batches = event_crud.iter_event_docs(
+        user_id=user_id,
+        start_time=start,
+        end_time=end,
+        batch_size=batch_size,
+        proj=SLICE_EVENT_PROJECTION,
+    )
+    async for row in aiter_slice_rows(batches, start, fill_gaps):
+        yield row
+
+
+async def session_slice_matrix(
+    user_id: str,
+    start: datetime,
+    end: datetime,
+    fill_gaps: bool = True,
+) -> np.ndarray:
+    """
+    세션 전체 구간 행렬 (n_slices x N_SLICE_FEATURES). 행 수는 세션 길이에 비례 (24시간 = 288행)
+    """
+    rows = [row async for row in stream_session_slices(user_id, start, end, fill_gaps)]
+    if not rows:
+        return np.zeros((0, N_SLICE_FEATURES), dtype=np.float32)
+    return np.vstack(rows)
@@ -0,0 +1,362 @@
+# backend/benchmarks/bench_api.py
+"""
+FastAPI 백엔드 부하/지연 벤치마크
+
+app.main:app을 ASGI 클라이언트(httpx)로 직접 호출합니다. (네트워크/uvicorn 제외)
+DB는 로컬 MongoDB(--mongo-uri) 또는 인프로세스 mongomock-motor 중 하나를 사용합니다.
+app의 lifespan(DB 연결, 인덱스, ingest 큐)도 실제 서버처럼 실행합니다.
+요청과 무관한 백그라운드 작업(ML 학습 프로세스 풀 / 이벤트 채점 / session reaper)은 기본으로 끄고 측정합니다.
+(--background로 켜면 실제 서버와 같은 설정으로 측정)
+
+실행 (backend/ 디렉토리에서):
+    pip install -r requirements.txt -r requirements-dev.txt
+    python -m benchmarks.bench_api                                   # mongomock
+    python -m benchmarks.bench_api --mongo-uri mongodb://localhost:27017 --output bench.json
+    python -m benchmarks.bench_api --compare baseline.json           # 이전 결과와 p50/p95 비교
+
+결과는 JSON(시나리오별 p50/p95/p99 지연(ms), 초당 요청 수, 초당 이벤트 수)으로 출력되어
+커밋 간 회귀 비교에 사용할 수 있습니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BENCH_DB_NAME = "forcefocus_bench"
+
+# app.core.config.Settings가 필수 환경 변수를 요구하므로 app import 전에 채워 둠
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key")
+
+
+# --------------------------------------------------------------------------
+# 측정 유틸
+# --------------------------------------------------------------------------
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _summarize(name: str, latencies: List[float], wall: float, items_per_request: int = 1) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "scenario": name,
+        "requests": count,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "requests_per_sec": round(count / wall, 1) if wall > 0 else 0.0,
+        "items_per_sec": round(count * items_per_request / wall, 1) if wall > 0 else 0.0,
+    }
+
+
+async def _run(
+    name: str,
+    iterations: int,
+    call: Callable[[int], Awaitable[Any]],
+    concurrency: int,
+    items_per_request: int = 1,
+) -> Dict[str, Any]:
+    """
+    call(i)를 iterations회, 최대 concurrency개 동시 실행하며 요청별 지연을 기록
+    """
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await call(i)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    result = _summarize(name, latencies, time.perf_counter() - wall_started, items_per_request)
+    print(
+        f"  {name:<32} p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+        f"p99={result['p99_ms']:>8.2f}ms  {result['requests_per_sec']:>8.1f} req/s",
+        file=sys.stderr,
+    )
+    return result
+
+
+def _event_payload(session_id: str, base: datetime, n: int, offset: int = 0) -> Dict[str, Any]:
+    return {
+        "events": [
+            {
+                "session_id": session_id,
+                "timestamp": (base + timedelta(seconds=5 * (offset + i))).isoformat(),
+                "app_name": "Code.exe" if i % 3 else "chrome.exe",
+                "window_title": "force focus backend main py",
+                "activity_vector": {
+                    "meaningful_input_events": offset + i,
+                    "last_meaningful_input_timestamp_ms": int(base.timestamp() * 1000),
+                    "last_mouse_move_timestamp_ms": int(base.timestamp() * 1000),
+                    "visible_windows": [
+                        {"app_name": "Code.exe", "title": "force focus backend"},
+                        {"app_name": "chrome.exe", "title": "github pull request"},
+                    ],
+                },
+            }
+            for i in range(n)
+        ]
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+# --------------------------------------------------------------------------
+# DB 준비
+# --------------------------------------------------------------------------
+# --background 없이 실행할 때 끄는 백그라운드 서비스 (요청 지연에 섞이지 않도록)
+BACKGROUND_SERVICE_FLAGS = ("ML_TRAINING_ENABLED", "DISTRACTION_SCORING_ENABLED", "SESSION_REAPER_ENABLED")
+
+
+def _configure_env(mongo_uri: Optional[str], background: bool = False) -> None:
+    """
+    app import 전에 호출: lifespan의 connect_to_mongo가 벤치 DB에 연결되도록 설정
+    """
+    os.environ["MONGO_DB_NAME"] = BENCH_DB_NAME
+    if not background:
+        for flag in BACKGROUND_SERVICE_FLAGS:
+            os.environ[flag] = "false"
+    if mongo_uri:
+        os.environ["MONGO_URI"] = mongo_uri
+    else:
+        # mongomock은 인덱스 옵션 일부(partial 등)를 지원하지 않음
+        os.environ.setdefault("MONGO_ENSURE_INDEXES", "false")
+
+
+async def _drop_bench_db(mongo_uri: Optional[str]) -> None:
+    if not mongo_uri:
+        return  # mongomock은 프로세스마다 새로 시작
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(mongo_uri)
+    await client.drop_database(BENCH_DB_NAME)
+    client.close()
+
+
+@asynccontextmanager
+async def _app_lifespan(app, mongo_uri: Optional[str]):
+    """
+    httpx.ASGITransport는 lifespan 이벤트를 보내지 않으므로 app.router.lifespan_context를 직접 실행
+    (시작: 연결 / ensure_events_storage / 인덱스 / 백그라운드 서비스, 종료: 큐 flush 후 연결 종료)
+    mongomock 모드에서는 connect_to_mongo가 만드는 클라이언트를 mongomock-motor로 바꿔 끼움
+    """
+    from app.db import mongo
+
+    if not mongo_uri:
+        from mongomock_motor import AsyncMongoMockClient
+        mongo.AsyncIOMotorClient = lambda uri, **kwargs: AsyncMongoMockClient()
+
+    await _drop_bench_db(mongo_uri)
+    try:
+        async with app.router.lifespan_context(app):
+            yield mongo
+    finally:
+        await _drop_bench_db(mongo_uri)
+
+
+async def _seed_user(mongo) -> str:
+    now = datetime.now(timezone.utc)
+    result = await mongo.db.users.insert_one({
+        "email": "bench@example.com",
+        "google_id": "bench-google-id",
+        "created_at": now,
+        "last_login_at": now,
+        "settings": {"theme": "dark"},
+        "fcm_tokens": ["token-a", "token-b"],
+        "blocked_apps": ["chrome.exe", "Discord.exe"],
+    })
+    return str(result.inserted_id)
+
+
+async def _seed_history(client, headers, session_id: str, base: datetime, total: int) -> None:
+    chunk = 1000
+    for offset in range(0, total, chunk):
+        n = min(chunk, total - offset)
+        response = await client.post(
+            "/api/v1/events/batch",
+            json=_event_payload(session_id, base, n, offset),
+            headers=headers,
+        )
+        response.raise_for_status()
+
+
+# --------------------------------------------------------------------------
+# 시나리오
+# --------------------------------------------------------------------------
+async def run_benchmarks(args) -> Dict[str, Any]:
+    _configure_env(args.mongo_uri, args.background)
+
+    from app.main import app
+
+    async with _app_lifespan(app, args.mongo_uri) as mongo:
+        return await _run_scenarios(args, app, mongo)
+
+
+async def _run_scenarios(args, app, mongo) -> Dict[str, Any]:
+    import httpx
+    from app.core.security import create_access_token
+
+    user_id = await _seed_user(mongo)
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+    base = datetime.now(timezone.utc) - timedelta(days=30)
+
+    results: List[Dict[str, Any]] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print("[events/batch]", file=sys.stderr)
+        for size in args.batch_sizes:
+            payload = _event_payload("bench-batch-session", base, size)
+            results.append(await _run(
+                f"POST /api/v1/events/batch n={size}",
+                args.iterations,
+                lambda i, p=payload: client.post("/api/v1/events/batch", json=p, headers=headers),
+                args.concurrency,
+                items_per_request=size,
+            ))
+
+        print(f"[GET /events] history={args.history}", file=sys.stderr)
+        await _seed_history(client, headers, "bench-history-session", base, args.history)
+        for limit in (100, 1000):
+            results.append(await _run(
+                f"GET /events limit={limit}",
+                args.iterations,
+                lambda i, limit=limit: client.get("/events/", params={"limit": limit}, headers=headers),
+                args.concurrency,
+                items_per_request=limit,
+            ))
+        results.append(await _run(
+            "GET /events session+range",
+            args.iterations,
+            lambda i: client.get(
+                "/events/",
+                params={
+                    "session_id": "bench-history-session",
+                    "start_time": base.isoformat(),
+                    "end_time": (base + timedelta(hours=6)).isoformat(),
+                    "limit": 100,
+                },
+                headers=headers,
+            ),
+            args.concurrency,
+            items_per_request=100,
+        ))
+
+        print("[sessions]", file=sys.stderr)
+
+        async def start_and_end(i: int):
+            started = await client.post(
+                "/sessions/start",
+                json={"start_time": base.isoformat(), "goal_duration": 25},
+                headers=headers,
+            )
+            started.raise_for_status()
+            return await client.put(
+                f"/sessions/{started.json()['id']}",
+                json={"end_time": (base + timedelta(minutes=25)).isoformat(), "status": "completed"},
+                headers=headers,
+            )
+
+        results.append(await _run(
+            "POST /sessions/start + PUT end",
+            args.iterations,
+            start_and_end,
+            args.concurrency,
+        ))
+
+        print("[users/me]", file=sys.stderr)
+        results.append(await _run(
+            "GET /users/me",
+            args.iterations,
+            lambda i: client.get("/users/me", headers=headers),
+            args.concurrency,
+        ))
+
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "backend": "mongodb" if args.mongo_uri else "mongomock",
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "history": args.history,
+            "background": args.background,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """
+    이전 결과 JSON과 시나리오별 p50/p95 변화율(%)을 출력
+    """
+    with open(baseline_path) as f:
+        baseline = {r["scenario"]: r for r in json.load(f)["results"]}
+
+    print(f"\nvs {baseline_path}", file=sys.stderr)
+    for row in current["results"]:
+        old = baseline.get(row["scenario"])
+        if not old:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms"):
+            before, after = old[key], row[key]
+            change = (after - before) / before * 100 if before else 0.0
+            deltas.append(f"{key}={before:.2f}->{after:.2f} ({change:+.1f}%)")
+        print(f"  {row['scenario']:<32} " + "  ".join(deltas), file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Force Focus backend benchmark")
+    parser.add_argument("--mongo-uri", default=None, help="로컬 MongoDB URI (미지정 시 mongomock-motor)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50, 200, 1000])
+    parser.add_argument("--history", type=int, default=20000, help="GET /events 측정 전 적재할 이벤트 수")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로 (미지정 시 stdout)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 경로")
+    parser.add_argument(
+        "--background", action="store_true", help="ML 학습 / 이벤트 채점 / session reaper도 켠 채로 측정"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmarks(args))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
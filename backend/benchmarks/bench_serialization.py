@@ -0,0 +1,250 @@
+# backend/benchmarks/bench_serialization.py
+"""
+목록 응답 직렬화 벤치마크 (DB / HTTP 제외, 순수 인코딩 비용)
+
+두 경로를 같은 Mongo 형태 문서로 비교합니다.
+- model:  serialize_*() -> *Read 모델 -> response_model 재검증 -> JSON 직렬화 -> json.dumps
+          (FastAPI가 모델 리스트를 반환받았을 때 하는 일과 같은 순서)
+- fast:   *_row() dict -> FastJSONResponse(orjson)
+
+두 결과가 같은 응답인지도 함께 확인합니다. (다르면 exit code 1)
+- bytes가 같으면 identical
+- bytes가 다르면 json.loads 결과를 값 + JSON 타입까지 비교 (25와 25.0, 1과 true를 다르게 봄)
+  키 순서 / 공백 차이만 있으면 통과, 결과의 "byte_identical"로 구분
+
+실행 (backend/ 디렉토리에서):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 50 --output ser.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+
+# app.core.config.Settings가 필수 환경 변수를 요구하므로 app import 전에 채워 둠
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret-key")
+
+
+# --------------------------------------------------------------------------
+# Mongo에서 읽은 것과 같은 형태의 문서 (naive UTC datetime, ms 정밀도)
+# --------------------------------------------------------------------------
+def _ts(base: datetime, i: int) -> datetime:
+    return base + timedelta(seconds=5 * i, milliseconds=(i * 37) % 1000)
+
+
+def _event_docs(n: int, base: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_id": f"user-1:bench-session:{i}",
+            "user_id": "user-1",
+            "session_id": "bench-session",
+            "timestamp": _ts(base, i),
+            "app_name": "Code.exe" if i % 3 else "chrome.exe",
+            "window_title": "force focus backend main py",
+            "activity_vector": {
+                "meaningful_input_events": i,
+                "last_meaningful_input_timestamp_ms": 1700000000000 + i,
+                "last_mouse_move_timestamp_ms": 1700000000000 + i,
+                "visible_windows": [
+                    {"app_name": "Code.exe", "title": "force focus backend"},
+                    {"app_name": "chrome.exe", "title": "github pull request"},
+                ],
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def _session_docs(n: int, base: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "user-1",
+            "task_id": None,
+            "profile_id": None,
+            "start_time": _ts(base, i),
+            "end_time": _ts(base, i) + timedelta(minutes=25),
+            "duration": 1500.0,
+            "status": "completed",
+            "goal_duration": 25,  # 정수로 저장된 경우도 float(25.0)로 나와야 함
+            "interruption_count": i % 4,
+        }
+        for i in range(n)
+    ]
+
+
+def _task_docs(n: int, base: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "user-1",
+            "name": f"task {i}",
+            "description": "write the weekly report",
+            "created_at": _ts(base, i),
+            "due_date": None,
+            "status": "pending",
+            "linked_session_id": None,
+            "target_executable": "Code.exe",
+            "target_arguments": None,
+        }
+        for i in range(n)
+    ]
+
+
+def _schedule_docs(n: int, base: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "user-1",
+            "task_id": None,
+            "name": f"schedule {i}",
+            "start_time": "09:00:00",
+            "end_time": "11:30:00",
+            "days_of_week": [0, 1, 2, 3, 4],
+            "created_at": _ts(base, i),
+            "is_active": True,
+        }
+        for i in range(n)
+    ]
+
+
+def _feedback_docs(n: int, base: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "_id": ObjectId(),
+            "user_id": "user-1",
+            "event_id": f"user-1:bench-session:{i}",
+            "feedback_type": "is_work" if i % 2 else "distraction_ignored",
+            "timestamp": _ts(base, i),
+        }
+        for i in range(n)
+    ]
+
+
+# --------------------------------------------------------------------------
+# 비교
+# --------------------------------------------------------------------------
+def _typed(value: Any) -> Any:
+    """
+    json.loads 결과 -> 타입을 포함한 비교용 값 (Python에서는 25 == 25.0, 1 == True라서)
+    """
+    if isinstance(value, dict):
+        return {key: _typed(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [_typed(v) for v in value]
+    return (type(value).__name__, value)
+
+
+def _same_response(a: bytes, b: bytes) -> bool:
+    return a == b or _typed(json.loads(a)) == _typed(json.loads(b))
+
+
+# --------------------------------------------------------------------------
+# 측정
+# --------------------------------------------------------------------------
+def _time(fn: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "min_ms": round(samples[0] * 1000, 3),
+    }
+
+
+def run(rows: int, repeat: int) -> Dict[str, Any]:
+    from pydantic import TypeAdapter
+
+    from app.api.responses import FastJSONResponse
+    from app.crud import events, feedback, schedules, sessions, tasks
+    from app.schemas.event import EventRead
+    from app.schemas.feedback import FeedbackRead
+    from app.schemas.schedule import ScheduleRead
+    from app.schemas.session import SessionRead
+    from app.schemas.task import TaskRead
+
+    base = datetime(2025, 1, 6, 9, 0, 0)
+    cases = [
+        ("events", _event_docs, events.serialize_event, events.event_row, EventRead),
+        ("sessions", _session_docs, sessions.serialize_session, sessions.session_row, SessionRead),
+        ("tasks", _task_docs, tasks.serialize_task, tasks.task_row, TaskRead),
+        ("schedules", _schedule_docs, schedules.serialize_schedule, schedules.schedule_row, ScheduleRead),
+        ("feedback", _feedback_docs, feedback.serialize_feedback_read, feedback.feedback_row, FeedbackRead),
+    ]
+
+    fast_response = FastJSONResponse(content=None)
+    results = []
+    identical = True
+
+    for name, make_docs, serialize, to_row, read_model in cases:
+        docs = make_docs(rows, base)
+        adapter = TypeAdapter(List[read_model])
+
+        def model_path() -> bytes:
+            models = [serialize(d) for d in docs]
+            validated = adapter.validate_python([m.model_dump() for m in models])
+            content = adapter.dump_python(validated, mode="json")
+            return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+        def fast_path() -> bytes:
+            return fast_response.render([to_row(d) for d in docs])
+
+        model_bytes, fast_bytes = model_path(), fast_path()
+        same = _same_response(model_bytes, fast_bytes)
+        identical = identical and same
+
+        model = _time(model_path, repeat)
+        fast = _time(fast_path, repeat)
+        speedup = model["p50_ms"] / fast["p50_ms"] if fast["p50_ms"] else 0.0
+
+        results.append({
+            "endpoint": name,
+            "rows": rows,
+            "model": model,
+            "fast": fast,
+            "speedup": round(speedup, 2),
+            "identical": same,
+            "byte_identical": model_bytes == fast_bytes,
+        })
+        print(
+            f"  {name:<10} model p50={model['p50_ms']:>8.2f}ms  fast p50={fast['p50_ms']:>8.2f}ms  "
+            f"x{speedup:.1f}  {'same' if same else 'MISMATCH'}{' (bytes)' if model_bytes == fast_bytes else ''}",
+            file=sys.stderr,
+        )
+
+    return {"rows": rows, "repeat": repeat, "identical": identical, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List endpoint serialization benchmark")
+    parser.add_argument("--rows", type=int, default=1000, help="응답 1개당 문서 수")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로 (미지정 시 stdout)")
+    args = parser.parse_args()
+
+    report = run(args.rows, args.repeat)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if not report["identical"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
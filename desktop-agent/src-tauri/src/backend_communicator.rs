@@ -1,6 +1,7 @@
 // 파일 위치: src-tauri/src/backend_communicator.rs
 
-use reqwest::Client;
+use reqwest::header::{ETAG, IF_NONE_MATCH};
+use reqwest::{Client, StatusCode};
 use serde::{Deserialize, Serialize};
 use tauri::{command, State};
 
@@ -20,6 +21,9 @@ use crate::{
 use crate::storage_manager::{self, CachedEvent, LocalSchedule, LocalTask}; // LocalTask, LocalSchedule import
 
 use std::time::{SystemTime, UNIX_EPOCH}; // 세션 시작 시간 생성용
+use flate2::write::GzEncoder;
+use flate2::Compression;
+use std::io::Write; // GzEncoder::write_all
 use uuid::Uuid; // 로컬에서 임시 세션 ID 생성용
 
 // --- 1. 상수 정의 ---
@@ -82,6 +86,9 @@ struct EventData {
     app_name: String,
     window_title: String,
     activity_vector: serde_json::Value,
+    // 재전송 시 서버가 중복을 걸러낼 수 있는 고정 키
+    // (rowid는 테이블이 비면 재사용될 수 있어 세션/시각과 함께 묶음)
+    event_key: String,
 }
 
 // 백엔드 Task API 응답 모델 (Schema: TaskRead)
@@ -110,6 +117,17 @@ struct ApiSchedule {
     is_active: bool,
 }
 
+/// `GET /profiles/default` 조회 결과
+#[derive(Debug)]
+pub enum DefaultProfileFetch {
+    /// 304: 로컬에 저장된 version 그대로
+    NotModified,
+    /// 200: 새 version + 응답 JSON (저장은 호출자가 수행)
+    Updated { version: String, payload: String },
+    /// 404: 서버에 기본 프로필 없음
+    NotFound,
+}
+
 // --- 3. BackendCommunicator 상태 정의 ---
 
 /// reqwest::Client를 전역 상태로 관리하기 위한 구조체
@@ -141,6 +159,7 @@ impl BackendCommunicator {
                 // LSN에 저장된 JSON 문자열을 serde_json::Value 객체로 파싱
                 match serde_json::from_str(&e.activity_vector) {
                     Ok(json_val) => Some(EventData {
+                        event_key: format!("{}:{}:{}", e.session_id, e.timestamp, e.id),
                         session_id: e.session_id,
                         timestamp: e.timestamp,
                         app_name: e.app_name,
@@ -168,11 +187,24 @@ impl BackendCommunicator {
 
         println!("Syncing {} events to {}", request_body.events.len(), url);
 
+        // window_title / visible_windows 반복이 많아 gzip으로 크게 줄어듦 (서버가 Content-Encoding 해제)
+        let json_body = serde_json::to_vec(&request_body)
+            .map_err(|e| format!("Failed to serialize events: {}", e))?;
+        let mut encoder = GzEncoder::new(Vec::new(), Compression::default());
+        encoder
+            .write_all(&json_body)
+            .map_err(|e| format!("Failed to compress events: {}", e))?;
+        let gzip_body = encoder
+            .finish()
+            .map_err(|e| format!("Failed to compress events: {}", e))?;
+
         let response = self
             .client
             .post(&url)
             .bearer_auth(token)
-            .json(&request_body)
+            .header(reqwest::header::CONTENT_TYPE, "application/json")
+            .header(reqwest::header::CONTENT_ENCODING, "gzip")
+            .body(gzip_body)
             .send()
             .await
             .map_err(|e| format!("Request failed: {}", e))?;
@@ -265,6 +297,54 @@ impl BackendCommunicator {
             Err(format!("Server error (Schedules): {}", response.status()))
         }
     }
+
+    /// 서버에서 기본 AI 프로필을 받아옴 (저장은 호출자가 수행)
+    /// version: 로컬에 저장된 version -> If-None-Match로 보내 변경이 없으면 304 (본문 없음)
+    pub async fn fetch_default_profile(
+        &self,
+        token: &str,
+        version: Option<&str>,
+    ) -> Result<DefaultProfileFetch, String> {
+        let url = format!("{}/profiles/default", get_api_base_url());
+
+        let mut request = self.client.get(&url).bearer_auth(token);
+        if let Some(v) = version {
+            request = request.header(IF_NONE_MATCH, format!("\"{}\"", v));
+        }
+        let response = request
+            .send()
+            .await
+            .map_err(|e| format!("Failed to fetch default profile: {}", e))?;
+
+        match response.status() {
+            StatusCode::NOT_MODIFIED => Ok(DefaultProfileFetch::NotModified),
+            StatusCode::NOT_FOUND => Ok(DefaultProfileFetch::NotFound),
+            status if status.is_success() => {
+                let etag = response
+                    .headers()
+                    .get(ETAG)
+                    .and_then(|h| h.to_str().ok())
+                    .map(|h| h.trim_start_matches("W/").trim_matches('"').to_string());
+                let payload = response
+                    .text()
+                    .await
+                    .map_err(|e| format!("Failed to read default profile: {}", e))?;
+
+                // ETag가 없으면 본문의 version 사용 (본문이 JSON인지도 같이 확인)
+                let body: serde_json::Value = serde_json::from_str(&payload)
+                    .map_err(|e| format!("JSON parse error: {}", e))?;
+                let version = match etag {
+                    Some(v) => v,
+                    None => body["version"]
+                        .as_str()
+                        .ok_or("Default profile has no version")?
+                        .to_string(),
+                };
+                Ok(DefaultProfileFetch::Updated { version, payload })
+            }
+            status => Err(format!("Server error (Profile): {}", status)),
+        }
+    }
 }
 
 // --- 4. 이 모듈에 속한 Tauri 커맨드 정의 ---
@@ -191,6 +191,19 @@ impl StorageManager {
         )
         .map_err(|e| format!("Failed to create tasks table: {}", e))?;
 
+        // 7. 기본 AI 프로필 테이블 (GET /profiles/default 응답 1개)
+        // version은 다음 동기화 때 If-None-Match로 보내 변경이 없으면 304로 본문 전송을 생략
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_profile (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version TEXT NOT NULL,
+                payload TEXT NOT NULL, -- JSON
+                updated_at INTEGER NOT NULL
+            )",
+            [],
+        )
+        .map_err(|e| format!("Failed to create ai_profile table: {}", e))?;
+
         Ok(())
     }
 }
@@ -533,6 +546,47 @@ impl StorageManager {
         }
         Ok(tasks)
     }
+
+    // --- 기본 AI 프로필 관리 함수 ---
+
+    /// 서버에서 받은 기본 프로필 저장 (payload = 응답 JSON 그대로)
+    pub fn save_default_profile(&self, version: &str, payload: &str) -> Result<(), String> {
+        let conn = self.conn.lock().map_err(|e| e.to_string())?;
+        let now = SystemTime::now()
+            .duration_since(UNIX_EPOCH)
+            .unwrap()
+            .as_secs();
+
+        conn.execute(
+            "INSERT OR REPLACE INTO ai_profile (id, version, payload, updated_at)
+             VALUES (1, ?1, ?2, ?3)",
+            rusqlite::params![version, payload, now],
+        )
+        .map_err(|e| e.to_string())?;
+        Ok(())
+    }
+
+    /// 저장된 기본 프로필 (version, payload JSON)
+    pub fn load_default_profile(&self) -> Result<Option<(String, String)>, String> {
+        let conn = self.conn.lock().map_err(|e| e.to_string())?;
+        let result = conn
+            .query_row(
+                "SELECT version, payload FROM ai_profile WHERE id = 1",
+                [],
+                |row| Ok((row.get(0)?, row.get(1)?)),
+            )
+            .optional()
+            .map_err(|e| e.to_string())?;
+        Ok(result)
+    }
+
+    /// 서버에 기본 프로필이 없을 때 (404) 로컬 사본도 삭제
+    pub fn delete_default_profile(&self) -> Result<(), String> {
+        let conn = self.conn.lock().map_err(|e| e.to_string())?;
+        conn.execute("DELETE FROM ai_profile WHERE id = 1", [])
+            .map_err(|e| e.to_string())?;
+        Ok(())
+    }
 }
 // --- 유닛 테스트 모듈 ---
 #[cfg(test)]
@@ -644,4 +698,25 @@ mod tests {
         assert_eq!(count, 1);
         assert!(vector_str.contains("meaningful_input_events\":10")); // JSON 내용 검증
     }
+
+    #[test]
+    fn test_default_profile() {
+        let storage = setup_test_db();
+        assert!(storage.load_default_profile().unwrap().is_none());
+
+        // 새 version이 오면 덮어쓰기 (행은 항상 1개)
+        storage
+            .save_default_profile("v1", r#"{"version":"v1"}"#)
+            .expect("Failed to save profile");
+        storage
+            .save_default_profile("v2", r#"{"version":"v2"}"#)
+            .expect("Failed to save profile");
+        let (version, payload) = storage.load_default_profile().unwrap().unwrap();
+        assert_eq!(version, "v2");
+        assert_eq!(payload, r#"{"version":"v2"}"#);
+
+        // 서버에서 404 -> 로컬 사본 삭제
+        storage.delete_default_profile().unwrap();
+        assert!(storage.load_default_profile().unwrap().is_none());
+    }
 }
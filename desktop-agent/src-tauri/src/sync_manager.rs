@@ -3,7 +3,7 @@ use std::time::Duration;
 use tauri::{AppHandle, Manager};
 use tokio::time::sleep;
 
-use crate::backend_communicator::BackendCommunicator;
+use crate::backend_communicator::{BackendCommunicator, DefaultProfileFetch};
 use crate::StorageManagerArcMutex;
 
 /// 백그라운드 동기화 루프 시작
@@ -47,7 +47,7 @@ async fn process_sync(app: &AppHandle) -> Result<(), String> {
         }
     }; // 여기서 storage Lock 해제
 
-    // --- [A] Down-Sync: 서버 데이터 가져오기 (스케줄 & 태스크) ---
+    // --- [A] Down-Sync: 서버 데이터 가져오기 (스케줄 & 태스크 & 기본 프로필) ---
     // 2-1. Task 다운로드
     let fetched_tasks = match comm_state.fetch_tasks(&token).await {
         Ok(t) => Some(t),
@@ -66,6 +66,22 @@ async fn process_sync(app: &AppHandle) -> Result<(), String> {
         }
     };
 
+    // 2-3. 기본 AI 프로필 다운로드 (저장된 version으로 조건부 요청 -> 변경 없으면 304)
+    let profile_version = {
+        let storage = storage_state.lock().map_err(|e| e.to_string())?;
+        storage.load_default_profile()?.map(|(version, _)| version)
+    };
+    let fetched_profile = match comm_state
+        .fetch_default_profile(&token, profile_version.as_deref())
+        .await
+    {
+        Ok(p) => Some(p),
+        Err(e) => {
+            eprintln!("Sync Manager: Failed to fetch default profile: {}", e);
+            None
+        }
+    };
+
     // 3. 로컬 DB 저장 (Lock 필요)
     {
         let storage = storage_state.lock().map_err(|e| e.to_string())?;
@@ -81,6 +97,17 @@ async fn process_sync(app: &AppHandle) -> Result<(), String> {
                 eprintln!("Sync Manager: Failed to sync schedules to DB: {}", e);
             }
         }
+
+        let profile_result = match fetched_profile {
+            Some(DefaultProfileFetch::Updated { version, payload }) => {
+                storage.save_default_profile(&version, &payload)
+            }
+            Some(DefaultProfileFetch::NotFound) => storage.delete_default_profile(),
+            Some(DefaultProfileFetch::NotModified) | None => Ok(()),
+        };
+        if let Err(e) = profile_result {
+            eprintln!("Sync Manager: Failed to sync default profile to DB: {}", e);
+        }
     } // lock 해제
 
     // --- [B] Up-Sync: 로컬 데이터 올리기 (이벤트) ---